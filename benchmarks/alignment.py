@@ -0,0 +1,106 @@
+"""Compare the multires alignment stage with the preliminary + secondary alignment pair.
+
+usage:
+    python benchmarks/alignment.py                  # synthetic manoeuvre, alignment functions only
+    python benchmarks/alignment.py analysis.json    # Analysis.to_dict output, full alignment stages
+
+For each method the runtime and the element boundaries are reported, along with the mean and
+max boundary error (s) against the reference labels (the labels in the file, or the known
+labels of the synthetic flight).
+"""
+
+import sys
+from json import load
+from time import perf_counter
+
+import geometry as g
+import numpy as np
+import pandas as pd
+from flightdata import Alignment, State
+
+from flightanalysis import Elements, Line, Loop, Manoeuvre, Snap
+from flightanalysis.analysis.alignment import multires_align
+
+
+def synthetic(freq: int = 100, keep: float = 0.8, noise: float = 0.05, seed: int = 1):
+    """A manoeuvre template at 25Hz and a time warped, noisy 'flight' of the same manoeuvre"""
+    man = Manoeuvre(
+        Elements(
+            [
+                Line("entry_line", 30.0, 60.0, 0.0),
+                Loop("loop", 30.0, np.pi, 50.0, 0.0, 0.0),
+                Line("line", 30.0, 40.0, 2 * np.pi),
+                Loop("loop2", 30.0, np.pi, 50.0, 0.0, 0.0),
+                Snap("snap", 30.0, 60.0, 3 * np.pi, np.radians(20), np.radians(45), np.radians(45)),
+                Line("exit_line", 30.0, 60.0, 0.0),
+            ]
+        ),
+        "synthetic",
+    )
+    istate = State.from_transform(g.Transformation(), vel=g.PX(30))
+    template = State.stack(man.create_template(istate, None, 25, "min"), "element")
+    fine = State.stack(man.create_template(istate, None, freq, "min"), "element")
+
+    rng = np.random.default_rng(seed)
+    ids = np.sort(rng.choice(len(fine), int(len(fine) * keep), replace=False))
+    flown = State(fine.data.iloc[ids]).recalculate_dt()
+    flown = flown.copy(
+        rvel=flown.rvel + g.Point(rng.normal(scale=noise, size=(len(flown), 3)))
+    )
+    return flown, template, fine.labels.element.boundaries
+
+
+def compare(results: dict[str, tuple[float, np.ndarray]], reference: np.ndarray):
+    rows = []
+    for name, (duration, boundaries) in results.items():
+        error = np.abs(boundaries - reference)
+        rows.append(
+            dict(
+                method=name,
+                time=duration,
+                mean_error=error.mean(),
+                max_error=error.max(),
+                boundaries=np.round(boundaries, 2).tolist(),
+            )
+        )
+    return pd.DataFrame(rows).set_index("method")
+
+
+def run_synthetic():
+    flown, template, reference = synthetic()
+    results = {}
+
+    t0 = perf_counter()
+    res = Alignment.align(flown, template, 10, True)
+    results["Alignment.align"] = (perf_counter() - t0, res.aligned.labels.element.boundaries)
+
+    t0 = perf_counter()
+    res = multires_align(flown, template, 3, 5, 2, True)
+    results["multires_align"] = (perf_counter() - t0, res.aligned.labels.element.boundaries)
+
+    return compare(results, reference)
+
+
+def run_analysis(file: str):
+    from flightanalysis import Analysis
+
+    with open(file, "r") as f:
+        an = Analysis.from_dict(load(f))
+    reference = an.flown.labels.element.boundaries
+    basic = an.basic(remove_labels=True).create_itrans()
+
+    results = {}
+    t0 = perf_counter()
+    res = basic.preliminary_alignment().secondary_alignment()
+    results["preliminary+secondary"] = (perf_counter() - t0, res.flown.labels.element.boundaries)
+
+    t0 = perf_counter()
+    res = basic.multires_alignment()
+    results["multires"] = (perf_counter() - t0, res.flown.labels.element.boundaries)
+
+    return compare(results, reference)
+
+
+if __name__ == "__main__":
+    res = run_analysis(sys.argv[1]) if len(sys.argv) > 1 else run_synthetic()
+    print(res.to_string())
@@ -0,0 +1,61 @@
+"""Compare Bounded.__call__ with the per group loop it replaced.
+
+usage:
+    python benchmarks/bounded.py [n ...]
+
+For each sample length a sample with around 100 groups of values outside the bounds is
+created, both implementations are timed and their outputs are checked to match.
+"""
+
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from flightanalysis.scoring.criteria import Bounded, Exponential
+
+
+def bounded_loop(crit: Bounded, vs):
+    """The per group implementation Bounded.__call__ replaced"""
+    groups = np.concatenate([[0], np.diff(vs != 0).cumsum()])
+    dgids = np.append(
+        np.arange(len(groups))[1:][np.diff(groups).astype(bool)], len(groups) - 1
+    )
+    errors = np.array(
+        [
+            np.mean(vs[groups == grp]) * len(vs[groups == grp]) / len(vs)
+            for grp in set(groups)
+        ]
+    )
+    dgs = crit.lookup(np.abs(errors))
+    return errors[dgs > 0], dgs[dgs > 0], dgids[dgs > 0]
+
+
+def exceedances(n: int, ngroups: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    data = np.zeros(n)
+    for start in np.sort(rng.choice(n - n // ngroups, ngroups // 2, replace=False)):
+        data[start : start + rng.integers(1, n // ngroups)] = rng.uniform(0.1, 2)
+    return data
+
+
+def main(ns: list[int]):
+    crit = Bounded("bounded", Exponential(1, 1), max_bound=0)
+    for n in ns:
+        data = exceedances(n, 200)
+
+        t0 = perf_counter()
+        new = crit(data)
+        t_new = perf_counter() - t0
+
+        t0 = perf_counter()
+        old = bounded_loop(crit, data)
+        t_old = perf_counter() - t0
+
+        for a, b in zip(new, old):
+            np.testing.assert_allclose(a, b)
+        print(f"n={n}: Bounded.__call__ {t_new * 1e3:.2f}ms, per group loop {t_old * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,376 @@
+"""Offline benchmark suite for the analysis pipeline.
+
+usage:
+    python benchmarks/suite.py [-o results.json] [-r repeat] [-g group ...]
+    python benchmarks/suite.py --compare old.json new.json [-t threshold]
+
+A small schedule is defined here with Line, Loop and Snap elements and a pair of synthetic
+downgrades, so nothing needs to be registered or downloaded. The flights are created with
+SchedDef.create_template, sampled at an irregular rate by dropping random points and given
+noise on the position and body rates. The template labels are kept so the alignment can be checked.
+
+Groups:
+    analysis - Analysis.run for every manoeuvre (unlabelled flight), and each stage of it as
+        recorded by run(profile=True)
+    alignment - Alignment.align and multires_align, with the mean boundary error (s)
+    downgrades - DownGrades.apply on every element, fused and separate
+    criteria - every criteria class on a 1000 sample array
+    serialisation - Analysis to_dict / from_dict and to_bytes / from_bytes round trips
+
+Each benchmark records the min, mean and max wall time over repeat runs (s). The results
+are written as JSON with some environment information. --compare prints the ratio of new to
+old min time for every benchmark present in both files and exits with status 1 if any
+ratio exceeds 1 + threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+import geometry as g
+import numpy as np
+import pandas as pd
+from flightdata import Alignment, State
+from loguru import logger
+from schemas import ManInfo
+from schemas.maninfo import BoxLocation, Position
+from schemas.positioning import Direction, Heading, Height, Orientation
+
+from flightanalysis import Analysis, Line, Loop, Snap
+from flightanalysis.analysis.alignment import multires_align
+from flightanalysis.base.ref_funcs import RefFuncs
+from flightanalysis.definition import ElDef, ElDefs, ManDef, ManParms, SchedDef
+from flightanalysis.scoring.criteria import (
+    AbsPeak,
+    AbsTrough,
+    Bounded,
+    Combination,
+    Comparison,
+    Continuous,
+    ContinuousValue,
+    Deviation,
+    Exponential,
+    Limit,
+    Peak,
+    Single,
+    Threshold,
+    Total,
+    Trough,
+)
+from flightanalysis.scoring.box import TriangularBox
+from flightanalysis.scoring.downgrade import DownGrade, DownGrades
+from flightanalysis.scoring.measurement import Measure
+from flightanalysis.scoring.reffuncs import measures, selectors
+
+
+def bench_speed(els, fl: State, tp: State, meta=None):
+    return abs(fl.vel) - abs(tp.vel), fl.vel.unit()
+
+
+def bench_track(els, fl: State, tp: State, meta=None):
+    return np.arcsin(fl.wvel.unit().z) - np.arcsin(tp.wvel.unit().z), g.PZ(1, len(fl))
+
+
+def visible(fl, tp, measurement, meta=None):
+    return np.full(len(fl), 0.8)
+
+
+# registered so the ManDefs survive the to_dict / from_dict round trip in prepare_scoring
+for _func in [bench_speed, bench_track]:
+    measures.add("benchmark measure")(Measure(_func.__name__, _func, [visible], "m"))
+
+
+def downgrades() -> DownGrades:
+    return DownGrades(
+        [
+            DownGrade("speed", "speed", None, measures.bench_speed(), RefFuncs([]),
+                      Continuous("speed", Exponential(0.1, 1))),
+            DownGrade("track", "track", None, measures.bench_track(), RefFuncs([]),
+                      Continuous("track", Exponential(3, 1))),
+            DownGrade("end_track", "end_track", None, measures.bench_track(),
+                      RefFuncs([selectors.last()]), Single("end", Exponential(3, 1))),
+        ]
+    )
+
+
+def mandef(name: str, position: Position, direction: Direction, eds: list[tuple]):
+    dgs = downgrades()
+    return ManDef(
+        ManInfo(
+            name=name,
+            short_name=name,
+            k=2,
+            position=position,
+            start=BoxLocation(
+                height=Height.BTM, direction=direction, orientation=Orientation.UPRIGHT
+            ),
+        ),
+        ManParms([]),
+        ElDefs(
+            [ElDef("entry_line", Line, dict(speed=30, length=30, roll=0), dgs)]
+            + [ElDef(n, K, props, dgs) for n, K, props in eds]
+            + [ElDef("exit_line", Line, dict(speed=30, length=30, roll=0), dgs)]
+        ),
+        TriangularBox(np.radians(60), np.radians(60), 170, 150, 0, {}),
+    )
+
+
+def schedule() -> SchedDef:
+    loop = dict(speed=30, angle=2 * np.pi, radius=55, roll=0, ke=0)
+    return SchedDef(
+        [
+            mandef("loop", Position.CENTRE, Direction.UPWIND, [("loop", Loop, loop)]),
+            mandef(
+                "roll",
+                Position.END,
+                Direction.DOWNWIND,
+                [
+                    ("pull", Loop, dict(speed=30, angle=np.pi / 2, radius=50, roll=0, ke=0)),
+                    ("line", Line, dict(speed=30, length=100, roll=2 * np.pi)),
+                    ("push", Loop, dict(speed=30, angle=-np.pi / 2, radius=50, roll=0, ke=0)),
+                ],
+            ),
+            mandef(
+                "snap",
+                Position.CENTRE,
+                Direction.UPWIND,
+                [("snap", Snap, dict(speed=30, length=60, roll=2 * np.pi, pitch=np.radians(20),
+                                     break_roll=np.pi / 4, recovery_roll=np.pi / 4))],
+            ),
+        ]
+    )
+
+
+def synthetic_flight(
+    sdef: SchedDef, freq: int = 100, keep: float = 0.5, noise: float = 0.05, seed: int = 0
+) -> State:
+    """The schedule template at freq, with a random subset of the points kept (an irregular
+    sample rate) and noise added to the position and body rates.
+    The manoeuvre and element labels of the template are kept."""
+    _, template = sdef.create_template(170, Heading.LTOR, freq=freq, npoints=3)
+    rng = np.random.default_rng(seed)
+    ids = np.sort(rng.choice(len(template), int(len(template) * keep), replace=False))
+    ids = np.unique(np.concatenate([[0, len(template) - 1], ids]))
+    flown = State(template.data.iloc[ids], template.labels).recalculate_dt()
+    return flown.copy(
+        pos=flown.pos + g.Point(rng.normal(scale=noise * 10, size=(len(flown), 3))),
+        rvel=flown.rvel + g.Point(rng.normal(scale=noise, size=(len(flown), 3))),
+    )
+
+
+def timeit(fun: Callable, repeat: int) -> tuple[dict, object]:
+    times, res = [], None
+    for _ in range(repeat):
+        t0 = perf_counter()
+        res = fun()
+        times.append(perf_counter() - t0)
+    return dict(min=min(times), mean=float(np.mean(times)), max=max(times), n=repeat), res
+
+
+def boundary_error(aligned: State, reference: State) -> float:
+    return float(
+        np.mean(np.abs(aligned.labels.element.boundaries - reference.labels.element.boundaries))
+    )
+
+
+def bench_analysis(sdef: SchedDef, flown: State, repeat: int) -> dict:
+    out = {}
+    for i, mdef in enumerate(sdef):
+        name = mdef.info.short_name
+        fl = flown.manoeuvre[name]
+        basic = Analysis(i, Heading.LTOR, fl.remove_labels(), mdef)
+
+        runs: list[Analysis] = []
+
+        def run_profiled():
+            runs.append(basic.run(throw_errors=True, profile=True))
+            return runs[-1]
+
+        timing, an = timeit(run_profiled, repeat)
+        out[f"analysis.{name}.run"] = timing | dict(
+            score=an.scores.score(),
+            boundary_error=boundary_error(an.flown, fl),
+        )
+        for j, stage in enumerate(an.profile):
+            ts = [r.profile[j].wall for r in runs]
+            out[f"analysis.{name}.{j}_{stage.stage}"] = (
+                dict(min=min(ts), mean=float(np.mean(ts)), max=max(ts), n=repeat)
+                | stage.counts
+            )
+    return out
+
+
+def bench_alignment(sdef: SchedDef, flown: State, repeat: int) -> dict:
+    out = {}
+    mdef = sdef[1]
+    fl = flown.manoeuvre[mdef.info.short_name]
+    basic = Analysis(1, Heading.LTOR, fl.remove_labels(), mdef).create_itrans()
+    _, _, template = basic._preliminary_template(mdef)
+    for name, fun in [
+        ("Alignment.align", lambda: Alignment.align(basic.flown, template, 10, True)),
+        ("multires_align", lambda: multires_align(basic.flown, template, 3, 5, 2, True)),
+    ]:
+        timing, res = timeit(fun, repeat)
+        out[f"alignment.{name}"] = timing | dict(
+            boundary_error=boundary_error(res.aligned, fl)
+        )
+    return out
+
+
+def bench_downgrades(sdef: SchedDef, flown: State, repeat: int) -> dict:
+    an = (
+        Analysis(0, Heading.LTOR, flown.manoeuvre[sdef[1].info.short_name], sdef[1])
+        .run(optimise=False, stop_after="prepare_scoring")
+    )
+    out = {}
+    for fused in [True, False]:
+        def apply_all():
+            return [
+                ea.edef.dgs.apply(ea.el, ea.fl, ea.tp, fused=fused) for ea in an
+            ]
+
+        timing, _ = timeit(apply_all, repeat)
+        out[f"downgrades.apply.{'fused' if fused else 'separate'}"] = timing
+    return out
+
+
+def bench_criteria(repeat: int, n: int = 1000) -> dict:
+    rng = np.random.default_rng(0)
+    sample = np.cumsum(rng.normal(size=n)) * 0.1
+    dt = np.full(n, 0.04)
+    lookup = Exponential(1, 1)
+    intra = [
+        Single("single", lookup),
+        Limit("limit", lookup, limit=0.5),
+        Threshold("threshold", lookup, limit=0.5),
+        Peak("peak", lookup, limit=0.5),
+        Trough("trough", lookup, limit=0.5),
+        AbsPeak("abspeak", lookup, limit=0.5),
+        AbsTrough("abstrough", lookup, limit=0.5),
+        Continuous("continuous", lookup),
+        ContinuousValue("continuousvalue", lookup),
+        Deviation("deviation", lookup),
+        Total("total", lookup),
+        Bounded("bounded", lookup, min_bound=-0.5, max_bound=0.5),
+    ]
+    out = {}
+    for crit in intra:
+        vs = crit.prepare(sample) if isinstance(crit, Bounded) else sample
+        timing, _ = timeit(lambda: crit(vs, dt=dt), repeat)
+        out[f"criteria.{crit.__class__.__name__}"] = timing
+    timing, _ = timeit(lambda: Comparison("comparison", lookup)(sample + 5), repeat)
+    out["criteria.Comparison"] = timing
+    combo = Combination.rollcombo("4X8")
+    values = combo.desired[0] + rng.normal(scale=0.1, size=combo.desired.shape[1])
+    timing, _ = timeit(
+        lambda: combo.check_option(values, list(range(len(values)))), repeat
+    )
+    out["criteria.Combination"] = timing
+    return out
+
+
+def bench_serialisation(sdef: SchedDef, flown: State, repeat: int) -> dict:
+    an = Analysis(
+        1, Heading.LTOR, flown.manoeuvre[sdef[1].info.short_name], sdef[1]
+    ).run(optimise=False)
+    data, raw = an.to_dict(), an.to_bytes()
+    out = {}
+    for name, fun in [
+        ("to_dict", an.to_dict),
+        ("from_dict", lambda: Analysis.from_dict(data)),
+        ("to_bytes", an.to_bytes),
+        ("from_bytes", lambda: Analysis.from_bytes(raw)),
+    ]:
+        timing, _ = timeit(fun, repeat)
+        out[f"serialisation.{name}"] = timing
+    out["serialisation.to_dict"] |= dict(size=len(json.dumps(data)))
+    out["serialisation.to_bytes"] |= dict(size=len(raw))
+    return out
+
+
+groups = ["analysis", "alignment", "downgrades", "criteria", "serialisation"]
+
+
+def run(repeat: int = 3, only: list[str] | None = None) -> dict:
+    sdef = schedule()
+    flown = synthetic_flight(sdef)
+    results = {}
+    for group in only or groups:
+        logger.info(f"running {group} benchmarks")
+        if group == "criteria":
+            results |= bench_criteria(repeat * 10)
+        else:
+            results |= globals()[f"bench_{group}"](sdef, flown, repeat)
+    return dict(meta=environment(), results=results)
+
+
+def environment() -> dict:
+    from flightanalysis.version import get_version
+
+    try:
+        version = get_version()
+    except Exception:
+        version = None
+    return dict(
+        created=datetime.now().isoformat(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        numpy=np.__version__,
+        pandas=pd.__version__,
+        flightanalysis=version,
+    )
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1) -> pd.DataFrame:
+    """The ratio of new to old min time for every benchmark in both runs"""
+    keys = [k for k in new["results"] if k in old["results"]]
+    df = pd.DataFrame(
+        dict(
+            old=[old["results"][k]["min"] for k in keys],
+            new=[new["results"][k]["min"] for k in keys],
+        ),
+        index=keys,
+    )
+    df["ratio"] = df.new / df.old
+    df["flag"] = np.where(
+        df.ratio > 1 + threshold, "slower", np.where(df.ratio < 1 - threshold, "faster", "")
+    )
+    return df
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-g", "--group", action="append", choices=groups)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("-t", "--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        old, new = [json.loads(Path(f).read_text()) for f in args.compare]
+        df = compare(old, new, args.threshold)
+        print(df.to_string(float_format=lambda v: f"{v:.4g}"))
+        return int((df.flag == "slower").any())
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    res = run(args.repeat, args.group)
+    Path(args.output).write_text(json.dumps(res, indent=2))
+    print(
+        pd.DataFrame(res["results"]).T[["min", "mean", "max"]].to_string(
+            float_format=lambda v: f"{v:.4g}"
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,4 +4,4 @@ from .manoeuvre import Manoeuvre  # noqa: F401
 from .schedule import Schedule  # noqa: F401
 from .definition import *  # noqa: F403
 from .scoring import *  # noqa: F403
-from .analysis import ScheduleAnalysis, ElementAnalysis, Analysis  # noqa: F401
+from .analysis import ScheduleAnalysis, ElementAnalysis, Analysis, LazyAnalysis, LiveAnalysis  # noqa: F401
@@ -1,3 +1,5 @@
 from .el_analysis import ElementAnalysis
 from .manoeuvre_analysis import Analysis
 from .schedule_analysis import ScheduleAnalysis
+from .lazy import LazyAnalysis
+from .live import LiveAnalysis, LiveUpdate
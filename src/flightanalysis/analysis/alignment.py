@@ -0,0 +1,148 @@
+"""DTW helpers that work in the same feature space as flightdata's Alignment.align.
+
+multires_align is a coarse to fine alternative to Alignment.align. The flown and template
+data are decimated by 2**(levels - 1) and aligned with fastdtw, then the path is refined at
+each finer level with a banded DTW restricted to the cells near the path from the level below.
+"""
+
+from __future__ import annotations
+
+import geometry as g
+import numpy as np
+import numpy.typing as npt
+from flightdata import Alignment, State
+
+
+def alignment_features(
+    flown: State, template: State, mirror: bool = True
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """The weighted body rates used by Alignment.align, with the columns that are constant
+    in the template removed. returns (template, flown)"""
+    weights = g.Point(1, 1.2, 0.5)
+
+    def get_brv(brv: g.Point):
+        if mirror:
+            brv = g.Point(np.abs(brv.x), brv.y, np.abs(brv.z))
+        return (brv * weights).data
+
+    tp = get_brv(template.rvel * g.Point(0.6, 0.6, 0.6))
+    fl = get_brv(flown.rvel)
+    keep = ~np.isclose(tp, tp[0, :]).all(axis=0)
+    return tp[:, keep], fl[:, keep]
+
+
+def dtw_lower_bound(
+    flown: State, template: State, mirror: bool = True, chunk: int = 1024
+) -> float:
+    """A cheap lower bound on the distance returned by Alignment.align.
+    Every flown point is on the warp path at least once, so the sum of the distance from each
+    flown point to its nearest template point cannot exceed the DTW distance (and likewise
+    for each template point)."""
+    tp, fl = alignment_features(flown, template, mirror)
+
+    fl_min = np.full(len(fl), np.inf)
+    tp_min = np.full(len(tp), np.inf)
+    for i in range(0, len(fl), chunk):
+        dist = np.linalg.norm(fl[i : i + chunk, None, :] - tp[None, :, :], axis=2)
+        fl_min[i : i + chunk] = dist.min(axis=1)
+        tp_min = np.minimum(tp_min, dist.min(axis=0))
+    return float(max(fl_min.sum(), tp_min.sum()))
+
+
+def expand_window(
+    path: npt.NDArray, shape: tuple[int, int], band: int
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """Project a path from the level below onto a grid of shape (ntp, nfl), widened by band cells.
+    returns the first and last flown index in the window for each template index."""
+    lo = np.full(shape[0], shape[1])
+    hi = np.full(shape[0], -1)
+    for a in range(2):
+        i = np.clip(2 * path[:, 0] + a, 0, shape[0] - 1)
+        for b in range(2):
+            j = np.clip(2 * path[:, 1] + b, 0, shape[1] - 1)
+            np.minimum.at(lo, i, j)
+            np.maximum.at(hi, i, j)
+
+    # fill template rows the path skipped and keep the window monotonic
+    lo = np.minimum.accumulate(lo[::-1])[::-1]
+    hi = np.maximum.accumulate(hi)
+
+    # widen by band cells in both directions, lo and hi are monotonic so this is a shift
+    ids = np.arange(shape[0])
+    lo = np.clip(lo[np.maximum(ids - band, 0)] - band, 0, shape[1] - 1)
+    hi = np.clip(hi[np.minimum(ids + band, shape[0] - 1)] + band, 0, shape[1] - 1)
+    lo[0], hi[-1] = 0, shape[1] - 1
+    return lo, hi
+
+
+def banded_dtw(
+    tp: npt.NDArray, fl: npt.NDArray, lo: npt.NDArray, hi: npt.NDArray
+) -> tuple[float, npt.NDArray]:
+    """DTW between tp and fl restricted to fl indices lo[i]:hi[i]+1 for each tp index i.
+    returns the distance and the path as (tp index, fl index) pairs."""
+    n, m = len(tp), len(fl)
+    cost = np.full((n + 1, m + 1), np.inf)
+    cost[0, 0] = 0
+    for i in range(n):
+        js = np.arange(lo[i], hi[i] + 1)
+        d = np.linalg.norm(fl[js] - tp[i], axis=1)
+        diag_up = np.minimum(cost[i, js], cost[i, js + 1])
+        # row[j + 1] = d[j] + min(diag_up[j], row[j]) along the band, unrolled as
+        # min over the entry point p <= j of diag_up[p] + d[p] + ... + d[j]
+        s = np.cumsum(d)
+        cost[i + 1, js + 1] = s + np.minimum(
+            cost[i + 1, lo[i]],
+            np.minimum.accumulate(diag_up - np.concatenate([[0], s[:-1]])),
+        )
+
+    path = [(n - 1, m - 1)]
+    i, j = n, m
+    while (i, j) != (1, 1):
+        options = [cost[i - 1, j - 1], cost[i - 1, j], cost[i, j - 1]]
+        step = int(np.argmin(options))
+        i, j = (i - 1, j - 1) if step == 0 else (i - 1, j) if step == 1 else (i, j - 1)
+        path.append((i - 1, j - 1))
+    return float(cost[n, m]), np.array(path[::-1])
+
+
+def decimate(st: State, factor: int) -> State:
+    """Take every factor-th row, always keeping the last row."""
+    if factor <= 1:
+        return st
+    ids = np.unique(np.append(np.arange(0, len(st), factor), len(st) - 1))
+    return State(st.data.iloc[ids])
+
+
+def multires_align(
+    flown: State,
+    template: State,
+    levels: int = 3,
+    radius: int = 5,
+    band: int = 2,
+    mirror: bool = True,
+) -> Alignment:
+    """Coarse to fine DTW alignment.
+    The coarsest level (decimated by 2**(levels - 1)) is aligned with fastdtw using radius,
+    each finer level is aligned with banded_dtw within band cells of the path from the level below.
+    """
+    from fastdtw.fastdtw import fastdtw
+    from scipy.spatial.distance import euclidean
+
+    factors = [2**lev for lev in range(levels - 1, -1, -1)]
+
+    def features(factor: int):
+        return alignment_features(
+            decimate(flown, factor), decimate(template, factor), mirror
+        )
+
+    tp, fl = features(factors[0])
+    distance, path = fastdtw(tp, fl, radius=radius, dist=euclidean)
+    path = np.array(path)
+
+    for factor in factors[1:]:
+        tp, fl = features(factor)
+        distance, path = banded_dtw(
+            tp, fl, *expand_window(path, (len(tp), len(fl)), band)
+        )
+
+    return Alignment(distance, path, State.copy_labels(template, flown, path, 3))
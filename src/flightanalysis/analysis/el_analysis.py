@@ -9,6 +9,7 @@ from flightanalysis import ElDef, Element, Elements
 from dataclasses import dataclass
 import geometry as g
 from flightanalysis.scoring.downgrade.dg_testing import DGTest
+from flightanalysis.base.profiling import count
 
 @dataclass
 class ElementAnalysis:
@@ -21,8 +22,9 @@ class ElementAnalysis:
     results: Results | None = None
 
     def update(self, new_fl: State):
+        count("match_intention")
         new_el = self.el.match_intention(self.ref_frame, new_fl)
-        new_tp = new_el.create_template(self.tp[0], new_fl)
+        new_tp = new_el.template(self.tp[0], new_fl)
         return ElementAnalysis(
             self.edef, self.mps, new_el, new_fl, new_tp, self.ref_frame
         )
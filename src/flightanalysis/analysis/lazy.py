@@ -0,0 +1,186 @@
+"""Read only views of analyses stored with Analysis.to_bytes or ScheduleAnalysis.to_bytes.
+
+The scores are read from the container header, nothing else is decoded until it is accessed.
+Files are memory mapped, so array payloads are only paged in from disk when a field that
+uses them is materialised. The map stays open until close is called (or the with block that
+opened it exits). Materialised arrays are views of the map, copy any that should outlive it.
+"""
+
+from __future__ import annotations
+
+import mmap
+from functools import cached_property
+from pathlib import Path
+from typing import Callable
+
+from flightdata import State
+
+from flightanalysis.base import binary
+from flightanalysis.scoring.results import ManoeuvreResults
+from flightanalysis.scoring.results.store import (
+    difficulties,
+    score_columns,
+    truncations,
+)
+
+
+def map_file(path: Path | str) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class LazyResults:
+    """Answers the score queries of ManoeuvreResults from the container header.
+    Any other attribute loads the full ManoeuvreResults."""
+
+    def __init__(self, header: dict, load: Callable[[], ManoeuvreResults]):
+        self.header = header
+        self._load = load
+
+    @cached_property
+    def results(self) -> ManoeuvreResults:
+        return self._load()
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.results, name)
+
+    def summary(self) -> dict[str, float]:
+        return self.header["summary"]
+
+    def score_summary(self, difficulty=3, truncate=False) -> dict[str, float]:
+        return dict(
+            zip(
+                score_columns,
+                self.header["score_summary"][difficulties.index(difficulty)][
+                    truncations.index(truncate)
+                ],
+            )
+        )
+
+    def score(self, difficulty=3, truncate: bool = False) -> float:
+        return self.score_summary(difficulty, truncate)["total"]
+
+    def fcj_results(self):
+        return [
+            dict(
+                score=self.score_summary(d, t),
+                properties=dict(difficulty=d, truncate=t),
+            )
+            for d in difficulties
+            for t in truncations
+        ]
+
+
+class LazyAnalysis:
+    """A read only Analysis that materialises its fields on first access.
+    id, name, k, option and the scores summary come from the header. flown, templates,
+    manoeuvre and mdef are decoded when they are first used. Any other Analysis attribute
+    or method loads the full Analysis."""
+
+    def __init__(self, container: binary.Container, data: dict, header: dict):
+        self.container = container
+        self.data = data
+        self.header = header
+
+    @staticmethod
+    def from_bytes(data: bytes | mmap.mmap) -> LazyAnalysis:
+        container = binary.Container.from_bytes(data)
+        return LazyAnalysis(container, container.header["data"], container.summary)
+
+    @staticmethod
+    def open(path: Path | str) -> LazyAnalysis:
+        return LazyAnalysis.from_bytes(map_file(path))
+
+    def forget(self):
+        """Drop the materialised fields, so they no longer hold views of the buffer."""
+        for k in ["scores", "flown", "templates", "manoeuvre", "mdef", "analysis"]:
+            self.__dict__.pop(k, None)
+
+    def close(self):
+        self.forget()
+        self.container.close()
+
+    def __enter__(self) -> LazyAnalysis:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def id(self) -> int:
+        return self.header["id"]
+
+    @property
+    def name(self) -> str:
+        return self.header["name"]
+
+    @property
+    def k(self) -> float:
+        return self.header["k"]
+
+    @property
+    def option(self) -> int | None:
+        return self.header["option"]
+
+    @cached_property
+    def scores(self) -> LazyResults | None:
+        if self.header["scores"] is None:
+            return None
+        return LazyResults(
+            self.header["scores"],
+            lambda: ManoeuvreResults.from_dict(
+                self.container.decode(self.data["scores"])
+            ),
+        )
+
+    @cached_property
+    def flown(self) -> State:
+        return binary.state_from_dict(self.container.decode(self.data["flown"]))
+
+    @cached_property
+    def templates(self) -> dict[str, State] | None:
+        if not self.data.get("templates"):
+            return None
+        return {
+            k: binary.state_from_dict(self.container.decode(v))
+            for k, v in self.data["templates"].items()
+        }
+
+    @cached_property
+    def manoeuvre(self):
+        from flightanalysis.manoeuvre import Manoeuvre
+
+        return (
+            Manoeuvre.from_dict(self.data["manoeuvre"])
+            if self.data.get("manoeuvre")
+            else None
+        )
+
+    @cached_property
+    def mdef(self):
+        from flightanalysis.definition import ManDef
+
+        return ManDef.from_dict(self.data["mdef"])
+
+    def fcj_results(self):
+        return dict(els=self.header["elements"], results=self.scores.fcj_results())
+
+    def load(self):
+        """Decode the full Analysis"""
+        from flightanalysis.analysis.manoeuvre_analysis import Analysis
+
+        return Analysis.from_dict(self.container.decode(self.data))
+
+    @cached_property
+    def analysis(self):
+        return self.load()
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.analysis, name)
+
+    def __repr__(self):
+        return f"LazyAnalysis({self.id}, {self.name})"
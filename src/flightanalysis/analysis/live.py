@@ -0,0 +1,338 @@
+"""Online scoring of a flight as it is received.
+
+LiveAnalysis takes a stream of State chunks and a SchedDef. The current manoeuvre is tracked
+with an open ended DTW against its preliminary template (OnlineAlignment), which is extended by
+one column per flown sample. An element boundary is confirmed once the flight has progressed
+delay seconds into the following element, the element is then scored with its DownGrades and
+a provisional ManoeuvreResults is emitted. When the end of the manoeuvre is confirmed the
+labelled manoeuvre is run through Analysis (without optimisation) to add the inter and
+positioning results, and tracking moves on to the next manoeuvre.
+
+The latency of each update is the time between the end of the element and the last sample
+received, so it is bounded by delay plus the length of one chunk.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Iterator
+
+import numpy as np
+import numpy.typing as npt
+from flightdata import State
+from loguru import logger
+from schemas.positioning import Heading
+
+from flightanalysis.analysis.alignment import alignment_features
+from flightanalysis.analysis.el_analysis import ElementAnalysis
+from flightanalysis.analysis.manoeuvre_analysis import Analysis
+from flightanalysis.definition import ManDef, ManOption, SchedDef
+from flightanalysis.scoring.results import ElementsResults, ManoeuvreResults, Results
+
+
+def replay(st: State, duration: float = 0.5) -> Iterator[State]:
+    """Split a recorded State into chunks of duration seconds to simulate a live feed."""
+    ids = np.searchsorted(st.t, np.arange(st.t[0], st.t[-1], duration)[1:])
+    for chunk in np.split(np.arange(len(st)), ids):
+        if len(chunk):
+            yield State(st.data.iloc[chunk])
+
+
+class OnlineAlignment:
+    """Open ended DTW between a growing flight and a fixed manoeuvre template.
+
+    The cost matrix is built one flown sample (column) at a time, the start of the path is
+    pinned to the start of the template but the end is free, so the current template position
+    is the template index with the lowest length normalised cost in the latest column.
+    The template is aligned in the same feature space as Alignment.align.
+
+    Only the columns from the last confirmed boundary onwards are kept, the path is traced
+    back from the latest column to there, as the confirmed boundaries cannot move.
+
+    The last element (usually an exit line) cannot be located by the alignment as the flight
+    continues into the next manoeuvre with the same features, so its length is taken from the
+    template, scaled by the rate the rest of the manoeuvre was flown at.
+    """
+
+    def __init__(self, templates: dict[str, State], mirror: bool = True):
+        self.names = list(templates.keys())
+        self.template = State.stack(templates, "element")
+        self.mirror = mirror
+        # the element index of each template row, stack overlaps the elements by one row
+        lens = [len(t) - 1 for t in templates.values()]
+        lens[-1] += 1
+        self.tpel = np.repeat(np.arange(len(lens)), lens)
+        self.features = alignment_features(self.template, self.template, mirror)[0]
+        # the cost columns from flown index offset to n, in a buffer that grows as required
+        self.cost = np.empty((256, len(self.features)))
+        self.offset = 0
+        self.n = 0
+        self.t = np.array([])
+        # flown index of the first sample of each element after the first, once confirmed
+        self.boundaries: list[int] = []
+        # flown index of the last sample of the manoeuvre, once confirmed
+        self.end: int | None = None
+
+    def __len__(self):
+        return self.n
+
+    def push(self, chunk: State):
+        fl = alignment_features(chunk, self.template, self.mirror)[1]
+        self.t = np.concatenate([self.t, chunk.t])
+        rows = self.n - self.offset
+        if rows + len(fl) > len(self.cost):
+            cost = np.empty((2 * (rows + len(fl)), len(self.features)))
+            cost[:rows] = self.cost[:rows]
+            self.cost = cost
+        for row in fl:
+            d = np.linalg.norm(self.features - row, axis=1)
+            s = np.cumsum(d)
+            if self.n == 0:
+                a = np.full(len(d), np.inf)
+                a[0] = 0
+            else:
+                prev = self.cost[rows - 1]
+                a = np.minimum(prev, np.concatenate([[np.inf], prev[:-1]]))
+            # cost[j] = min over k <= j of a[k] + d[k] + ... + d[j]
+            self.cost[rows] = s + np.minimum.accumulate(a - np.concatenate([[0], s[:-1]]))
+            rows += 1
+            self.n += 1
+
+    def trim(self, offset: int):
+        """Drop the cost columns before flown index offset"""
+        if offset > self.offset:
+            keep = self.n - offset
+            self.cost[:keep] = self.cost[offset - self.offset : self.n - self.offset]
+            self.offset = offset
+
+    @property
+    def position(self) -> int:
+        """The template index the latest flown sample is aligned to"""
+        n, m = self.n, len(self.features)
+        return int(np.argmin(self.cost[n - self.offset - 1] / (n + np.arange(1, m + 1))))
+
+    def path(self) -> npt.NDArray:
+        """The warp path from the latest flown sample back to the first retained column
+        as (template index, flown index) pairs"""
+        cost = self.cost[: self.n - self.offset]
+        i, j = len(cost) - 1, self.position
+        path = [(j, i)]
+        while i > 0 or (j > 0 and self.offset == 0):
+            options = [
+                cost[i - 1, j - 1] if i > 0 and j > 0 else np.inf,
+                cost[i - 1, j] if i > 0 else np.inf,
+                cost[i, j - 1] if j > 0 else np.inf,
+            ]
+            step = int(np.argmin(options))
+            i, j = (i - 1, j - 1) if step == 0 else (i - 1, j) if step == 1 else (i, j - 1)
+            path.append((j, i))
+        return np.array(path[::-1]) + [0, self.offset]
+
+    def flown_elements(self, path: npt.NDArray) -> npt.NDArray:
+        """The element index of each flown sample from the first retained column on a path"""
+        fel = np.zeros(self.n - self.offset, dtype=int)
+        np.maximum.at(fel, path[:, 1] - self.offset, self.tpel[path[:, 0]])
+        return fel
+
+    def expected_end(self) -> float:
+        """The expected end time of the manoeuvre once the last element has started"""
+        tpt = self.template.t
+        start = np.flatnonzero(self.tpel == len(self.names) - 1)[0]
+        fl_elapsed = self.t[self.boundaries[-1]] - self.t[0] if self.boundaries else 0
+        rate = fl_elapsed / (tpt[start] - tpt[0]) if start > 0 and fl_elapsed > 0 else 1
+        return self.t[self.boundaries[-1] if self.boundaries else 0] + rate * (
+            tpt[-1] - tpt[start]
+        )
+
+    def update(self, delay: float, force: bool = False) -> list[int]:
+        """Confirm the element boundaries that the flight has progressed at least delay seconds
+        beyond. If force is True all the remaining boundaries and the end are confirmed.
+        returns the indices of the newly completed elements."""
+        if self.end is not None or self.n == 0:
+            return []
+        n = self.n
+        last = len(self.names) - 1
+        done = []
+        lower = self.boundaries[-1] + 1 if self.boundaries else 1
+        # a boundary can only be confirmed delay seconds after it, so skip the path until then
+        if len(self.boundaries) < last and (
+            force or self.t[-1] - self.t[min(lower, n - 1)] >= delay
+        ):
+            fel = self.flown_elements(self.path())
+            for k in range(len(self.boundaries), last):
+                ids = np.flatnonzero(fel > k) + self.offset
+                if len(ids) == 0:
+                    if not force:
+                        break
+                    ids = [n - 1]
+                lower = self.boundaries[-1] + 1 if self.boundaries else 1
+                b = min(max(int(ids[0]), lower), n - 1)
+                if self.t[-1] - self.t[b] < delay and not force:
+                    break
+                self.boundaries.append(b)
+                done.append(k)
+            if self.boundaries:
+                self.trim(self.boundaries[-1])
+        if len(self.boundaries) == last:
+            t_end = self.expected_end()
+            if self.t[-1] - t_end >= delay or force:
+                end = min(int(np.searchsorted(self.t, t_end)), n - 1)
+                self.end = max(end, self.boundaries[-1] if self.boundaries else 0)
+                done.append(last)
+        return done
+
+    def element_ids(self) -> npt.NDArray:
+        """The confirmed element index of each flown sample up to the end of the manoeuvre"""
+        stops = self.boundaries + [self.end + 1]
+        return np.repeat(
+            np.arange(len(stops)), np.diff(np.concatenate([[0], stops]))
+        )
+
+    def element_slice(self, k: int) -> slice:
+        """The flown rows of a confirmed element, including the first row of the next element"""
+        starts = [0] + self.boundaries
+        stop = self.boundaries[k] + 1 if k < len(self.boundaries) else self.end + 1
+        return slice(starts[k], stop)
+
+
+@dataclass
+class LiveUpdate:
+    """A provisional result for the manoeuvre being flown.
+    elements - the elements scored so far
+    t - the time of the last sample received
+    latency - the time between the end of the last scored element and t
+    final - True once the manoeuvre is complete and the inter and positioning results are included
+    """
+
+    manoeuvre: int
+    name: str
+    elements: list[str]
+    t: float
+    latency: float
+    results: ManoeuvreResults
+    final: bool = False
+
+
+@dataclass
+class LiveAnalysis:
+    """Score a schedule from a stream of State chunks, see module docstring."""
+
+    sdef: SchedDef
+    schedule_direction: Heading | None = None
+    delay: float = 1.0
+    freq: int = 25
+    index: int = 0
+    analyses: list[Analysis] = field(default_factory=list)
+    current: Analysis | None = None
+    aligner: OnlineAlignment | None = None
+    intra: list[Results] = field(default_factory=list)
+
+    @property
+    def mdef(self) -> ManDef:
+        md = self.sdef[self.index]
+        return md[md.active] if isinstance(md, ManOption) else md
+
+    def _start(self, chunk: State):
+        an = Analysis(self.index, self.schedule_direction, chunk, self.mdef)
+        an = an.create_itrans()
+        manoeuvre, templates, _ = an._preliminary_template(self.mdef, self.freq)
+        self.current = replace(an, manoeuvre=manoeuvre, templates=templates)
+        self.aligner = OnlineAlignment(templates)
+        self.intra = []
+
+    def _score_element(self, k: int) -> Results:
+        an, name = self.current, self.aligner.names[k]
+        fl = State(an.flown.data.iloc[self.aligner.element_slice(k)])
+        ist = an.templates[name][0].relocate(fl.pos[0])
+        el = an.manoeuvre.elements[name].match_intention(ist, fl)
+        tp = el.template(ist, fl)
+        return ElementAnalysis(
+            an.mdef.eds[name], an.mdef.mps, el, fl, tp, tp[0].transform
+        ).intra_score()
+
+    def _finish(self) -> tuple[Analysis, State | None]:
+        """Label the completed manoeuvre and run the full analysis on it.
+        returns the analysis and the samples received after the end of the manoeuvre"""
+        an, end = self.current, self.aligner.end
+        fl = State(an.flown.data.iloc[: end + 1]).label(
+            element=np.array(self.aligner.names)[self.aligner.element_ids()]
+        )
+        # run logs the stage that failed and returns without scores
+        full = Analysis(an.id, an.schedule_direction, fl, an.mdef).run(optimise=False)
+        if full.scores is not None:
+            an = full
+        else:
+            logger.warning(f"Live analysis of {an.name} failed, keeping the element scores")
+            an = replace(
+                an,
+                flown=fl,
+                scores=ManoeuvreResults(
+                    Results("inter", []),
+                    ElementsResults(self.intra),
+                    Results("positioning", []),
+                ),
+            )
+        flown = self.current.flown
+        rest = State(flown.data.iloc[end:]) if len(flown) > end + 1 else None
+        return an, rest
+
+    def push(self, chunk: State, force: bool = False) -> list[LiveUpdate]:
+        """Add a chunk of flight data, returns an update for each element completed.
+        If force is True the rest of the current manoeuvre is assumed to be complete."""
+        updates = []
+        pending = chunk
+        while self.index < len(self.sdef):
+            if pending is not None:
+                if self.current is None:
+                    self._start(pending)
+                else:
+                    self.current = replace(
+                        self.current,
+                        flown=State.concatenate([self.current.flown, pending]),
+                    )
+                self.aligner.push(pending)
+                pending = None
+            elif self.current is None:
+                break
+
+            t = self.current.flown.t[-1]
+            done = self.aligner.update(self.delay, force)
+            for k in done:
+                self.intra.append(self._score_element(k))
+                stop = self.aligner.element_slice(k).stop - 1
+                updates.append(
+                    LiveUpdate(
+                        self.index,
+                        self.current.name,
+                        [r.name for r in self.intra],
+                        t,
+                        t - self.current.flown.t[stop],
+                        ManoeuvreResults(
+                            Results("inter", []),
+                            ElementsResults(list(self.intra)),
+                            Results("positioning", []),
+                        ),
+                    )
+                )
+            if self.aligner.end is None:
+                break
+
+            an, pending = self._finish()
+            self.analyses.append(an)
+            updates[-1] = replace(updates[-1], results=an.scores, final=True)
+            self.index += 1
+            self.current, self.aligner = None, None
+            force = False
+        return updates
+
+    def close(self) -> list[LiveUpdate]:
+        """Complete the manoeuvre in progress at the end of the stream"""
+        if self.current is None:
+            return []
+        return self.push(None, force=True)
+
+    def run(self, chunks: Iterator[State]) -> Iterator[LiveUpdate]:
+        """Process a stream of chunks, yielding the updates as they become available"""
+        for chunk in chunks:
+            yield from self.push(chunk)
+        yield from self.close()
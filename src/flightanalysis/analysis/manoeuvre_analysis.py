@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 from json import dumps
-from typing import Annotated, Self, Literal
+from typing import Annotated, Callable, Iterable, Self, Literal
+import tracemalloc
 from flightanalysis.definition import ManDef, ManOption
 from flightanalysis.elements import AnyElement
 from flightanalysis.manoeuvre import Manoeuvre
 from flightanalysis.analysis.el_analysis import ElementAnalysis
-from flightanalysis.scoring.results import ElementsResults, ManoeuvreResults
+from flightanalysis.analysis.alignment import dtw_lower_bound, multires_align
+from flightanalysis.base import binary
+from flightanalysis.base.profiling import StageProfile, StageProfiler, count
+from flightanalysis.scoring.results import ElementsResults, ManoeuvreResults, Results
 import numpy as np
+import numpy.typing as npt
+import pandas as pd
 
 import geometry as g
 from flightdata import State, Alignment
@@ -17,12 +23,28 @@ from schemas.positioning import Direction, Heading
 from schemas import MA
 
 from loguru import logger
+from joblib import Parallel, delayed
 
 
 class ElSequenceError(Exception):
     pass
 
 
+@dataclass
+class BoundaryCache:
+    """Results that can be reused between the trial steps of the boundary optimisation.
+    The elements, templates and intra results are keyed on the element name and its flown label.
+    The inter results are held for the whole manoeuvre, only the ManParms that collect from a
+    moved element are recalculated.
+    """
+
+    elements: dict[tuple[str, float, float], tuple[AnyElement, State]] = field(
+        default_factory=dict
+    )
+    intra: dict[tuple[str, float, float], Results] = field(default_factory=dict)
+    inter: Results | None = None
+
+
 @dataclass
 class Analysis:
     id: int
@@ -36,37 +58,66 @@ class Analysis:
     manoeuvre: Manoeuvre | None = None
     templates: dict[str, State] | None = None
     scores: ManoeuvreResults | None = None
+    profile: list[StageProfile] | None = None
 
     @property
     def name(self):
         return self.mdef.info.short_name
 
+    @property
+    def k(self):
+        return self.mdef.info.k
+
     def run(
         self,
         optimise: bool = True,
         throw_errors: bool = False,
         stop_after: str = None,
         force: bool = True,
+        multires: bool = False,
+        profile: bool | Literal["memory"] | Callable[[StageProfile], None] = False,
         **kwargs,
     ) -> Self:
+        """Run the analysis stages. If multires is True the unlabelled flight is aligned with
+        multires_alignment rather than preliminary_alignment and secondary_alignment.
+        If profile is True (or a callback) each stage is wrapped in a StageProfiler, the
+        profiles are attached to the returned Analysis and passed to the callback as each
+        stage completes. If profile is "memory" tracemalloc also traces the run so the peak
+        memory of each stage is recorded, this slows the stages so the times are inflated."""
         if self.scores and not force:
             logger.info(f"Analysis {self.id} already has scores, skipping run.")
             return self
+        alignment_stages = (
+            ["multires_alignment"]
+            if multires
+            else ["preliminary_alignment", "secondary_alignment"]
+        )
+        unlabelled = "element" not in self.flown.labels.keys()
         stages = [
             ("create_itrans", True),
-            ("select_mdef", "element" in self.flown.labels.keys()),
-            ("preliminary_alignment", "element" not in self.flown.labels.keys()),
-            ("secondary_alignment", "element" not in self.flown.labels.keys()),
+            ("select_mdef", not unlabelled),
+            ("preliminary_alignment", unlabelled and not multires),
+            ("secondary_alignment", unlabelled and not multires),
+            ("multires_alignment", unlabelled and multires),
             ("prepare_scoring", optimise),
             ("optimise_alignment", optimise),
             ("prepare_scoring", True),
             ("calculate_score", True),
         ]
-        for stage, (fun_name, run) in enumerate(stages):
-            if run:
+        profiles: list[StageProfile] = []
+        tracing = profile == "memory" and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            for stage, (fun_name, run) in enumerate(stages):
+                if not run:
+                    logger.debug(f"Skipping step {stage}: {fun_name}")
+                    continue
+                profiler = StageProfiler(fun_name)
                 try:
                     logger.debug(f"Running step {stage}: {fun_name}")
-                    self = getattr(self, fun_name)(**kwargs.get(fun_name, {}))
+                    with profiler:
+                        self = getattr(self, fun_name)(**kwargs.get(fun_name, {}))
                     if stop_after == fun_name:
                         logger.debug(f"Stopping after step {stage}: {fun_name}")
                         break
@@ -77,8 +128,10 @@ class Analysis:
                         ) from ese
                     else:
                         logger.warning(f"{self.name}, {fun_name}: {ese}")
-                        stages[2] = (stages[2][0], True)
-                        stages[3] = (stages[3][0], True)
+                        stages[:] = [
+                            (name, run or name in alignment_stages)
+                            for name, run in stages
+                        ]
                 except Exception as e:
                     if throw_errors:
                         raise Exception(
@@ -87,9 +140,15 @@ class Analysis:
                     else:
                         logger.error(f"{self.name}, {fun_name}: {e}")
                         break
-            else:
-                logger.debug(f"Skipping step {stage}: {fun_name}")
-        return self
+                finally:
+                    if profile and profiler.profile is not None:
+                        profiles.append(profiler.profile)
+                        if callable(profile):
+                            profile(profiler.profile)
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        return replace(self, profile=profiles if profile else None)
 
     def _create_itrans(self) -> g.Transformation:
         if (
@@ -112,7 +171,9 @@ class Analysis:
     def create_itrans(self) -> g.Transformation:
         return replace(self, itrans=self._create_itrans())
 
-    def select_mdef(self):
+    def select_mdef(
+        self, n_jobs: int = 1, prefer: Literal["threads", "processes"] = "threads"
+    ):
         """If the elements are labelled it should be possible to select the correct option.
         First find all the options that match the element sequence.
         If more than one option matches, select the one with the best score.
@@ -123,6 +184,8 @@ class Analysis:
         NOTE (0.5.1 on) - added option index to the class, so if that exists use that.
         If not then do the old check and set the option for next time.
         This function can be simplified once all the old analyses have been updated with the option.
+
+        If more than one option needs to be scored they are run n_jobs at a time on a joblib pool.
         """
         mopt = ManOption([self.mdef]) if isinstance(self.mdef, ManDef) else self.mdef
 
@@ -143,35 +206,108 @@ class Analysis:
         elif len(options) == 1:
             option_id = 0
         else:
-            scores = []
-            for option in options:
-                scores.append(replace(self, mdef=option).run(False).scores.score())
-            option_id = np.argmax(scores)
+            # an option that failed to run scores nan, so it is never selected over one that ran
+            scores = np.array(self._score_options(options, n_jobs, prefer), dtype=float)
+            option_id = int(np.argmax(np.nan_to_num(scores, nan=-np.inf)))
         return replace(self, mdef=options[option_id], option=option_id)
 
-    def _preliminary_alignment(
-        self, mdef: ManDef, freq: int = 25, radius: AlignRadiusOption = 10
-    ):
+    def _score_options(
+        self,
+        options: list[ManDef],
+        n_jobs: int = 1,
+        prefer: Literal["threads", "processes"] = "threads",
+    ) -> list[float]:
+        """Run each option without optimisation and return the total scores, nan for the
+        options that fail. With the processes backend the options are sent to the workers with
+        the task protocol, as ManDefs do not pickle."""
+
+        def score(option: ManDef) -> float:
+            an = replace(self, mdef=option).run(False)
+            return an.scores.score() if an.scores is not None else np.nan
+
+        if n_jobs == 1:
+            return [score(option) for option in options]
+        elif prefer == "threads":
+            return Parallel(n_jobs=n_jobs, prefer="threads")(
+                delayed(score)(option) for option in options
+            )
+        else:
+            from flightanalysis.analysis.tasks import (
+                AnalysisTask,
+                register_definitions,
+                run_task,
+            )
+
+            tasks = [
+                replace(AnalysisTask.from_analysis(replace(self, mdef=o)), mdef=str(i))
+                for i, o in enumerate(options)
+            ]
+            results = Parallel(
+                n_jobs=n_jobs,
+                initializer=register_definitions,
+                initargs=({str(i): o.to_dict() for i, o in enumerate(options)},),
+            )(delayed(run_task)(task) for task in tasks)
+            return [res.score() for res in results]
+
+    def _preliminary_template(self, mdef: ManDef, freq: int = 25):
         manoeuvre = mdef.create()
         templates = manoeuvre.create_template(self.itrans, None, freq, "min")
-        template = State.stack(templates, "element")
-        res = Alignment.align(self.flown, template, radius, True)
-
-        return res.dist, res.aligned, manoeuvre, templates
+        return manoeuvre, templates, State.stack(templates, "element")
 
-    def preliminary_alignment(self, **kwargs) -> Self:
+    def preliminary_alignment(
+        self,
+        freq: int = 25,
+        radius: AlignRadiusOption = 10,
+        n_jobs: int = 1,
+        prefer: Literal["threads", "processes"] = "threads",
+        early_exit: bool = False,
+    ) -> Self:
         """Run DTW alignment for each option, select the one with the lowest distance.
+        The options are aligned n_jobs at a time on a joblib pool.
+        If early_exit is True the options are aligned in order of dtw_lower_bound, and any option
+        whose lower bound exceeds the best distance so far is skipped.
         TODO this is not proving very reliable for the P27 top hat."""
         mopt = ManOption([self.mdef]) if isinstance(self.mdef, ManDef) else self.mdef
 
-        res = [self._preliminary_alignment(mdef, **kwargs) for mdef in mopt]
-        option = np.argmin([r[0] for r in res])
+        prepared = [self._preliminary_template(mdef, freq) for mdef in mopt]
+
+        if early_exit and len(prepared) > 1:
+            bounds = [dtw_lower_bound(self.flown, p[2]) for p in prepared]
+            order = list(np.argsort(bounds))
+        else:
+            bounds = [0.0 for _ in prepared]
+            order = list(range(len(prepared)))
+
+        batch = max(n_jobs, 1) if n_jobs > 0 else len(order)
+        aligned: dict[int, Alignment] = {}
+        for i in range(0, len(order), batch):
+            best = min([a.dist for a in aligned.values()], default=np.inf)
+            ids = [j for j in order[i : i + batch] if bounds[j] < best]
+            if len(ids) == 0:
+                break
+            if len(ids) == 1 or n_jobs == 1:
+                res = [
+                    Alignment.align(self.flown, prepared[j][2], radius, True)
+                    for j in ids
+                ]
+            else:
+                res = Parallel(n_jobs=len(ids), prefer=prefer)(
+                    delayed(Alignment.align)(self.flown, prepared[j][2], radius, True)
+                    for j in ids
+                )
+            aligned.update(zip(ids, res))
+
+        skipped = len(prepared) - len(aligned)
+        if skipped > 0:
+            logger.debug(f"{self.name}: skipped {skipped} options by DTW lower bound")
+
+        option = min(aligned, key=lambda j: aligned[j].dist)
         return replace(
             self,
             mdef=mopt[option],
-            flown=res[option][1],
-            manoeuvre=res[option][2],
-            templates=res[option][3],
+            flown=aligned[option].aligned,
+            manoeuvre=prepared[option][0],
+            templates=prepared[option][1],
         )
 
     def secondary_alignment(self, freq: int = 25, radius: AlignRadiusOption = 10):
@@ -190,6 +326,44 @@ class Analysis:
             self, flown=res.aligned, manoeuvre=manoeuvre, templates=templates
         )
 
+    def multires_alignment(
+        self,
+        freq: int = 25,
+        levels: int = 3,
+        radius: int = 5,
+        band: int = 2,
+    ) -> Self:
+        """Coarse to fine alternative to preliminary_alignment + secondary_alignment.
+        Each option is aligned with multires_align, the best is matched to the flown data and
+        realigned without mirroring, again with multires_align."""
+        mopt = ManOption([self.mdef]) if isinstance(self.mdef, ManDef) else self.mdef
+
+        prepared = [self._preliminary_template(mdef, freq) for mdef in mopt]
+        res = [
+            multires_align(self.flown, p[2], levels, radius, band, True)
+            for p in prepared
+        ]
+        option = int(np.argmin([r.dist for r in res]))
+
+        manoeuvre, templates = prepared[option][0].match_intention(
+            self.itrans, res[option].aligned, freq, "min", False
+        )
+        res = multires_align(
+            self.flown,
+            State.stack(templates, "element"),
+            levels,
+            radius,
+            band,
+            False,
+        )
+        return replace(
+            self,
+            mdef=mopt[option],
+            flown=res.aligned,
+            manoeuvre=manoeuvre,
+            templates=templates,
+        )
+
     def prepare_scoring(self) -> Self:
         manoeuvre = (self.manoeuvre or self.mdef.create()).match_intention(
             self.itrans, self.flown, 0, "min", True
@@ -203,18 +377,54 @@ class Analysis:
 
         return replace(self, mdef=mdef, manoeuvre=manoeuvre, templates=templates)
 
-    def optimise_alignment(self, include_inter: bool = True) -> Self:
+    def optimise_alignment(
+        self, include_inter: bool = True, incremental: bool = True, screen: int = 0
+    ) -> Self:
+        """Step each element boundary to minimise the downgrades of the adjacent elements.
+        If incremental is True the element templates and scores are cached between trial
+        steps, so only the two elements adjacent to a moved boundary are recalculated.
+        If screen > 0 the candidate steps within +/- screen are estimated first, without
+        re-matching the elements, see score_boundary_candidates."""
+        cache = BoundaryCache() if incremental else None
+        if cache is not None and include_inter:
+            cache.inter = self.inter()
         steps = {}
         for el in list(self.manoeuvre.elements.keys())[:-1]:
-            steps[el], self = self.optimise_boundary(el, include_inter, 2)
+            steps[el], self = self.optimise_boundary(el, include_inter, 2, cache, screen)
         logger.debug(f"optimisation result:\n{dumps(steps, indent=2)}")
         return self
 
     def intra(self):
         return ElementsResults([ea.intra_score() for ea in self])
 
-    def inter(self):
-        return self.mdef.mps.collect(self.manoeuvre, self.flown, self.mdef.box)
+    def inter(self, elnames: list[str] = None):
+        return self.mdef.mps.collect(
+            self.manoeuvre, self.flown, self.mdef.box, elnames
+        )
+
+    def _label_key(self, name: str) -> tuple[str, float, float]:
+        label = self.flown.labels.element[name]
+        return (name, label.start, label.stop)
+
+    def cached_intra(self, name: str, cache: BoundaryCache | None = None) -> Results:
+        """The intra results for an element, taken from the cache if the label has not changed."""
+        if cache is None:
+            return self[name].intra_score()
+        key = self._label_key(name)
+        if key not in cache.intra:
+            cache.intra[key] = self[name].intra_score()
+        return cache.intra[key]
+
+    def cached_inter(self, elnames: list[str], cache: BoundaryCache) -> Results:
+        """The inter results for the manoeuvre, only the ManParms that collect from elnames
+        are recalculated, the rest are taken from the cache."""
+        if cache.inter is None:
+            return self.inter()
+        changed = self.inter(elnames)
+        return Results(
+            cache.inter.name,
+            [changed.data.get(k, v) for k, v in cache.inter.items()],
+        )
 
     def positioning(self):
         return self.mdef.box.score(
@@ -233,18 +443,22 @@ class Analysis:
             scores=ManoeuvreResults(fun("inter"), fun("intra"), fun("positioning")),
         )
 
-    def reload_element(self, name: str | int) -> Self:
-        ist = self.templates[name][0].relocate(self.flown.element[name][0].pos)
-        new_man = self.manoeuvre.replace_elements(
-            **{
-                name: self.manoeuvre.elements[name].match_intention(
-                    ist, self.flown.element[name]
-                )
-            }
-        )
-        new_templates = self.templates | {
-            name: new_man.elements[name].create_template(ist, self.flown.element[name])
-        }
+    def reload_element(self, name: str | int, cache: BoundaryCache = None) -> Self:
+        key = self._label_key(name)
+        if cache is not None and key in cache.elements:
+            new_el, new_tp = cache.elements[key]
+        else:
+            ist = self.templates[name][0].relocate(self.flown.element[name][0].pos)
+            count("match_intention")
+            new_el = self.manoeuvre.elements[name].match_intention(
+                ist, self.flown.element[name]
+            )
+            new_tp = new_el.template(ist, self.flown.element[name])
+            if cache is not None:
+                cache.elements[key] = (new_el, new_tp)
+
+        new_man = self.manoeuvre.replace_elements(**{name: new_el})
+        new_templates = self.templates | {name: new_tp}
 
         return replace(
             self,
@@ -254,7 +468,7 @@ class Analysis:
             scores=None,
         )
 
-    def update_boundaries(self, new_fl: State) -> Self:
+    def update_boundaries(self, new_fl: State, cache: BoundaryCache = None) -> Self:
         changes = [
             k
             for k in self.manoeuvre.elements.keys()
@@ -262,7 +476,7 @@ class Analysis:
         ]
         _new: Self = replace(self, flown=new_fl)
         for change in changes:
-            _new = _new.reload_element(change)
+            _new = _new.reload_element(change, cache)
         return _new
 
     def shift_boundary(self, boundary: str, t: float) -> Self:
@@ -272,36 +486,99 @@ class Analysis:
             )
         )
 
-    def step_boundary(self, boundary: str, steps: int) -> Self:
+    def step_boundary(
+        self, boundary: str, steps: int, cache: BoundaryCache = None
+    ) -> Self:
         return self.update_boundaries(
-            self.flown.step_label("element", boundary, steps, self.flown.t, 3)
+            self.flown.step_label("element", boundary, steps, self.flown.t, 3), cache
         )
 
-    def score_boundary(self, boundary: str, include_inter: bool = True):
+    def score_boundary(
+        self, boundary: str, include_inter: bool = True, cache: BoundaryCache = None
+    ):
         next_el = self.manoeuvre.elnames[self.manoeuvre.elnames.index(boundary) + 1]
+        if include_inter:
+            inter = (
+                self.inter()
+                if cache is None
+                else self.cached_inter([boundary, next_el], cache)
+            )
         return ElementsResults(
             {
-                boundary: self[boundary].intra_score(),
-                next_el: self[next_el].intra_score(),
-                **({"inter": self.inter()} if include_inter else {}),
+                boundary: self.cached_intra(boundary, cache),
+                next_el: self.cached_intra(next_el, cache),
+                **({"inter": inter} if include_inter else {}),
             }
         )
 
+    def score_boundary_candidates(
+        self, boundary: str, steps: Iterable[int] = range(-10, 11)
+    ) -> pd.Series:
+        """Screen candidate boundary steps by the intra downgrade of the elements either side.
+
+        Each step is scored in turn. This is cheaper than step_boundary / score_boundary as the
+        elements are not re-matched (the current element geometry is kept and the templates
+        are only re-anchored to the new element start), and the inter downgrades are not
+        included. Steps that leave either element with fewer than 3 points are NaN.
+        """
+        next_el = self.manoeuvre.elnames[self.manoeuvre.elnames.index(boundary) + 1]
+        steps = np.array(list(steps), dtype=int)
+        ib = len(self.flown.element[boundary]) - 1
+        nb = len(self.flown.element[next_el])
+
+        def _score(name: str, fl: State) -> float:
+            el: AnyElement = self.manoeuvre.elements[name]
+            ist = self.templates[name][0].relocate(fl[0].pos)
+            return self.mdef.eds[name].dgs.apply(el, fl, el.template(ist, fl)).total
+
+        totals = np.full(len(steps), np.nan)
+        for i, step in enumerate(steps):
+            if ib + step < 2 or nb - step < 3:
+                continue
+            try:
+                fl = self.flown.step_label("element", boundary, step, self.flown.t, 3)
+                totals[i] = _score(boundary, fl.element[boundary]) + _score(
+                    next_el, fl.element[next_el]
+                )
+            except Exception as e:
+                logger.debug(f"{boundary}, step {step} failed: {e}")
+        return pd.Series(totals, index=steps, name=boundary)
+
     def optimise_boundary(
-        self, boundary: str, include_inter: bool = True, step_size: int = 1
+        self,
+        boundary: str,
+        include_inter: bool = True,
+        step_size: int = 1,
+        cache: BoundaryCache = None,
+        screen: int = 0,
     ) -> list[Self | int]:
+        """Walk the boundary in the direction that reduces the downgrades of the adjacent elements.
+        If screen > 0 the walk starts from the best of the candidate steps within +/- screen,
+        estimated with score_boundary_candidates."""
         next_el = self.manoeuvre.elnames[self.manoeuvre.elnames.index(boundary) + 1]
 
-        def score_step(_steps: int):
+        trials: dict[int, list | None] = {}
+
+        def _score_step(_steps: int):
             try:
-                _new = self.step_boundary(boundary, _steps)
-                _results = _new.score_boundary(boundary, include_inter)
+                _new = self.step_boundary(boundary, _steps, cache)
+                _results = _new.score_boundary(boundary, include_inter, cache)
                 if _results.total > 10:
                     return None
-                return [_results.total, _new]
+                return [_results.total, _new, _results]
             except Exception as _:
                 return None
 
+        def score_step(_steps: int):
+            if _steps not in trials:
+                trials[_steps] = _score_step(_steps)
+            return trials[_steps]
+
+        def accept(_steps: int, _best: list):
+            if cache is not None and include_inter:
+                cache.inter = _best[2]["inter"]
+            return _steps, _best[1]
+
         best = score_step(0)
         if best is None:
             return 0, self
@@ -312,13 +589,30 @@ class Analysis:
             else 1
         )
 
-        _check = score_step(direction * step_size)
+        start = 0
+        if screen > 0:
+            try:
+                estimates = self.score_boundary_candidates(
+                    boundary, range(-screen, screen + 1, step_size)
+                ).dropna()
+                if len(estimates) > 0:
+                    start = int(estimates.idxmin())
+            except Exception as e:
+                logger.debug(f"Screening boundary {boundary} failed: {e}")
+
+        _check = score_step(start) if start != 0 else None
         if _check is not None and _check[0] < best[0]:
             best = _check
-            steps = direction * step_size
+            direction = int(np.sign(start))
+            steps = start
         else:
-            direction = -direction
-            steps = 0
+            _check = score_step(direction * step_size)
+            if _check is not None and _check[0] < best[0]:
+                best = _check
+                steps = direction * step_size
+            else:
+                direction = -direction
+                steps = 0
 
         while True:
             steps += direction * step_size
@@ -326,7 +620,7 @@ class Analysis:
             if _check is not None and _check[0] < best[0]:
                 best = _check
             else:
-                return steps, best[1]
+                return accept(steps, best)
 
     def get_ea(self, name: str | int) -> ElementAnalysis:
         el: AnyElement = self.manoeuvre.elements[name]
@@ -390,12 +684,13 @@ class Analysis:
 
     @staticmethod
     def from_dict(data: dict):
+        """Load from to_dict, with or without arrays"""
         manoeuvre = (
             Manoeuvre.from_dict(data["manoeuvre"]) if data.get("manoeuvre") else None
         )
 
         templates = (
-            {k: State.from_dict(v) for k, v in data["templates"].items()}
+            {k: binary.state_from_dict(v) for k, v in data["templates"].items()}
             if data.get("templates")
             else None
         )
@@ -411,7 +706,7 @@ class Analysis:
             Heading[data["schedule_direction"]]
             if (data["schedule_direction"] and data["schedule_direction"] != "Infer")
             else None,
-            State.from_dict(data["flown"]),
+            binary.state_from_dict(data["flown"]),
             ManDef.from_dict(data["mdef"]),
             data.get("option"),
             itrans,
@@ -420,13 +715,19 @@ class Analysis:
             scores,
         )
 
-    def to_dict(self, basic: bool = False) -> dict:
+    def to_dict(self, basic: bool = False, arrays: bool = False) -> dict:
+        """if arrays is True the States and results are stored as numpy arrays rather than
+        lists, for use with binary.encode"""
+
+        def state(st: State):
+            return binary.state_to_arrays(st) if arrays else st.to_dict(True)
+
         return dict(
             id=self.id,
             schedule_direction=self.schedule_direction.name
-            if self.schedule_direction
+            if self.schedule_direction is not None
             else None,
-            flown=self.flown.to_dict(True),
+            flown=state(self.flown),
             option=self.option,
             **(
                 {}
@@ -434,14 +735,37 @@ class Analysis:
                 else dict(
                     mdef=self.mdef.to_dict() if self.mdef else None,
                     manoeuvre=self.manoeuvre.to_dict() if self.manoeuvre else None,
-                    templates={k: tp.to_dict(True) for k, tp in self.templates.items()}
+                    templates={k: state(tp) for k, tp in self.templates.items()}
                     if self.templates
                     else None,
-                    scores=self.scores.to_dict() if self.scores else None,
+                    scores=self.scores.to_dict(arrays) if self.scores else None,
                 )
             ),
         )
 
+    def header(self) -> dict:
+        """The summary stored in the binary header, readable without decoding the arrays"""
+        return dict(
+            id=self.id,
+            name=self.name,
+            k=self.mdef.info.k,
+            option=self.option,
+            elements=[
+                dict(name=k, start=v.start, stop=v.stop)
+                for k, v in self.flown.labels.element.labels.items()
+            ]
+            if "element" in self.flown.labels.keys()
+            else None,
+            scores=self.scores.header() if self.scores else None,
+        )
+
+    def to_bytes(self, basic: bool = False) -> bytes:
+        return binary.encode(self.to_dict(basic, arrays=True), self.header())
+
+    @staticmethod
+    def from_bytes(data: bytes) -> Analysis:
+        return Analysis.from_dict(binary.decode(data))
+
     def fcj_results(self):
         return dict(
             els=[
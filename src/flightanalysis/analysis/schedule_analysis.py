@@ -1,14 +1,26 @@
 from __future__ import annotations
 from xmlrpc.client import boolean
 from flightdata import State
-from typing import Self
+from typing import Literal, Self
 from flightdata import Collection
 from flightanalysis import ManDef, SchedDef
 from schemas import AJson
 from flightanalysis.analysis.manoeuvre_analysis import Analysis
+from flightanalysis.analysis.lazy import LazyAnalysis, map_file
+from flightanalysis.analysis.tasks import (
+    AnalysisTask,
+    Projection,
+    TaskResult,
+    register_definitions,
+    run_task,
+)
+from flightanalysis.base import binary
+from flightanalysis.base.profiling import StageProfile
 from loguru import logger
+from dataclasses import replace
 from joblib import Parallel, delayed
 import os
+from pathlib import Path
 import numpy as np
 import pandas as pd
 
@@ -37,39 +49,133 @@ class ScheduleAnalysis(Collection[Analysis]):
             )
         return ScheduleAnalysis(analyses)
 
-    def run(
+    def run_tasks(
         self,
+        projection: Projection = "scores",
         optimise: bool = False,
         sync: boolean = False,
         throw_errors: bool = False,
         subset: list = None,
-    ) -> Self:
+        profile: bool | Literal["memory"] = False,
+    ) -> list[TaskResult]:
+        """Run the analyses in worker processes using the minimal payload task protocol.
+        The definitions are sent to each worker once, each task only carries the flown data.
+        """
         if subset is None:
             subset = range(len(self))
 
-        logger.info(f"Starting {os.cpu_count()} ma processes")
+        definitions = {man.mdef.uid: man.mdef.to_dict() for man in self}
+        tasks = [AnalysisTask.from_analysis(man) for i, man in enumerate(self) if i in subset]
+
         if sync:
-            madicts = [
-                Analysis.parse_analyse_serialise(man.to_dict(), optimise, throw_errors)
-                for i, man in enumerate(self)
-                if i in subset
+            register_definitions(definitions)
+            return [
+                run_task(task, projection, optimise, throw_errors, profile)
+                for task in tasks
             ]
         else:
-            madicts = Parallel(n_jobs=os.cpu_count() * 2 - 1)(
-                delayed(Analysis.parse_analyse_serialise)(
-                    man.to_dict(), optimise, throw_errors
-                )
-                for i, man in enumerate(self)
-                if i in subset
+            logger.info(f"Starting {os.cpu_count()} ma processes")
+            return Parallel(
+                n_jobs=os.cpu_count() * 2 - 1,
+                initializer=register_definitions,
+                initargs=(definitions,),
+            )(
+                delayed(run_task)(task, projection, optimise, throw_errors, profile)
+                for task in tasks
             )
 
+    def run(
+        self,
+        optimise: bool = False,
+        sync: boolean = False,
+        throw_errors: bool = False,
+        subset: list = None,
+        profile: bool | Literal["memory"] = False,
+    ) -> Self:
+        if subset is None:
+            subset = range(len(self))
+        subset = list(subset)
+
+        results = self.run_tasks("full", optimise, sync, throw_errors, subset, profile)
+
+        def load(res: TaskResult):
+            an = Analysis.from_bytes(res.analysis)
+            if res.profile is not None:
+                an = replace(
+                    an, profile=[StageProfile.from_dict(p) for p in res.profile]
+                )
+            return an
+
         return ScheduleAnalysis(
             [
-                Analysis.from_dict(madicts[subset.index(i)]) if i in subset else self[i]
+                load(results[subset.index(i)]) if i in subset else self[i]
                 for i in range(len(self))
             ]
         )
 
+    def profile_df(self) -> pd.DataFrame:
+        """The stage profiles of the analyses that were run with profile=True,
+        one row per manoeuvre and stage."""
+        df = pd.DataFrame(
+            [
+                dict(manoeuvre=ma.name, **p.summary())
+                for ma in self
+                for p in (ma.profile or [])
+            ]
+        )
+        counts = [
+            c
+            for c in df.columns
+            if c not in ["manoeuvre", "stage", "wall", "cpu", "memory", "ok"]
+        ]
+        df[counts] = df[counts].fillna(0).astype(int)
+        return df
+
+    def to_bytes(self) -> bytes:
+        """All the analyses in one binary container, the header holds each Analysis.header"""
+        return binary.encode(
+            dict(analyses=[ma.to_dict(arrays=True) for ma in self]),
+            [ma.header() for ma in self],
+        )
+
+    @staticmethod
+    def from_bytes(data: bytes) -> ScheduleAnalysis:
+        return ScheduleAnalysis(
+            [Analysis.from_dict(ma) for ma in binary.decode(data)["analyses"]]
+        )
+
+    @staticmethod
+    def open(path: Path | str) -> ScheduleAnalysis:
+        """Memory map a file written by to_bytes. The analyses are LazyAnalysis views, so
+        scores, summarydf and score_summary_df are answered from the header alone.
+        Call close, or use the result as a context manager, to release the map."""
+        container = binary.Container.from_bytes(map_file(path))
+        return ScheduleAnalysis(
+            [
+                LazyAnalysis(container, data, header)
+                for data, header in zip(
+                    container.header["data"]["analyses"], container.summary
+                )
+            ],
+            check_types=False,
+        )
+
+    def close(self):
+        """Close the containers of any LazyAnalysis views, they share one per file."""
+        containers = {}
+        for ma in self:
+            if isinstance(ma, LazyAnalysis):
+                ma.forget()
+                containers[id(ma.container)] = ma.container
+        for container in containers.values():
+            container.close()
+
+    def __enter__(self) -> ScheduleAnalysis:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def scores(self):
         scores = {}
         total = 0
@@ -77,7 +183,7 @@ class ScheduleAnalysis(Collection[Analysis]):
             ma.name: (ma.scores.score() if hasattr(ma, "scores") and ma.scores else 0)
             for ma in self
         }
-        total = sum([ma.mdef.info.k * v for ma, v in zip(self, scores.values())])
+        total = sum([ma.k * v for ma, v in zip(self, scores.values())])
         return total, scores
 
     def summarydf(self):
@@ -0,0 +1,160 @@
+"""A minimal payload protocol for running manoeuvre analyses in worker processes.
+
+Rather than round tripping every Analysis through to_dict / from_dict, a task
+carries the raw flown arrays, the flown labels and a reference to a manoeuvre
+definition. The definitions are registered once per worker process when the
+pool is created, and the worker only returns the projection of the result
+that the caller asked for.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from flightdata import State
+from flightdata.base.table import LabelGroups
+from schemas.positioning import Heading
+
+from flightanalysis.definition import ManDef, ManOption
+from flightanalysis.scoring.results import ManoeuvreResults
+from flightanalysis.scoring.results.store import (
+    difficulties,
+    score_columns,
+    truncations,
+)
+
+type Projection = Literal["scores", "labels", "full"]
+
+
+_definitions: dict[str, dict | list] = {}
+_parsed: dict[str, ManDef | ManOption] = {}
+
+
+def register_definitions(definitions: dict[str, dict | list]):
+    """Store the serialised manoeuvre definitions in this process.
+    This is used as the worker initializer so the definitions are only sent once per worker.
+    """
+    _definitions.clear()
+    _definitions.update(definitions)
+    _parsed.clear()
+
+
+def get_definition(ref: str) -> ManDef | ManOption:
+    """Parse a registered definition, the result is cached for the life of the process."""
+    if ref not in _parsed:
+        if ref not in _definitions:
+            raise KeyError(f"Definition {ref} has not been registered in this process")
+        _parsed[ref] = ManDef.from_dict(_definitions[ref])
+    return _parsed[ref]
+
+
+def score_array(scores: ManoeuvreResults | None) -> npt.NDArray:
+    """The score summary for every difficulty and truncation option.
+    shape = (difficulty, truncate, [intra, inter, positioning, total])"""
+    if scores is None:
+        return np.full((len(difficulties), len(truncations), len(score_columns)), np.nan)
+    return np.array(scores.score_matrix)
+
+
+@dataclass
+class AnalysisTask:
+    """The minimum information required to run an Analysis in another process.
+    mdef is a reference to a definition that has been registered with the worker.
+    """
+
+    id: int
+    mdef: str
+    schedule_direction: str | None
+    option: int | None
+    columns: list[str]
+    data: npt.NDArray
+    labels: dict
+
+    @staticmethod
+    def from_analysis(an) -> AnalysisTask:
+        return AnalysisTask(
+            an.id,
+            an.mdef.uid,
+            an.schedule_direction.name if an.schedule_direction is not None else None,
+            an.option,
+            list(an.flown.data.columns),
+            an.flown.data.to_numpy(),
+            an.flown.labels.to_dict(),
+        )
+
+    def flown(self) -> State:
+        return State.build(
+            pd.DataFrame(self.data, columns=self.columns).set_index("t", drop=False),
+            LabelGroups.from_dict(self.labels),
+        )
+
+    def analysis(self):
+        from flightanalysis.analysis.manoeuvre_analysis import Analysis
+
+        return Analysis(
+            self.id,
+            Heading[self.schedule_direction]
+            if self.schedule_direction and self.schedule_direction != "Infer"
+            else None,
+            self.flown(),
+            get_definition(self.mdef),
+            self.option,
+        )
+
+
+@dataclass
+class TaskResult:
+    """The result of an AnalysisTask, reduced to the requested projection.
+    scores - always populated, see score_array
+    elements, boundaries - the element names and stop times, for the labels and full projections
+    analysis - the Analysis from Analysis.to_bytes, only for the full projection
+    profile - the serialised stage profiles, if the task was run with profile=True
+    """
+
+    id: int
+    mdef: str
+    projection: Projection
+    scores: npt.NDArray
+    option: int | None = None
+    elements: list[str] | None = None
+    boundaries: npt.NDArray | None = None
+    analysis: bytes | None = None
+    profile: list[dict] | None = None
+
+    def score_summary(self, difficulty: int = 3, truncate: bool = False) -> dict[str, float]:
+        return dict(
+            zip(
+                score_columns,
+                self.scores[
+                    difficulties.index(difficulty), truncations.index(truncate)
+                ].tolist(),
+            )
+        )
+
+    def score(self, difficulty: int = 3, truncate: bool = False) -> float:
+        return self.score_summary(difficulty, truncate)["total"]
+
+
+def run_task(
+    task: AnalysisTask,
+    projection: Projection = "scores",
+    optimise: bool = False,
+    throw_errors: bool = False,
+    profile: bool | Literal["memory"] = False,
+) -> TaskResult:
+    an = task.analysis().run(optimise, throw_errors, profile=profile)
+
+    res = TaskResult(task.id, task.mdef, projection, score_array(an.scores), an.option)
+
+    if projection in ["labels", "full"] and "element" in an.flown.labels.keys():
+        res.elements = list(an.flown.labels.element.keys())
+        res.boundaries = np.array(an.flown.labels.element.boundaries)
+    if projection == "full":
+        res.analysis = an.to_bytes()
+    if an.profile is not None:
+        res.profile = [p.to_dict() for p in an.profile]
+    return res
@@ -0,0 +1,170 @@
+"""A compact binary container for analysis data.
+
+layout:
+    MAGIC (8 bytes) | version (uint32) | header length (uint64) | header (utf-8 JSON) | padding | data
+
+The header holds a small summary, a table of array specs and the serialised object tree
+in which every numpy array is replaced by {"__array__": index}. The arrays are written
+contiguously into the data block, each aligned to ALIGN bytes, so they can be read back
+with np.frombuffer without copying. The header can be read without touching the data block.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from dataclasses import dataclass
+from json import dumps, loads
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from flightdata import State
+from flightdata.base.table import LabelGroups
+
+MAGIC = b"FLTANLYS"
+VERSION = 1
+ALIGN = 64
+_PREFIX = struct.Struct("<IQ")
+
+
+class BinaryFormatError(Exception):
+    pass
+
+
+def _aligned(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _json_default(v):
+    if isinstance(v, np.generic):
+        return v.item()
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    raise TypeError(f"Cannot serialise {v.__class__.__name__}")
+
+
+def encode(tree: Any, summary: Any = None) -> bytes:
+    """Write tree to the binary container, summary is stored in the header."""
+    arrays: list[npt.NDArray] = []
+
+    def walk(v):
+        if isinstance(v, np.ndarray) and not v.dtype.hasobject:
+            arrays.append(np.ascontiguousarray(v))
+            return {"__array__": len(arrays) - 1}
+        elif isinstance(v, dict):
+            return {k: walk(_v) for k, _v in v.items()}
+        elif isinstance(v, (list, tuple)):
+            return [walk(_v) for _v in v]
+        return v
+
+    data = walk(tree)
+
+    specs, offset = [], 0
+    for arr in arrays:
+        specs.append(
+            dict(dtype=arr.dtype.str, shape=list(arr.shape), offset=offset)
+        )
+        offset = _aligned(offset + arr.nbytes)
+
+    header = dumps(
+        dict(summary=summary, arrays=specs, data=data), default=_json_default
+    ).encode("utf-8")
+
+    start = _aligned(len(MAGIC) + _PREFIX.size + len(header))
+    buffer = bytearray(start + offset)
+    buffer[: len(MAGIC)] = MAGIC
+    _PREFIX.pack_into(buffer, len(MAGIC), VERSION, len(header))
+    hstart = len(MAGIC) + _PREFIX.size
+    buffer[hstart : hstart + len(header)] = header
+    for spec, arr in zip(specs, arrays):
+        o = start + spec["offset"]
+        buffer[o : o + arr.nbytes] = memoryview(arr).cast("B")
+    return bytes(buffer)
+
+
+@dataclass
+class Container:
+    """A parsed container header and a view of the buffer it came from.
+    The arrays are only read when decode or array is called."""
+
+    header: dict
+    buffer: memoryview
+    start: int
+
+    @staticmethod
+    def from_bytes(buffer: bytes | bytearray | memoryview) -> Container:
+        buffer = memoryview(buffer)
+        if bytes(buffer[: len(MAGIC)]) != MAGIC:
+            raise BinaryFormatError("Not a flightanalysis binary container")
+        version, hlen = _PREFIX.unpack_from(buffer, len(MAGIC))
+        if version > VERSION:
+            raise BinaryFormatError(f"Unsupported container version {version}")
+        hstart = len(MAGIC) + _PREFIX.size
+        header = loads(bytes(buffer[hstart : hstart + hlen]).decode("utf-8"))
+        return Container(header, buffer, _aligned(hstart + hlen))
+
+    @property
+    def summary(self):
+        return self.header["summary"]
+
+    def close(self):
+        """Release the buffer and close it if it is a memory map. Decoded arrays are views of
+        the buffer, a map cannot be closed (BufferError) while any of them are still alive."""
+        source = self.buffer.obj
+        self.buffer.release()
+        if isinstance(source, mmap.mmap):
+            source.close()
+
+    def array(self, i: int) -> npt.NDArray:
+        spec = self.header["arrays"][i]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=int))
+        return np.frombuffer(
+            self.buffer, dtype, count, self.start + spec["offset"]
+        ).reshape(spec["shape"])
+
+    def decode(self, data: Any = None) -> Any:
+        """Rebuild the tree (or a branch of it), arrays are views of the buffer."""
+
+        def walk(v):
+            if isinstance(v, dict):
+                if "__array__" in v and len(v) == 1:
+                    return self.array(v["__array__"])
+                return {k: walk(_v) for k, _v in v.items()}
+            elif isinstance(v, list):
+                return [walk(_v) for _v in v]
+            return v
+
+        return walk(self.header["data"] if data is None else data)
+
+
+def decode(buffer: bytes | bytearray | memoryview) -> Any:
+    return Container.from_bytes(buffer).decode()
+
+
+def read_summary(buffer: bytes | bytearray | memoryview) -> Any:
+    """Read the summary from the header without touching the data block."""
+    return Container.from_bytes(buffer).summary
+
+
+def state_to_arrays(st: State) -> dict:
+    """A State as a single 2D array, for use with encode"""
+    return dict(
+        columns=list(st.data.columns),
+        values=st.data.to_numpy(),
+        labels=st.labels.to_dict(),
+    )
+
+
+def state_from_dict(data: dict | list) -> State:
+    """Read a State from state_to_arrays or from State.to_dict"""
+    if isinstance(data, dict) and "values" in data:
+        return State.build(
+            pd.DataFrame(data["values"], columns=data["columns"]).set_index(
+                "t", drop=False
+            ),
+            LabelGroups.from_dict(data["labels"]),
+        )
+    return State.from_dict(data)
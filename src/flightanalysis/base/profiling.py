@@ -0,0 +1,107 @@
+"""Lightweight instrumentation for the analysis pipeline.
+
+count is called where element templates are requested through Element.template (direct
+create_template calls are not counted, cache hits are), where element intentions are
+matched and where downgrades are evaluated. StageProfiler records the wall time, cpu time, peak
+memory and the change in those counts over a block of code. Analysis.run(profile=True)
+wraps each stage in a StageProfiler. The memory is only recorded while tracemalloc is
+tracing, Analysis.run(profile="memory") starts it for the run.
+
+The counts are process wide, so stages run concurrently in threads will see each other's calls.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+
+counters: Counter[str] = Counter()
+
+
+def count(name: str, n: int = 1):
+    counters[name] += n
+
+
+@dataclass
+class StageProfile:
+    """The resources used by one stage.
+    wall, cpu - seconds
+    memory - peak traced memory above the level at the start of the stage (bytes),
+        None if tracemalloc was not tracing
+    counts - the number of calls made during the stage, keyed by counter name
+    ok - False if the stage raised an exception
+    """
+
+    stage: str
+    wall: float
+    cpu: float
+    memory: int | None = None
+    counts: dict[str, int] = field(default_factory=dict)
+    ok: bool = True
+
+    def to_dict(self):
+        return dict(
+            stage=self.stage,
+            wall=self.wall,
+            cpu=self.cpu,
+            memory=self.memory,
+            counts=self.counts,
+            ok=self.ok,
+        )
+
+    @staticmethod
+    def from_dict(data: dict) -> StageProfile:
+        return StageProfile(**data)
+
+    def summary(self) -> dict:
+        return dict(
+            stage=self.stage,
+            wall=self.wall,
+            cpu=self.cpu,
+            memory=self.memory,
+            ok=self.ok,
+            **self.counts,
+        )
+
+
+class StageProfiler:
+    """Context manager that creates a StageProfile for the code it wraps.
+
+    with StageProfiler("stage") as sp:
+        ...
+    sp.profile
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.profile: StageProfile | None = None
+
+    def __enter__(self) -> StageProfiler:
+        self._counts = counters.copy()
+        self._memory = None
+        if tracemalloc.is_tracing():
+            self._memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        memory = (
+            tracemalloc.get_traced_memory()[1] - self._memory
+            if self._memory is not None and tracemalloc.is_tracing()
+            else None
+        )
+        self.profile = StageProfile(
+            self.stage,
+            wall,
+            cpu,
+            memory,
+            dict(counters - self._counts),
+            exc_type is None,
+        )
+        return False
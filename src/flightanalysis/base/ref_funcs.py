@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import inspect
+from collections import OrderedDict
 from numbers import Number
 import re
-from dataclasses import dataclass, field
-from typing import Any, Callable
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Any, Callable, ClassVar
 
 import numpy as np
+from flightdata import State
 from flightdata.base import Collection
 
 
@@ -34,14 +36,27 @@ class RefFunc:
     method: callable
     preset_kwargs: dict[str, Any] = field(default_factory=dict())
     description: str = ""
+    accepts_meta: bool = field(init=False, repr=False, compare=False)
+    RESULT_CACHE: ClassVar[ResultCache | None] = None
+
+    def __post_init__(self):
+        """resolve the call signature once rather than on every call"""
+        try:
+            argspec = inspect.getfullargspec(
+                self.method.measure if hasattr(self.method, "measure") else self.method
+            )
+            self.accepts_meta = "meta" in argspec.args + argspec.kwonlyargs
+        except TypeError:
+            self.accepts_meta = False
 
     def __getattr__(self, name):
         return getattr(self.method, name)
 
     def __call__(self, *args, meta=None, **kwargs):
-        argspec = inspect.getfullargspec(self.method.measure if hasattr(self.method, 'measure') else self.method)
-        if meta is not None and "meta" in argspec.args + argspec.kwonlyargs:
-            kwargs=dict(**kwargs, meta=meta)
+        if meta is not None and self.accepts_meta:
+            kwargs = dict(**kwargs, meta=meta)
+        if RefFunc.RESULT_CACHE is not None and hasattr(self.method, "measure"):
+            return RefFunc.RESULT_CACHE.call(self, args, kwargs)
         return self.method(*args, **kwargs, **self.preset_kwargs)
 
     def __str__(self):
@@ -96,6 +111,89 @@ class RefFunc:
         return description
 
 
+def _key(v: Any):
+    """A hashable key for a measure argument. States are keyed on their identity and the
+    identity of their DataFrame (which changes whenever the State is rebuilt), other
+    unhashable objects on their identity, so the arguments must be kept alive with the key."""
+    if isinstance(v, State):
+        return ("State", id(v), id(v.data))
+    elif isinstance(v, dict):
+        return ("dict", tuple((k, _key(_v)) for k, _v in v.items()))
+    elif isinstance(v, (list, tuple)):
+        return (v.__class__.__name__, tuple(_key(_v) for _v in v))
+    elif isinstance(v, Collection):
+        return (v.__class__.__name__, tuple(_key(_v) for _v in v))
+    elif is_dataclass(v) and not isinstance(v, type):
+        return (
+            v.__class__.__name__,
+            tuple((f.name, _key(getattr(v, f.name))) for f in fields(v)),
+        )
+    try:
+        hash(v)
+        return v
+    except TypeError:
+        return ("id", id(v))
+
+
+@dataclass
+class ResultCache:
+    """A size bounded LRU cache of measure results.
+
+    Calls are keyed on the RefFunc string and the arguments (see _key). Changes the measure
+    makes to the meta dict are stored with the result and replayed on a hit.
+
+    Enable it with RefFunc.RESULT_CACHE = ResultCache().
+    """
+
+    maxsize: int = 1024
+    hits: int = 0
+    misses: int = 0
+    _data: OrderedDict[tuple, tuple] = field(default_factory=OrderedDict, repr=False)
+
+    def call(self, rf: RefFunc, args: tuple, kwargs: dict):
+        key = (str(rf), _key(args), _key(kwargs))
+        meta = kwargs.get("meta", None)
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+        else:
+            self.misses += 1
+            before = dict(meta) if meta is not None else {}
+            res = rf.method(*args, **kwargs, **rf.preset_kwargs)
+            changes = (
+                {k: v for k, v in meta.items() if k not in before or before[k] is not v}
+                if meta is not None
+                else {}
+            )
+            # the arguments (and the meta values they were called with) are kept so the ids
+            # in the key cannot be reused
+            self._data[key] = (res, changes, (args, kwargs, before))
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        res, changes, _ = self._data[key]
+        if meta is not None:
+            meta.update(changes)
+        return res
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self) -> dict[str, int | float]:
+        total = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._data),
+            maxsize=self.maxsize,
+            hit_rate=self.hits / total if total > 0 else np.nan,
+        )
+
+
 class RefFuncs(Collection[RefFunc]):
     uid = "name"
 
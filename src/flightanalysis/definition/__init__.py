@@ -6,6 +6,7 @@ from .manparm import ManParm
 from .combo_setting import ComboSetting
 from .combo_settings import ComboSettings, ComboSet
 from .manparms import ManParms
+from .collection_plan import CollectionPlan
 from .eldef import ElDef, ElDefs
 
 from .mandef import ManDef
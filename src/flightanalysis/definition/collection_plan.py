@@ -0,0 +1,157 @@
+"""A compiled plan for collecting the inter element (Comparison) downgrades.
+
+ManParm.get_downgrades slices the State by element label, stacks the slices and reads the
+element parameters separately for every collector of every ManParm. The plan records once
+which ManParms are scored, which elements each collector reads from and how the criteria can
+be evaluated, so a collection extracts each element slice, stacked state and parameter once
+and evaluates all the plain Comparison criteria together.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from flightdata import State
+from geometry import Point
+
+from flightanalysis.elements import Elements
+from flightanalysis.scoring import Comparison, Measurement, Result
+from flightanalysis.scoring.criteria import Exponential
+
+from .collectors import Collector
+from .manparm import ManParm
+from .operations import Opp
+
+
+def signature(mps) -> list:
+    """The objects a plan depends on, compared by identity to check the plan is current"""
+    return [(mp, mp.criteria, mp.visibility, *mp.collectors) for mp in mps]
+
+
+@dataclass
+class CollectionPlan:
+    mps: list[ManParm]  # the Comparison ManParms with collectors, in order
+    elnames: list[set[str]]  # the elements each ManParm collects from
+    states: list[list[tuple[str, ...]]]  # the elements each collector's state is stacked from
+    vectorised: np.ndarray  # True where the criteria can be evaluated in the batch
+    signature: list
+
+    @staticmethod
+    def compile(mps) -> CollectionPlan:
+        cmps = [
+            mp for mp in mps if isinstance(mp.criteria, Comparison) and len(mp.collectors)
+        ]
+        return CollectionPlan(
+            cmps,
+            [set(mp.elnames) for mp in cmps],
+            [
+                # the same element order as Opp.extract_state
+                [tuple(set(p.elname for p in c.list_parms())) for c in mp.collectors]
+                for mp in cmps
+            ],
+            np.array([type(mp.criteria) is Comparison for mp in cmps], dtype=bool),
+            signature(mps),
+        )
+
+    def matches(self, mps) -> bool:
+        sig = signature(mps)
+        return len(sig) == len(self.signature) and all(
+            len(a) == len(b) and all(_a is _b for _a, _b in zip(a, b))
+            for a, b in zip(sig, self.signature)
+        )
+
+    def collect(
+        self, els: Elements, state: State, box, elnames: list[str] = None
+    ) -> list[Result]:
+        """The Comparison Results, matching ManParm.get_downgrades for each ManParm.
+        If elnames is provided only the ManParms that collect from those elements are included."""
+        ids = [
+            i
+            for i, mpels in enumerate(self.elnames)
+            if elnames is None or not mpels.isdisjoint(elnames)
+        ]
+        if len(ids) == 0:
+            return []
+
+        slices: dict[str, State] = {}
+        stacked: dict[tuple[str, ...], State] = {}
+        directions: dict[tuple[str, ...], Point] = {}
+        visibilities: dict[tuple[int, tuple[str, ...]], float] = {}
+        parms: dict[tuple[str, str], float] = {}
+
+        def extract(key: tuple[str, ...]) -> State:
+            if key not in stacked:
+                for elname in key:
+                    if elname not in slices:
+                        slices[elname] = els.data[elname].get_data(state)
+                stacked[key] = State.stack([slices[elname] for elname in key])
+            return stacked[key]
+
+        def direction(key: tuple[str, ...]) -> Point:
+            if key not in directions:
+                directions[key] = extract(key).pos.mean().unit()
+            return directions[key]
+
+        def visibility(mp: ManParm, key: tuple[str, ...]) -> float:
+            vkey = (id(mp.visibility), key)
+            if vkey not in visibilities:
+                visibilities[vkey] = mp.visibility(extract(key), box)
+            return visibilities[vkey]
+
+        def value(c: Opp):
+            if isinstance(c, Collector):
+                pkey = (c.elname, c.pname)
+                if pkey not in parms:
+                    parms[pkey] = c(els)
+                return parms[pkey]
+            return c(els)
+
+        measurements: list[Measurement] = []
+        visors: list[np.ndarray] = []
+        for i in ids:
+            mp, keys = self.mps[i], self.states[i]
+            measurements.append(
+                Measurement(
+                    np.array([value(c) for c in mp.collectors]),
+                    Point.concatenate([direction(k) for k in keys]),
+                    mp.unit,
+                    [str(c) for c in mp.collectors],
+                )
+            )
+            visors.append(
+                np.array([visibility(mp, k) for k in keys])
+                if mp.visibility
+                else np.ones(len(keys))
+            )
+
+        batch = self._compare(
+            [m.value for i, m in zip(ids, measurements) if self.vectorised[i]],
+            [self.mps[i].criteria.lookup for i in ids if self.vectorised[i]],
+        )
+
+        results = []
+        for i, m, visor in zip(ids, measurements, visors):
+            mp = self.mps[i]
+            results.append(
+                mp.comparison_result(
+                    m, visor, *(next(batch) if self.vectorised[i] else mp.criteria(m.value))
+                )
+            )
+        return results
+
+    @staticmethod
+    def _compare(values: list[np.ndarray], lookups: list[Exponential]):
+        """Comparison.__call__ for several ManParms, the errors are found in one pass and
+        each lookup is applied to its own slice. yields the errors, downgrades and keys for each"""
+        if len(values) == 0:
+            return
+        lengths = np.array([len(v) for v in values])
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        vals = np.abs(np.concatenate(values))
+        prev = np.roll(vals, 1)
+        prev[starts] = vals[starts]
+        errors = Comparison.ratio_errors(prev, vals)
+        for start, length, lookup in zip(starts, lengths, lookups):
+            errs = errors[start : start + length]
+            yield errs, lookup(errs), np.arange(length)
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cache
 from inspect import getfullargspec
 from numbers import Number
 from typing import Callable, List, Tuple, Union
@@ -6,6 +7,7 @@ from uuid import uuid1
 
 from .manparms import ManParms
 import numpy as np
+import numpy.typing as npt
 from flightdata import Collection
 
 from flightanalysis.elements import Element, AnyElement
@@ -14,6 +16,15 @@ from flightanalysis.scoring.downgrade import DownGrades
 from . import Collector, Collectors, ItemOpp, ManParm, Opp, SumOpp
 
 
+@cache
+def init_args(Kind) -> list[str]:
+    return getfullargspec(Kind.__init__).args
+
+
+def constant(value: Number) -> Callable:
+    return lambda v: value
+
+
 @dataclass
 class ElDef:
     """This class creates a function to build an element (Loop, Line, Snap, Spin, Stallturn)
@@ -27,6 +38,7 @@ class ElDef:
     Kind: AnyElement  # the class of the element (Loop, Line etc)
     props: dict[str, Number | Opp]  # The element property generators (Number, Opp)
     dgs: DownGrades  # The DownGrades applicable this element
+    _compiled: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def get_collector(self, name: str, index: int | None = None) -> Collector:
         return Collector(self.name, name, index)
@@ -51,24 +63,44 @@ class ElDef:
             dgs=DownGrades.from_dict(data["dgs"]),
         )
 
-    def __call__(self, mps: ManParms) -> Element:
+    def compile(self, names: tuple[str, ...]) -> dict[str, Callable]:
+        """The element properties as functions of a ManParm value vector ordered as names
+        (see Opp.compile). Compiled once for each set of names, so rebinding to a ManParms
+        with new values only requires the new value vector."""
+        if names not in self._compiled:
+            index = {n: i for i, n in enumerate(names)}
+            args = init_args(self.Kind)
+            props = {}
+            for pname, prop in self.props.items():
+                if pname in args:
+                    try:
+                        if isinstance(prop, Opp):
+                            props[pname] = prop.compile(index)
+                        elif isinstance(prop, Number):
+                            props[pname] = constant(prop)
+                        else:
+                            raise TypeError(
+                                f"Invalid prop type {prop.__class__.__name__}"
+                            )
+                    except Exception as e:
+                        raise Exception(
+                            f"Error creating property {pname} for {self.name} with {prop}"
+                        ) from e
+            self._compiled[names] = props
+        return self._compiled[names]
+
+    def __call__(self, mps: ManParms, values: list = None) -> Element:
+        """Create the element, values is the ManParms value vector if it is already available"""
+        props = self.compile(tuple(mps.data.keys()))
+        values = mps.value_vector() if values is None else values
         el_kwargs = {}
-        args = getfullargspec(self.Kind.__init__).args
-        for pname, prop in self.props.items():
-            if pname in args:
-                try:
-                    if isinstance(prop, ManParm):
-                        el_kwargs[pname] = mps.data[prop.name].value
-                    elif isinstance(prop, Opp):
-                        el_kwargs[pname] = prop(mps)
-                    elif isinstance(prop, Number):
-                        el_kwargs[pname] = prop
-                    else:
-                        raise TypeError(f"Invalid prop type {prop.__class__.__name__}")
-                except Exception as e:
-                    raise Exception(
-                        f"Error creating property {pname} for {self.name} with {prop}"
-                    ) from e
+        for pname, prop in props.items():
+            try:
+                el_kwargs[pname] = prop(values)
+            except Exception as e:
+                raise Exception(
+                    f"Error creating property {pname} for {self.name} with {self.props[pname]}"
+                ) from e
         try:
             return self.Kind(uid=self.name, **el_kwargs)
         except Exception as e:
@@ -76,9 +108,34 @@ class ElDef:
                 f"Error creating {self.name}, a {self.Kind.__name__} with {el_kwargs}"
             ) from e
 
+    def evaluate(self, mps: ManParms, vectors: list, n: int) -> dict[str, npt.NDArray]:
+        """The element properties for n settings, vectors is ManParms.value_vectors.
+        Each property has one row per setting."""
+        props = {}
+        for pname, prop in self.compile(tuple(mps.data.keys())).items():
+            try:
+                res = np.asarray(prop(vectors))
+            except Exception as e:
+                raise Exception(
+                    f"Error creating property {pname} for {self.name} with {self.props[pname]}"
+                ) from e
+            props[pname] = np.full(n, res) if res.ndim == 0 else res
+        return props
+
+    def create_batch(self, props: dict[str, npt.NDArray]) -> list[Element]:
+        """Create an element for each setting from the output of evaluate"""
+        n = len(next(iter(props.values()))) if len(props) else 1
+        return [
+            self.Kind(
+                uid=self.name,
+                **{k: v[i].item() if v.ndim == 1 else v[i] for k, v in props.items()},
+            )
+            for i in range(n)
+        ]
+
     @staticmethod
     def build(Kind, name: str, props: list[Opp | Number]):
-        pnames = getfullargspec(Kind.__init__).args[2:]
+        pnames = init_args(Kind)[2:]
         ed = ElDef(name, Kind, {k: v for k, v in zip(pnames, props)}, DownGrades([]))
 
         for key, value in zip(pnames, props):
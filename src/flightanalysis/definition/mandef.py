@@ -19,6 +19,8 @@ from .manparms import ManParms
 from loguru import logger
 
 import geometry as g
+import numpy as np
+import numpy.typing as npt
 from flightdata import State
 from schemas.maninfo import ManInfo, Position
 from schemas.positioning import Heading
@@ -110,13 +112,17 @@ class ManDef:
             self.guess_ipos(target_depth, heading), self.initial_rotation(heading)
         )
 
-    def entry_line_length(self, itrans: g.Transformation, target_depth=None) -> float:
+    def entry_line_length(
+        self, itrans: g.Transformation, target_depth=None, template: State = None
+    ) -> float:
         """Calculate the length of the entry line so that the manoeuvre is centred
         or extended to box edge as required.
 
         Args:
             itrans (Transformation): The location to draw the line from, usually the
                                         end of the last manoeuvre.
+            template (State, optional): A template of the elements after the entry line,
+                                        starting at itrans. Created if not provided.
 
         Returns:
             float: the line length
@@ -130,27 +136,25 @@ class ManDef:
         logger.debug(f"Target depth: {target_depth:.0f}, heading: {heading.name}")
 
         # Create a template at zero to work out how much space the manoueuvre needs
-        man = Manoeuvre(
-            Elements([ed(self.mps) for ed in self.eds[1:]]),
-            None,
-            uid=self.info.name,
-        )
+        elements = Elements([ed(self.mps) for ed in self.eds[1:]])
 
-        template = State.stack(
-            man.create_template(State.from_transform(itrans)), "element"
-        )
+        if template is None:
+            template = State.stack(
+                elements.create_templates(State.from_transform(itrans), None, 20),
+                "element",
+            )
 
         if self.info.position == Position.CENTRE and (
             heading == Heading.LTOR or heading == Heading.RTOL
         ):
             if len(self.info.centre_points) > 0:
                 xoffset = template.element[
-                    man.elements[self.info.centre_points[0] - 1].uid
+                    elements[self.info.centre_points[0] - 1].uid
                 ].pos.x[0]
 
             elif len(self.info.centred_els) > 0:
                 ce, fac = self.info.centred_els[0]
-                _x = template.element[man.elements[ce - 1].uid].pos.x
+                _x = template.element[elements[ce - 1].uid].pos.x
                 xoffset = _x[int(len(_x) * fac)]
             else:
                 xoffset = (max(template.pos.x) + min(template.pos.x)) / 2
@@ -165,23 +169,54 @@ class ManDef:
             }[heading]
             logger.debug(f"Bound: {bound}")
 
-            return max(min(getattr(self.box, bound)(template.pos)[1]), 20)
+            return max(min(self.box.face(bound)(template.pos)[1]), 20)
 
-    def fit_box(self, itrans: g.Transformation, target_depth=None):
+    def fit_box(
+        self, itrans: g.Transformation, target_depth=None, template: State = None
+    ):
         new_eline = replace(
             self.eds.entry_line,
             props=self.eds.entry_line.props
-            | dict(length=self.entry_line_length(itrans, target_depth)),
+            | dict(length=self.entry_line_length(itrans, target_depth, template)),
         )
         return replace(self, eds=ElDefs([new_eline] + self.eds[1:].to_list()))
 
     def create(self) -> Manoeuvre:
         """Create the manoeuvre based on the default values in self.mps."""
+        values = self.mps.value_vector()
         return Manoeuvre(
-            Elements([ed(self.mps) for ed in self.eds]),
+            Elements([ed(self.mps, values) for ed in self.eds]),
             uid=self.info.short_name,
         )
 
+    def element_parameters(
+        self, settings: npt.NDArray
+    ) -> dict[str, dict[str, npt.NDArray]]:
+        """The element properties for each row of an (n_settings, n_parms) array of ManParm
+        settings (see ManParms.settings), evaluated for all the settings at once."""
+        settings = np.atleast_2d(settings)
+        vectors = self.mps.value_vectors(settings)
+        return {ed.name: ed.evaluate(self.mps, vectors, len(settings)) for ed in self.eds}
+
+    def create_batch(self, settings: npt.NDArray) -> list[Manoeuvre]:
+        """create for each row of an (n_settings, n_parms) array of ManParm settings"""
+        els = [
+            ed.create_batch(props)
+            for ed, props in zip(self.eds, self.element_parameters(settings).values())
+        ]
+        return [
+            Manoeuvre(Elements(list(row)), uid=self.info.short_name) for row in zip(*els)
+        ]
+
+    def create_templates(
+        self, settings: npt.NDArray, itrans: g.Transformation, freq: int = 25
+    ) -> list[State]:
+        """The template for each row of an (n_settings, n_parms) array of ManParm settings"""
+        return [
+            State.stack(man.create_template(itrans, None, freq), "element")
+            for man in self.create_batch(settings)
+        ]
+
     def plot(self, depth=170, heading=Heading.LTOR):
         itrans = self.guess_itrans(depth, heading)
         man = self.create()
@@ -225,15 +260,11 @@ class ManDef:
         Args:
             intended (Manoeuvre): Usually a Manoeuvre that has been resized based on an alinged state
         """
-        new_mps = self.mps.update_defaults(man)
-        new_eds = ElDefs.from_dict(self.eds.to_dict(), new_mps)
-        return  replace(self, mps= new_mps, eds=new_eds, box=self.box)
+        return replace(self, mps=self.mps.update_defaults(man))
 
     def set_mps(self, **kwargs):
         """set the manparm default values"""
-        new_mps = self.mps.set_values(**kwargs)
-        new_eds = ElDefs.from_dict(self.eds.to_dict(), new_mps)
-        return replace(self, mps=new_mps, eds=new_eds, box=self.box)
+        return replace(self, mps=self.mps.set_values(**kwargs))
 
     def __iter__(self):
         """Iterate over the eds, elements and templates."""
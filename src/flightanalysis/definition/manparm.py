@@ -4,6 +4,7 @@ from numbers import Number
 from typing import Tuple
 
 import numpy as np
+import numpy.typing as npt
 from flightdata import Collection, State
 from geometry import Point
 from flightanalysis.base.ref_funcs import RefFunc
@@ -97,6 +98,18 @@ class ManParm(Opp):
     def assign(self, id, collector):
         self.collectors.data[id] = collector
 
+    @property
+    def elnames(self) -> list[str]:
+        """The names of the elements this parameter is collected from"""
+        return list(
+            dict.fromkeys(
+                p.elname
+                for c in self.collectors
+                for p in c.list_parms()
+                if isinstance(p, Collector)
+            )
+        )
+
     def collect(self, els: Elements):
         return {str(collector): collector(els) for collector in self.collectors}
 
@@ -129,13 +142,19 @@ class ManParm(Opp):
             [str(c) for c in self.collectors],
         )
 
+        return self.comparison_result(
+            measurement, visor, *self.criteria(measurement.value)
+        )
+
+    def comparison_result(
+        self, measurement: Measurement, visor: npt.NDArray, mistakes, dgs, ids
+    ) -> Result:
+        """The Result for a measurement of this parameter, given the collector
+        visibilities and the output of the criteria"""
         visibility = np.array(
             [visor[0]] + [max(va, vb) for va, vb in zip(visor[:-1], visor[1:])]
         )
 
-
-        mistakes, dgs, ids = self.criteria(measurement.value)
-
         return Result(
             self.name,
             self.name,
@@ -159,6 +178,12 @@ class ManParm(Opp):
     def __call__(self, *args, **kwargs):
         return self.value
 
+    def compile(self, index: dict[str, int]):
+        if self.name not in index:
+            return lambda v: self.value
+        i = index[self.name]
+        return lambda v: v[i]
+
     @property
     def kind(self):
         return self.criteria.__class__.__name__
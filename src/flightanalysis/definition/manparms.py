@@ -6,12 +6,14 @@ from pathlib import Path
 from typing import Callable, NamedTuple, Self
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from flightdata import Collection, State
 
 from flightanalysis.base.utils import parse_csv
 from flightanalysis.definition.operations import Opp
 from flightanalysis.definition.manparm import ManParm
+from flightanalysis.definition.collection_plan import CollectionPlan
 from flightanalysis.manoeuvre import Manoeuvre
 from flightanalysis.scoring import Combination, Comparison, Results
 from flightanalysis.scoring import inter_visors as visors
@@ -22,16 +24,52 @@ from .combo_settings import ComboSet, ComboSettings
 class ManParms(Collection[ManParm]):
     uid = "name"
 
-    def collect(self, manoeuvre: Manoeuvre, state: State, box) -> Results:
-        """Collect the comparison downgrades for each manparm for a given manoeuvre."""
+    def collect(
+        self, manoeuvre: Manoeuvre, state: State, box, elnames: list[str] = None
+    ) -> Results:
+        """Collect the comparison downgrades for each manparm for a given manoeuvre.
+        If elnames is provided only the manparms that collect from those elements are included."""
         return Results(
             "Inter",
-            [
-                mp.get_downgrades(manoeuvre.elements, state, box)
-                for mp in self
-                if isinstance(mp.criteria, Comparison) and len(mp.collectors)
-            ],
+            self.collection_plan().collect(manoeuvre.elements, state, box, elnames),
+        )
+
+    def collection_plan(self) -> CollectionPlan:
+        """The CollectionPlan for these manparms, compiled on the first call and reused
+        while the manparms, their criteria and their collectors are unchanged."""
+        plan = self.__dict__.get("_collection_plan")
+        if plan is None or not plan.matches(self):
+            plan = CollectionPlan.compile(self)
+            self._collection_plan = plan
+        return plan
+
+    def value_vector(self) -> list:
+        """The ManParm values in order, as used by the compiled Opps (see Opp.compile)"""
+        return [mp.value for mp in self]
+
+    def settings(self, n: int = 1, **kwargs) -> npt.NDArray:
+        """An (n, len(self)) array of settings, the defaults overridden by kwargs, which can be
+        a single value or one value per setting. Combinations are set by option index."""
+        arr = np.tile(
+            np.array(
+                [np.nan if mp.defaul is None else mp.defaul for mp in self], dtype=float
+            ),
+            (n, 1),
         )
+        for k, v in kwargs.items():
+            arr[:, self.index(k)] = v
+        return arr
+
+    def value_vectors(self, settings: npt.NDArray) -> list[npt.NDArray]:
+        """The value vector for an (n_settings, n_parms) array of settings, each entry holds
+        the values of a ManParm for every setting"""
+        settings = np.atleast_2d(settings)
+        return [
+            mp.criteria.desired[settings[:, i].astype(int)]
+            if isinstance(mp.criteria, Combination)
+            else settings[:, i]
+            for i, mp in enumerate(self)
+        ]
 
     def append_collectors(self, colls: dict[str, Callable]):
         """Append each of a dict of collector methods to the relevant ManParm"""
@@ -4,10 +4,28 @@ from dataclasses import dataclass
 from .operation import Opp, bracksplit
 from numbers import Number
 from typing import Callable, Literal
+import numpy as np
 
 
 funs = ["abs", "sign", "max", "min"]
 
+
+def _isarr(a) -> bool:
+    return isinstance(a, np.ndarray) and a.ndim > 0
+
+
+def _sign(a):
+    return np.where(a > 0, 1, -1) if _isarr(a) else (1 if a > 0 else -1)
+
+
+def _max(a, b):
+    return np.maximum(a, b) if _isarr(a) or _isarr(b) else max(a, b)
+
+
+def _min(a, b):
+    return np.minimum(a, b) if _isarr(a) or _isarr(b) else min(a, b)
+
+
 @dataclass
 class FunOpp(Opp):
     """This class facilitates various functions that operate on Values and their serialisation"""
@@ -27,6 +45,20 @@ class FunOpp(Opp):
                 return min(self.get_vf(self.a)(*args, **kwargs), self.get_vf(self.b)(*args, **kwargs))
             case 'sign':
                 return 1 if self.get_vf(self.a)(*args, **kwargs)>0 else -1
+    def compile(self, index: dict[str, int]) -> Callable:
+        fa = self.compile_vf(self.a, index)
+        match self.opp:
+            case "abs":
+                return lambda v: abs(fa(v))
+            case "sign":
+                return lambda v: _sign(fa(v))
+            case "max":
+                fb = self.compile_vf(self.b, index)
+                return lambda v: _max(fa(v), fb(v))
+            case "min":
+                fb = self.compile_vf(self.b, index)
+                return lambda v: _min(fa(v), fb(v))
+
     def __str__(self):
         return f"{self.opp}({str(self.a)}{',' + str(self.b) if self.b else ''})"
 
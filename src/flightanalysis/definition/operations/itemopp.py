@@ -3,6 +3,7 @@ from __future__ import annotations
 from flightdata import Collection
 from dataclasses import dataclass
 from typing import Callable
+import numpy as np
 from .operation import Opp
 from .funopp import FunOpp
 
@@ -17,6 +18,16 @@ class ItemOpp(Opp):
     def __call__(self, *args, **kwargs):
         return self.get_vf(self.a)(*args, **kwargs)[self.item]
     
+    def compile(self, index: dict[str, int]) -> Callable:
+        fa, item = self.compile_vf(self.a, index), self.item
+
+        def fun(v):
+            a = fa(v)
+            # a vector of combination values has one row per setting
+            return a[..., item] if isinstance(a, np.ndarray) and a.ndim > 1 else a[item]
+
+        return fun
+
     def __str__(self):
         return f"{self.a.name}[{self.item}]"
 
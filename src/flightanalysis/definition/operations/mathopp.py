@@ -25,6 +25,10 @@ class MathOpp(Opp):
             self.get_vf(self.b)(*args, **kwargs)
         )
 
+    def compile(self, index: dict[str, int]) -> Callable:
+        fa, fb, op = self.compile_vf(self.a, index), self.compile_vf(self.b, index), oplu[self.opp]
+        return lambda v: op(fa(v), fb(v))
+
     def __str__(self):
         return f"({str(self.a)}{self.opp}{str(self.b)})"
 
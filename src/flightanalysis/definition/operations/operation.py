@@ -60,6 +60,21 @@ class Opp:
         else:
             raise AttributeError("expected a number or an Opp")
 
+    def compile(self, index: dict[str, int]) -> Callable:
+        """Compile the operation into a function of a vector of ManParm values, index maps the
+        ManParm names to their position in the vector. The functions also accept vectors of
+        arrays, one value per setting, see ManParms.value_vector."""
+        raise TypeError(f"Cannot compile a {self.__class__.__name__}")
+
+    def compile_vf(self, arg, index: dict[str, int]) -> Callable:
+        """compile_vf is to compile as get_vf is to __call__"""
+        if isinstance(arg, Opp):
+            return arg.compile(index)
+        elif isinstance(arg, Number):
+            return lambda v: arg
+        else:
+            raise AttributeError("expected a number or an Opp")
+
     def __abs__(self) -> FunOpp:
         return FunOpp(self.name, "abs", self)
 
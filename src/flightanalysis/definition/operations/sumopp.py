@@ -15,6 +15,10 @@ class SumOpp(Opp):
     def __call__(self, mps, **kwargs):
         return sum([self.get_vf(v)(mps, **kwargs) for v in self.vals])
 
+    def compile(self, index: dict[str, int]) -> Callable:
+        fs = [self.compile_vf(v, index) for v in self.vals]
+        return lambda v: sum([f(v) for f in fs])
+
     def __str__(self):
         return f"sum([{','.join([str(v) for v in self.vals])}])"
     
@@ -1,5 +1,5 @@
 from json import dump
-from typing import Tuple
+from typing import Iterable, Literal, Tuple
 
 import geometry as g
 from flightdata import Collection, State
@@ -7,7 +7,7 @@ from schemas import ManInfo, Direction, Heading, DirectionDefinition, SDefFile
 
 from flightanalysis.definition.mandef import ManDef
 from flightanalysis.definition.manoption import ManOption
-from flightanalysis.elements import Line
+from flightanalysis.elements import Elements, Line
 from flightanalysis.schedule import Schedule
 
 
@@ -38,28 +38,72 @@ class SchedDef(Collection[ManDef]):
     def create_template(
         self, depth: float = 170, wind: Heading = Heading.LTOR, **kwargs
     ) -> Tuple[Schedule, State]:
-        templates = []
-        ipos = self[0].guess_ipos(depth, wind)
-
-        mans = []
-        for md in self:
-            md: ManDef = md[md.active] if isinstance(md, ManOption) else md
-
-            itrans = g.Transformation(
-                ipos if len(templates) == 0 else templates[-1][-1].pos,
-                g.Euler(
-                    md.info.start.orientation.value,
-                    0,
-                    md.info.start.direction.wind_swap_heading(wind).value,
-                )
-                if len(templates) == 0
-                else templates[-1][-1].att,
+        return self.create_templates([depth], [wind], **kwargs)[(depth, wind)]
+
+    def create_templates(
+        self,
+        depths: Iterable[float] = (170,),
+        winds: Iterable[Heading] = (Heading.LTOR,),
+        freq: int = 20,
+        npoints: int | Literal["min"] = 3,
+    ) -> dict[Tuple[float, Heading], Tuple[Schedule, State]]:
+        """Create the schedule template for every combination of depth and wind.
+
+        Only the entry lines depend on the depth, so the rest of each manoeuvre (the body) is
+        templated once per wind at the origin. For each depth the body is translated to the
+        start of the manoeuvre and passed to fit_box, so entry_line_length does not rebuild it,
+        then translated again and stacked onto the end of the new entry line.
+        """
+        mdefs: list[ManDef] = [
+            md[md.active] if isinstance(md, ManOption) else md for md in self
+        ]
+        names = [md.info.short_name for md in mdefs]
+        depths = list(depths)
+
+        def translate(pos: g.Point) -> g.Transformation:
+            return g.Transformation(pos, g.Quaternion(1, 0, 0, 0))
+
+        out = {}
+        for wind in winds:
+            bodies: list[State] = []
+            att = mdefs[0].initial_rotation(
+                mdefs[0].info.start.direction.wind_swap_heading(wind)
             )
-            md = md.fit_box(itrans)
-            man = md.create()
-            templates.append(State.stack(man.create_template(itrans, **kwargs), "element"))
-            mans.append(man)
-        return Schedule(mans), State.stack(templates, "manoeuvre", [md.info.short_name for md in self] )
+            for md in mdefs:
+                bodies.append(
+                    State.stack(
+                        Elements([ed(md.mps) for ed in md.eds[1:]]).create_templates(
+                            g.Transformation(att), None, freq, npoints
+                        ),
+                        "element",
+                    )
+                )
+                att = bodies[-1][-1].att
+
+            for depth in depths:
+                pos = mdefs[0].guess_ipos(depth, wind)
+                mans, templates = [], []
+                for md, body in zip(mdefs, bodies):
+                    itrans = g.Transformation(pos, body[0].att)
+                    man = md.fit_box(itrans, template=body.move(translate(pos))).create()
+                    entry = man.elements[0].template(
+                        State.from_transform(itrans, vel=g.PX()), None, freq, npoints
+                    )
+                    templates.append(
+                        State.stack(
+                            [
+                                entry.label(element=man.elements[0].uid),
+                                body.move(translate(entry[-1].pos)),
+                            ]
+                        )
+                    )
+                    mans.append(man)
+                    pos = templates[-1][-1].pos
+                out[(depth, wind)] = (
+                    Schedule(mans),
+                    State.stack(templates, "manoeuvre", names),
+                )
+        return out
 
     def plot(self, depth=170, wind=Heading.LTOR, **kwargs):
         sched, template = self.create_template(depth, wind)
@@ -1,5 +1,6 @@
 from .tags import ElTag
 from .element import Element, Elements
+from .template_cache import TemplateCache
 from .line import Line
 from .loop import Loop
 from .stall_turn import StallTurn
@@ -8,6 +8,8 @@ import inspect
 from typing import Self, ClassVar, Tuple, Literal
 from dataclasses import dataclass
 from .tags import ElTag
+from .template_cache import TemplateCache
+from flightanalysis.base.profiling import count
 
 class ElementError(Exception):
     pass
@@ -16,6 +18,7 @@ class ElementError(Exception):
 @dataclass
 class Element:
     parameters: ClassVar[list[str]] = ["speed"]
+    TEMPLATE_CACHE: ClassVar[TemplateCache | None] = None
     uid: str
     speed: float
 
@@ -101,6 +104,19 @@ class Element:
     def create_template(self, istate: State, fl: State = None) -> State:
         raise Exception("Not available on base class")
 
+    def template(
+        self,
+        istate: State,
+        fl: State = None,
+        freq: int = 25,
+        npoints: int | Literal["min"] = 3,
+    ) -> State:
+        """create_template, via Element.TEMPLATE_CACHE if it has been enabled"""
+        count("template")
+        if Element.TEMPLATE_CACHE is None:
+            return self.create_template(istate, fl, freq, npoints)
+        return Element.TEMPLATE_CACHE.create_template(self, istate, fl, freq, npoints)
+
     def match_intention(self, itrans: g.Transformation, flown: State) -> Self:
         raise Exception("Not available on base class")
 
@@ -204,7 +220,7 @@ class Elements(Collection[Element]):
         templates = [istate]
         for i, element in enumerate(self):
             templates.append(
-                element.create_template(
+                element.template(
                     templates[-1][-1],
                     aligned.element[element.uid] if aligned else None,
                     freq,
@@ -234,10 +250,11 @@ class Elements(Collection[Element]):
 
         for elm in self:
             st = aligned.element[elm.uid]
+            count("match_intention")
             elms.add(elm.match_intention(templates[-1][-1].transform, st))
 
             templates.append(
-                elms[-1].create_template(templates[-1][-1], st if match_index else None, freq, npoints)
+                elms[-1].template(templates[-1][-1], st if match_index else None, freq, npoints)
             )
 
         return elms, {el.uid: tp for el, tp in zip(elms, templates[1:])}
@@ -0,0 +1,169 @@
+"""Array kernels for the element templates.
+
+The element templates were built by chaining State.copy, State.fill, State.superimpose_angles
+and State.stack. Each step constructs and populates a new State (a DataFrame), which dominates
+the cost of template generation. Track holds the same constructs as plain geometry arrays
+and implements those steps with the same closed form arithmetic (uniform circular motion for
+fill, rotations integrated about the body or world axes for superimpose), so a template is
+built from arrays and converted to a State once at the end.
+
+The results match the State chains to within KERNEL_TOLERANCE (absolute, in the units of each
+column), the differences come from floating point reordering only.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+import geometry as g
+import numpy as np
+from flightdata import State
+
+KERNEL_TOLERANCE = 1e-9
+
+
+@dataclass
+class Track:
+    """The constructs of a State as geometry arrays, see module docstring"""
+
+    time: g.Time
+    pos: g.Point
+    att: g.Quaternion
+    vel: g.Point
+    rvel: g.Point
+    acc: g.Point
+
+    @staticmethod
+    def from_state(st: State) -> Track:
+        return Track(st.time, st.pos, st.att, st.vel, st.rvel, st.acc)
+
+    def to_state(self, **labels) -> State:
+        st = State.from_constructs(
+            self.time, self.pos, self.att, self.vel, self.rvel, self.acc
+        )
+        return st.label(**labels) if labels else st
+
+    def __len__(self):
+        return len(self.time.t)
+
+    @property
+    def t(self):
+        return self.time.t
+
+    @property
+    def dt(self):
+        return self.time.dt
+
+    @property
+    def duration(self) -> float:
+        return self.t[-1] - self.t[0]
+
+    @property
+    def transform(self) -> g.Transformation:
+        return g.Transformation(self.pos, self.att)
+
+    def __getitem__(self, i: int) -> Track:
+        """A single row Track, as State[i]"""
+        i = range(len(self))[i]
+        return Track(
+            g.Time.from_t(self.t[i : i + 1]),
+            self.pos[i : i + 1],
+            self.att[i : i + 1],
+            self.vel[i : i + 1],
+            self.rvel[i : i + 1],
+            self.acc[i : i + 1],
+        )
+
+    def copy(self, **kwargs) -> Track:
+        return replace(self, **kwargs)
+
+    def fill(self, time: g.Time) -> Track:
+        """State.fill, project forward through time assuming uniform circular motion"""
+        st = self[-1]
+        t = time.t - time.t[0]
+
+        vel = st.vel.tile(len(t))
+        rvel = (
+            g.point.vector_rejection(self.rvel, self.vel).tile(len(t))
+            if self.vel != 0
+            else self.rvel.tile(len(t))
+        )
+        att = st.att.body_rotate(rvel * t)
+        wvel = att.transform_point(self.vel)
+        wrvel = att.transform_point(rvel)
+
+        if self.rvel != 0 and self.vel != 0:
+            r0 = (
+                g.point.cross(wrvel[0], wvel[0]).unit()
+                * abs(wvel[0])[0]
+                / abs(g.point.vector_rejection(wrvel[0], wvel[0]))[0]
+            )
+            radius = g.Quaternion.from_axis_angle(wrvel * t).transform_point(-r0)
+            acc = -radius.unit() * abs(wvel[0]) ** 2 / abs(radius) + g.PZ(9.81, len(t))
+            pos = st.pos + r0 + radius
+        else:
+            pos = st.pos + wvel[0] * t
+            acc = g.PZ(9.81, len(t))
+
+        return Track(time, pos, att, vel, rvel, att.inverse().transform_point(acc))
+
+    def superimpose_angles(self, angles: g.Point, reference: str = "body") -> Track:
+        """State.superimpose_angles"""
+        assert reference in ["body", "world"]
+        rates = angles.diff(self.dt)
+        if reference == "body":
+            rot = g.Quaternion.from_axis_angle(angles).inverse()
+            return Track(
+                self.time,
+                self.pos,
+                self.att.body_rotate(angles),
+                rot.transform_point(self.vel),
+                rot.transform_point(self.rvel) + rates,
+                rot.transform_point(self.acc),
+            )
+        else:
+            att = self.att.rotate(angles)
+            back = att.inverse()
+            return Track(
+                self.time,
+                self.pos,
+                att,
+                back.transform_point(self.att.transform_point(self.vel)),
+                back.transform_point(self.att.transform_point(self.rvel) + rates),
+                back.transform_point(self.att.transform_point(self.acc)),
+            )
+
+    def superimpose_rotation(
+        self, axis: g.Point, angle: float, reference: str = "body"
+    ) -> Track:
+        """State.superimpose_rotation, a continuous rotation about axis"""
+        rotation = (
+            (self.t - self.t[0])
+            * angle
+            / (self.duration if self.duration > 0 else self.dt[0])
+        )
+        return self.superimpose_angles(
+            axis.unit().tile(len(self)) * rotation, reference
+        )
+
+    @staticmethod
+    def stack(tracks: list[Track]) -> Track:
+        """State.stack with an overlap of one row, each track is shifted in time to start at
+        the end of the previous one, which replaces the previous track's last row"""
+        ts = [tracks[0].t]
+        for tr in tracks[1:]:
+            ts.append(tr.t - tr.t[0] + ts[-1][-1])
+        keep = [slice(0, len(tr) - 1) for tr in tracks[:-1]] + [slice(None)]
+
+        def concat(attr: str):
+            items = [getattr(tr, attr)[k] for tr, k in zip(tracks, keep)]
+            return items[0].__class__.concatenate(items)
+
+        return Track(
+            g.Time.from_t(np.concatenate([t[k] for t, k in zip(ts, keep)])),
+            concat("pos"),
+            concat("att"),
+            concat("vel"),
+            concat("rvel"),
+            concat("acc"),
+        )
@@ -3,6 +3,7 @@ import numpy as np
 import geometry as g
 from flightdata import State
 from .element import Element
+from .kernels import Track
 from dataclasses import dataclass
 from typing import ClassVar, Literal
 
@@ -39,9 +40,11 @@ class Line(Element):
         npoints = 2 if npoints=="min" else npoints
         v = g.PX(self.speed) if istate.vel == 0 else istate.vel.scale(self.speed)
         return (
-            istate.copy(vel=v, rvel=g.P0())
+            Track.from_state(istate)
+            .copy(vel=v, rvel=g.P0())
             .fill(Element.create_time(self.length / self.speed, fl.time if fl else None, freq, npoints))
             .superimpose_rotation(g.PX(), self.roll)
+            .to_state()
         )
 
     def match_intention(self, itrans: g.Transformation, flown: State) -> Line:
@@ -3,6 +3,7 @@ import numpy as np
 import geometry as g
 from flightdata import State
 from . import Element
+from .kernels import Track
 from dataclasses import dataclass
 from typing import ClassVar, Literal
 
@@ -68,12 +69,14 @@ class Loop(Element):
         v = g.PX(self.speed) if istate.vel == 0 else istate.vel.scale(self.speed)
 
         return (
-            istate.copy(
+            Track.from_state(istate)
+            .copy(
                 vel=v,
                 rvel=self.axis * abs(self.angle) / duration,
             )
             .fill(Element.create_time(duration, fl.time if fl else None, freq, npoints))
             .superimpose_rotation(g.PX(), self.roll)
+            .to_state()
         )
 
     def measure_radius(self, itrans: g.Transformation, flown: State):
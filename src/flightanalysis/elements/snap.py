@@ -3,6 +3,7 @@ import numpy as np
 import geometry as g
 from flightdata import State
 from .element import Element
+from .kernels import Track
 from dataclasses import dataclass
 from typing import ClassVar, Literal
 
@@ -60,7 +61,8 @@ class Snap(Element):
         )
 
         pb = (
-            istate.copy(vel=g.PX(self.speed), rvel=g.P0())
+            Track.from_state(istate)
+            .copy(vel=g.PX(self.speed), rvel=g.P0())
             .fill(tpb)
             .superimpose_rotation(g.PY(), self.pitch)
             .superimpose_angles(
@@ -69,7 +71,7 @@ class Snap(Element):
             )
         )
 
-        au: State = (
+        au: Track = (
             pb[-1]
             .copy(rvel=g.P0())
             .fill(tau)
@@ -81,7 +83,7 @@ class Snap(Element):
             )
         )
 
-        rec: State = (
+        rec: Track = (
             au[-1]
             .copy(rvel=g.P0())
             .fill(trec)
@@ -95,7 +97,7 @@ class Snap(Element):
             )
         )
 
-        return State.stack([pb, au, rec]).label(element=self.uid)
+        return Track.stack([pb, au, rec]).to_state(element=self.uid)
 
     def describe(self):
         return f"Snap {self.roll}, {self.pitch}"
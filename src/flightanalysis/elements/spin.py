@@ -3,6 +3,7 @@ import numpy as np
 import geometry as g
 from flightdata import State
 from .element import Element
+from .kernels import Track
 from dataclasses import dataclass
 from typing import ClassVar, Literal
 
@@ -63,6 +64,7 @@ class Spin(Element):
     def create_template(
         self, istate: State, fl: State = None, freq=25, npoints: int | Literal["min"]=3
     ) -> State:
+        istate = Track.from_state(istate)
         istate = istate.copy(vel=istate.vel.unit() * self.speed)
 
         _inverted = 1 if istate.transform.rotation.is_inverted()[0] else -1
@@ -92,7 +94,7 @@ class Spin(Element):
         )
 
         if _td > 0:
-            nd: State = (
+            nd: Track = (
                 istate.copy(
                     vel=istate.vel.scale(self.speed),
                     rvel=g.PY(_inverted * 0.5 * np.pi / _td),
@@ -105,13 +107,12 @@ class Spin(Element):
                 )
             )
         else:
-            nd: State = istate.copy()
+            nd: Track = istate.copy()
 
-        au: State = (
+        au: Track = (
             nd[-1]
             .copy(rvel=g.P0())
             .fill(tau)
-            .label(element=self.uid + "_autorotation")
             .superimpose_rotation(
                 g.PZ(),
                 -np.sign(self.turns)
@@ -121,7 +122,7 @@ class Spin(Element):
         )
 
         if _trec > 0:
-            rec: State = (
+            rec: Track = (
                 au[-1]
                 .copy(rvel=g.P0())
                 .fill(trec)
@@ -136,7 +137,7 @@ class Spin(Element):
         else:
             rec = au[-1].copy()
 
-        return State.stack([nd, au, rec]).label(element=self.uid)
+        return Track.stack([nd, au, rec]).to_state(element=self.uid)
 
     def describe(self):
         return f"Spin {self.turns}, {self.pitch}"
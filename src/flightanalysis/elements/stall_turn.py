@@ -3,6 +3,7 @@ import numpy as np
 import geometry as g
 from flightdata import State
 from .element import Element
+from .kernels import Track
 from dataclasses import dataclass
 from typing import ClassVar, Literal
 from flightanalysis.scoring.measurement import Measurement
@@ -24,7 +25,8 @@ class StallTurn(Element):
         npoints: int | Literal["min"] = 3,
     ) -> State:
         return (
-            istate.copy(rvel=g.P0(), vel=g.P0())
+            Track.from_state(istate)
+            .copy(rvel=g.P0(), vel=g.P0())
             .fill(
                 Element.create_time(
                     np.pi / abs(self.yaw_rate),
@@ -34,6 +36,7 @@ class StallTurn(Element):
                 )
             )
             .superimpose_rotation(g.PZ(), np.sign(self.yaw_rate) * np.pi)
+            .to_state()
         )
 
     def match_axis_rate(self, yaw_rate: float) -> StallTurn:
@@ -3,6 +3,7 @@ import numpy as np
 import geometry as g
 from flightdata import State
 from .element import Element
+from .kernels import Track
 from dataclasses import dataclass
 from typing import ClassVar, Literal
 
@@ -46,7 +47,8 @@ class TailSlide(Element):
         )
 
         rotation = (
-            istate.copy(vel=g.PX(self.speed), rvel=g.P0())
+            Track.from_state(istate)
+            .copy(vel=g.PX(self.speed), rvel=g.P0())
             .fill(trot)
             .superimpose_rotation(
                 g.PY(), (np.pi + abs(self.over_flop)) * np.sign(self.pitch_rate)
@@ -62,7 +64,7 @@ class TailSlide(Element):
             )
         )
 
-        return State.stack([rotation, correction])
+        return Track.stack([rotation, correction]).to_state()
 
     def match_axis_rate(self, pitch_rate: float) -> TailSlide:
         return self.set_parms(pitch_rate=pitch_rate)
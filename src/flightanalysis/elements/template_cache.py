@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Literal
+
+import geometry as g
+import numpy as np
+from flightdata import State
+
+if TYPE_CHECKING:
+    from .element import Element
+
+
+@dataclass
+class TemplateCache:
+    """A size bounded LRU cache of element templates.
+
+    Templates are keyed on the element class and parameters, the initial attitude and
+    body velocities, and the time base (the flown time relative to its start, or freq
+    and npoints if no flown data is given). The cached template is stored with its
+    initial position at the origin and is relocated to the initial position on a hit.
+
+    Enable it with Element.TEMPLATE_CACHE = TemplateCache().
+    """
+
+    maxsize: int = 256
+    hits: int = 0
+    misses: int = 0
+    _data: OrderedDict[tuple, State] = field(default_factory=OrderedDict, repr=False)
+
+    @staticmethod
+    def key(
+        element: Element,
+        istate: State,
+        fl: State = None,
+        freq: int = 25,
+        npoints: int | Literal["min"] = 3,
+    ) -> tuple:
+        return (
+            element.__class__.__name__,
+            tuple(
+                (f.name, getattr(element, f.name))
+                for f in fields(element)
+                if f.name != "uid"
+            ),
+            istate.att.data.tobytes(),
+            istate.vel.data.tobytes(),
+            istate.rvel.data.tobytes(),
+            (fl.t - fl.t[0]).tobytes() if fl is not None else (freq, npoints),
+        )
+
+    def create_template(
+        self,
+        element: Element,
+        istate: State,
+        fl: State = None,
+        freq: int = 25,
+        npoints: int | Literal["min"] = 3,
+    ) -> State:
+        key = TemplateCache.key(element, istate, fl, freq, npoints)
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+        else:
+            self.misses += 1
+            self._data[key] = element.create_template(
+                istate.copy(pos=g.P0()), fl, freq, npoints
+            )
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        tp = self._data[key]
+        return tp.copy(pos=tp.pos + istate.pos)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self) -> dict[str, int | float]:
+        total = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._data),
+            maxsize=self.maxsize,
+            hit_rate=self.hits / total if total > 0 else np.nan,
+        )
@@ -8,3 +8,4 @@ from .downgrade import DownGrade, DownGrades
 
 
 
+from .rescoring import SampleBatch
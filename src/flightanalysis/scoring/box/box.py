@@ -14,7 +14,7 @@ from flightanalysis.scoring import (
 )
 from schemas.maninfo import ManInfo
 from flightdata import State
-from typing import Tuple
+from typing import Callable, Tuple
 import numpy.typing as npt
 from ..visibility import apply_visibility
 
@@ -41,6 +41,10 @@ class BoxDG:
         except Exception:
             return None
 
+def face_pos(d_l: T) -> g.Point:
+    return d_l[0] * d_l[1]
+
+
 box_sides = [
     "top",
     "bottom",
@@ -90,12 +94,11 @@ class Box:
         )
 
     def __getattr__(self, name: str):
+        """Fallback for the prefixed face names without an explicit method, such as ri_angle"""
+        if name.startswith("_"):
+            raise AttributeError(f"{self.__class__.__name__} has no attribute {name}")
         if name.endswith("_pos"):
-
-            def pos(d_l: T) -> g.Point:
-                return d_l[0] * d_l[1]
-
-            return lambda p=None: pos(getattr(self, name.rsplit("_", 1)[0])(p))
+            return lambda p=None: face_pos(getattr(self, name.rsplit("_", 1)[0])(p))
         for s in box_sides:
             if name.startswith(s[:2]):
                 parts = name.split("_")
@@ -108,10 +111,63 @@ class Box:
                 return fun
         raise AttributeError(f"{self.__class__.__name__} has no attribute {name}")
 
+    def top(self, p: g.Point = None) -> T:
+        return self._top(g.P0() if p is None else p)
+
+    def bottom(self, p: g.Point = None) -> T:
+        return self._bottom(g.P0() if p is None else p)
+
+    def left(self, p: g.Point = None) -> T:
+        return self._left(g.P0() if p is None else p)
+
+    def right(self, p: g.Point = None) -> T:
+        return self._right(g.P0() if p is None else p)
+
+    def front(self, p: g.Point = None) -> T:
+        return self._front(g.P0() if p is None else p)
+
+    def back(self, p: g.Point = None) -> T:
+        return self._back(g.P0() if p is None else p)
+
+    def top_pos(self, p: g.Point = None) -> g.Point:
+        """The vector from p to the top face, likewise for the other faces"""
+        return face_pos(self.top(p))
+
+    def bottom_pos(self, p: g.Point = None) -> g.Point:
+        return face_pos(self.bottom(p))
+
+    def left_pos(self, p: g.Point = None) -> g.Point:
+        return face_pos(self.left(p))
+
+    def right_pos(self, p: g.Point = None) -> g.Point:
+        return face_pos(self.right(p))
+
+    def front_pos(self, p: g.Point = None) -> g.Point:
+        return face_pos(self.front(p))
+
+    def back_pos(self, p: g.Point = None) -> g.Point:
+        return face_pos(self.back(p))
+
+    to, bo, le, ri, fr, ba = top, bottom, left, right, front, back
+    to_pos, bo_pos, le_pos = top_pos, bottom_pos, left_pos
+    ri_pos, fr_pos, ba_pos = right_pos, front_pos, back_pos
+
+    def face(self, name: str) -> Callable[[g.Point], T]:
+        """The accessor for a face by name"""
+        return {
+            "top": self.top,
+            "bottom": self.bottom,
+            "left": self.left,
+            "right": self.right,
+            "front": self.front,
+            "back": self.back,
+        }[name]
+
     def middle(self):
-        py = (self.back_pos() + self.front_pos()) / 2
-        pz = (self.top_pos(py) + self.bottom_pos(py)) / 2
-        return g.Point(0, py.y[0], pz.z[0])
+        d0 = self.distances(g.P0())
+        y = (d0[5, 0] - d0[4, 0]) / 2
+        d = self.distances(g.PY(y))
+        return g.Point(0, y, (d[0, 0] - d[1, 0]) / 2)
 
     def _top(self, p: g.Point) -> T:
         raise NotImplementedError
@@ -133,11 +189,29 @@ class Box:
         p = g.P0() if p is None else p
         return g.PY(1), self.distance + self.depth - p.y
 
+    def distances(self, p: g.Point) -> npt.NDArray:
+        """The signed distance from each point to each face, positive inside the box.
+        Shape (6, len(p)), rows ordered as box_sides."""
+        return np.stack([getattr(self, f"_{s}")(p)[1] for s in box_sides])
+
     def score(self, info: ManInfo, els: Elements, fl: State, tp: State):
+        """Score the positioning. If any of the box measures accept meta the face distances
+        are calculated once for the whole flown sample and passed as meta["box_distances"]."""
         res = Results("positioning")
 
-        if self.centre_dg and (len(info.centre_points) or len(info.centred_els)):
-            m, vis = self.centre_dg.measure(els, fl, tp, self)
+        centre = self.centre_dg and (len(info.centre_points) or len(info.centred_els))
+        relax_back = self.relax_back and abs(tp.pos.y.max() - tp.pos.y.min()) > 20
+        dgs = {k: dg for k, dg in self.bound_dgs.items() if not (relax_back and k == "back")}
+
+        meta = None
+        if any(
+            getattr(dg.measure, "accepts_meta", False)
+            for dg in ([self.centre_dg] if centre else []) + list(dgs.values())
+        ):
+            meta = dict(box_distances=dict(zip(box_sides, self.distances(fl.pos))))
+
+        if centre:
+            m, vis = self.centre_dg.measure(els, fl, tp, self, meta=meta)
 
             sample = apply_visibility(
                 m.value, vis, self.centre_dg.criteria.lookup.error_limit
@@ -166,18 +240,20 @@ class Box:
                 )
             )
 
-        for k, dg in self.bound_dgs.items():
-            if self.relax_back and k == "back":
-                if abs(tp.pos.y.max() - tp.pos.y.min()) > 20:
-                    continue
+        if len(dgs) == 0:
+            return res
 
-            m, vis = dg.measure(els, fl, tp, self)
+        measured = {k: dg.measure(els, fl, tp, self, meta=meta) for k, dg in dgs.items()}
 
-            sample = apply_visibility(
-                dg.criteria.prepare(m.value),
-                vis,
-                dg.criteria.lookup.error_limit,
-            )
+        # the visibility is applied to all the bounds in one pass
+        samples = apply_visibility(
+            np.stack([dg.criteria.prepare(measured[k][0].value) for k, dg in dgs.items()]),
+            np.stack([np.broadcast_to(vis, (len(fl),)) for _, vis in measured.values()]),
+            np.array([[dg.criteria.lookup.error_limit] for dg in dgs.values()]),
+        )
+
+        for (k, dg), sample in zip(dgs.items(), samples):
+            m, vis = measured[k]
             res.add(
                 Result(
                     f"{k}_box",
@@ -194,18 +270,20 @@ class Box:
         return res
 
     def corners(self):
-        f = self.front_pos()
-        b = self.back_pos()
+        d0 = self.distances(g.P0())
+        yf, yb = -d0[4, 0], d0[5, 0]
+        d = self.distances(g.Point([[0, yf, 0], [0, yb, 0]]))
+        l, r, b, t = -d[2], d[3], -d[1, 0], d[0]
         return g.Point(
             [
-                [self.le_pos(f).x[0], f.y[0], self.bo_pos(f).z[0]],
-                [self.ri_pos(f).x[0], f.y[0], self.bo_pos(f).z[0]],
-                [self.le_pos(f).x[0], f.y[0], self.to_pos(f).z[0]],
-                [self.ri_pos(f).x[0], f.y[0], self.to_pos(f).z[0]],
-                [self.le_pos(b).x[0], b.y[0], self.bo_pos(f).z[0]],
-                [self.ri_pos(b).x[0], b.y[0], self.bo_pos(f).z[0]],
-                [self.le_pos(b).x[0], b.y[0], self.to_pos(b).z[0]],
-                [self.ri_pos(b).x[0], b.y[0], self.to_pos(b).z[0]],
+                [l[0], yf, b],
+                [r[0], yf, b],
+                [l[0], yf, t[0]],
+                [r[0], yf, t[0]],
+                [l[1], yb, b],
+                [r[1], yb, b],
+                [l[1], yb, t[1]],
+                [r[1], yb, t[1]],
             ]
         )
 
@@ -24,6 +24,17 @@ class RectangularBox(Box):
     def _bottom(self, p: g.Point):
         return g.PZ(-1), p.z - self.floor 
 
+    def distances(self, p: g.Point):
+        x, y, z = p.data.T
+        return np.stack([
+            self.height + self.floor - z,
+            z - self.floor,
+            self.width / 2 + x,
+            self.width / 2 - x,
+            y - self.distance,
+            self.distance + self.depth - y,
+        ])
+
 
     def shift(self):
         pass
\ No newline at end of file
@@ -30,6 +30,26 @@ class TriangularBox(Box):
     def _bottom(self, p: g.Point):
         return g.PZ(-1), p.z - p.y * np.tan(self.floor)
 
+    def top_angle(self, p: g.Point = None):
+        return self._top_angle(g.P0() if p is None else p)
+
+    def right_angle(self, p: g.Point = None):
+        return self._right_angle(g.P0() if p is None else p)
+
+    def left_angle(self, p: g.Point = None):
+        return self._left_angle(g.P0() if p is None else p)
+
+    def distances(self, p: g.Point):
+        x, y, z = p.data.T
+        return np.stack([
+            y * np.tan(self.height) - z,
+            z - y * np.tan(self.floor),
+            y * np.tan(self.width / 2) + x,
+            y * np.tan(self.width / 2) - x,
+            y - self.distance,
+            self.distance + self.depth - y,
+        ])
+
     def centre_angle(self, p: g.Point):
         return g.PX(1), np.arctan2(p.x, p.y)
 
@@ -12,11 +12,16 @@ class Comparison(Criteria):
     def describe(self, unit: str = "") -> str:
         return f"{super().describe(unit)}: Used for comparing sequential values for a given parameter. Compares each value to the previous one."
 
+    @staticmethod
+    def ratio_errors(prev: npt.NDArray, vals: npt.NDArray) -> npt.NDArray:
+        """the ratio of the larger to the smaller of each pair of absolute values, less 1"""
+        return np.maximum(prev, vals) / np.minimum(prev, vals) - 1
+
     def __call__(self, vs: npt.NDArray)-> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
         """given an array of values
         returns the errors, downgrades and keys"""
         vals = np.abs(np.concatenate([[vs[0]],vs]))
-        errors = np.maximum(vals[:-1], vals[1:]) / np.minimum(vals[:-1], vals[1:]) - 1
+        errors = Comparison.ratio_errors(vals[:-1], vals[1:])
 
         return errors, self.lookup(errors), np.arange(len(vs))
 
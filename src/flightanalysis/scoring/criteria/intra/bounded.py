@@ -21,18 +21,18 @@ class Bounded(Criteria):
         """each downgrade corresponds to a group of values outside the bounds, ids
         correspond to the last value in each case"""
         # sample = self.prepare(vs)
+        if len(vs) == 0:
+            return np.array([]), np.array([]), np.array([], dtype=int)
 
-        groups = np.concatenate([[0], np.diff(vs != 0).cumsum()])
-        dgids = np.append(
-            np.arange(len(groups))[1:][np.diff(groups).astype(bool)], len(groups) - 1
-        )
+        # the index of the first value in each group after the first
+        starts = np.flatnonzero(np.diff(vs != 0)) + 1
+        dgids = np.append(starts, len(vs) - 1)
+
+        # the mean of each group multiplied by the ratio of its width to the total width,
+        # which is the sum of the group divided by the total width
+        starts = np.concatenate([[0], starts])
+        errors = np.add.reduceat(vs, starts) / len(vs)
 
-        errors = np.array(
-            [
-                np.mean(vs[groups == grp]) * len(vs[groups == grp]) / len(vs)
-                for grp in set(groups)
-            ]
-        )
         dgs = self.lookup(np.abs(errors))
 
         return errors[dgs>0], dgs[dgs>0], dgids[dgs>0]
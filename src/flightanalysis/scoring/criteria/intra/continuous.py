@@ -19,20 +19,31 @@ class Continuous(Criteria):
     def describe(self, unit: str = "") -> str:
         return "Continuous Criteria: Downgrades are assigned to each increase in the sample away from zero."
 
+    @staticmethod
+    def extrema(
+        absvs: npt.NDArray,
+        peaks: npt.NDArray | None = None,
+        troughs: npt.NDArray | None = None,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Locate the peaks and troughs of the absolute values in one pass.
+        The end points are a peak if the values are increasing towards them and a trough otherwise.
+        peaks and troughs can be preallocated boolean arrays of len(absvs)"""
+        n = len(absvs)
+        peaks = np.empty(n, dtype=bool) if peaks is None else peaks
+        troughs = np.empty(n, dtype=bool) if troughs is None else troughs
+
+        increasing = np.greater(absvs[1:], absvs[:-1])
+
+        # for booleans a > b == a & ~b, a < b == ~a & b
+        np.greater(increasing[:-1], increasing[1:], out=peaks[1:-1])
+        np.less(increasing[:-1], increasing[1:], out=troughs[1:-1])
+        peaks[0], troughs[0] = not increasing[0], increasing[0]
+        peaks[-1], troughs[-1] = increasing[-1], not increasing[-1]
+        return peaks, troughs
+
     @staticmethod
     def get_peak_locs(arr, rev=False):
-        _da = np.diff(np.abs(arr))
-        increasing = (np.sign(_da) > 0) & (_da != 0)
-        last_downgrade = np.column_stack([increasing[:-1], increasing[1:]])
-        peaks = np.sum(last_downgrade.astype(int) * [10, 1], axis=1) == (
-            1 if rev else 10
-        )
-        last_val = increasing[-1]
-        first_val = not increasing[0]
-        if rev:
-            last_val = not last_val
-            first_val = not first_val
-        return np.concatenate([np.array([first_val]), peaks, np.array([last_val])])
+        return Continuous.extrema(np.abs(arr))[1 if rev else 0]
 
     def __call__(
         self, vs: npt.NDArray,**kwargs
@@ -42,12 +53,9 @@ class Continuous(Criteria):
 
         vs = np.abs(vs)
 
-        peak_locs = Continuous.get_peak_locs(vs)
-        trough_locs = Continuous.get_peak_locs(vs, True)
+        peak_locs, trough_locs = Continuous.extrema(vs)
         mistakes = self.__class__.mistakes(vs, peak_locs, trough_locs)
-        dgids = self.__class__.dgids(
-            np.linspace(0, len(vs) - 1, len(vs)).astype(int), peak_locs, trough_locs
-        )
+        dgids = self.__class__.dgids(np.arange(len(vs)), peak_locs, trough_locs)
         return mistakes, self.lookup(np.abs(mistakes)), dgids
 
     @staticmethod
@@ -69,58 +77,79 @@ class Continuous(Criteria):
         self,
         sample: npt.NDArray,
         direction: Literal["forward", "backward"] = "forward",
+        out: npt.NDArray | None = None,
     ):
         """Calculate the height of each point above the last trough. (below the next peak if direction==backward)
         if direction is 'backward' then the local error at each point is calculated as if the sample started
         at that point, otherwise it is calculated as if the sample ended at that point.
+        out can be a preallocated float array of len(sample).
         """
-        # how much does the error increase in each timestep
-        dsample = np.concatenate([np.array([0]), np.diff(np.abs(sample))])
+        sample = np.abs(sample)
+        out = np.empty(len(sample)) if out is None else out
+        if len(sample) == 0:
+            return out
 
-        # cut at zero as the error cannot decrease
-        error_increment = np.where(dsample > 0, dsample, 0)
+        # how much does the error increase in each timestep, cut at zero as the error cannot decrease
+        out[0] = 0
+        np.subtract(sample[1:], sample[:-1], out=out[1:])
+        np.fmax(out, 0, out=out)
 
-        # identify discrete sections of error
-        clumps = np.split(error_increment, np.argwhere(error_increment == 0).T[0])
+        # each discrete section of error (clump) starts at a zero increment
+        starts = out == 0
 
-        # get the height of each point above the last trough
         if direction == "forward":
-            local_error = np.concatenate([np.cumsum(clump) for clump in clumps])
+            # running total less the running total at the start of the clump
+            np.cumsum(out, out=out)
+            base = np.where(starts, out, 0)
+            np.maximum.accumulate(base, out=base)
         else:
-            local_error = np.concatenate(
-                [np.cumsum(clump[::-1])[::-1] for clump in clumps]
-            )
+            # remaining total less the remaining total at the start of the next clump
+            np.cumsum(out[::-1], out=out[::-1])
+            base = np.full(len(out), -np.inf)
+            base[-1] = 0
+            base[:-1][starts[1:]] = out[1:][starts[1:]]
+            np.maximum.accumulate(base[::-1], out=base[::-1])
 
-        return local_error  # , local_dg
+        out -= base
+        return out
 
     def incremental_downgrade(
         self,
         local_dg: npt.NDArray,  # local_dg = self.lookup(local_error, limits),
         direction: Literal["forward", "backward"] = "forward",
+        out: npt.NDArray | None = None,
     ):
-        """Calculate the total downgrade for the element if the sample ended at each point."""
+        """Calculate the total downgrade for the element if the sample ended at each point.
+        out can be a preallocated float array of len(local_dg), it may be local_dg."""
+        out = np.empty(len(local_dg)) if out is None else out
+        if len(local_dg) == 0:
+            return out
 
         # the downgrade delta of each point
         if direction == "forward":
-            dg_increment = np.concatenate([[0], np.diff(local_dg)])
+            np.subtract(local_dg[1:], local_dg[:-1], out=out[1:])
+            out[0] = 0
         else:
-            dg_increment = np.concatenate([np.diff(local_dg[::-1])[::-1], [0]])
+            np.subtract(local_dg[:-1], local_dg[1:], out=out[:-1])
+            out[-1] = 0
 
         # downgrade deltas cant be negative ( if it is negative its because of a different clump)
-        dg_increment = np.where(dg_increment > 0, dg_increment, 0)
+        np.fmax(out, 0, out=out)
 
-        return (
-            dg_increment.cumsum()
-            if direction == "forward"
-            else dg_increment[::-1].cumsum()[::-1]
-        )
+        if direction == "forward":
+            np.cumsum(out, out=out)
+        else:
+            np.cumsum(out[::-1], out=out[::-1])
+        return out
 
     def calculate_increments(
-        self, sample: npt.NDArray, direction: Literal["forward", "backward"]
+        self,
+        sample: npt.NDArray,
+        direction: Literal["forward", "backward"],
+        out: npt.NDArray | None = None,
     ):
-        le = self.local_error(sample, direction)
-        ldg = self.lookup(le)
-        return self.incremental_downgrade(ldg, direction)
+        le = self.local_error(sample, direction, out)
+        return self.incremental_downgrade(self.lookup(le), direction, out=le)
 
     def process_increments(
         self,
@@ -129,12 +158,11 @@ class Continuous(Criteria):
         direction: Literal["forward", "backward"] = "forward",
     ):
         """This takes the incremental outputs and returns something that looks like __call__"""
-        clumps = np.split(local_error, np.argwhere(local_error == 0).T[0])
-        clump_lengths = np.array([len(clump) for clump in clumps])
-        clump_locs = np.cumsum(clump_lengths) - 1  # the index of each clump
-        dgids = np.array(
-            [clump_locs[i] for i, b in enumerate([len(c) > 1 for c in clumps]) if b]
-        )  # the end of the non-zero clumps
+        # clumps start at each zero, the ids are the last index of the clumps longer than one
+        bounds = np.concatenate(
+            [[0], np.flatnonzero(local_error == 0), [len(local_error)]]
+        )
+        dgids = (bounds[1:] - 1)[np.diff(bounds) > 1]
 
         return local_error[dgids], local_dg[dgids], dgids
 
@@ -1,6 +1,6 @@
 from .base import DG
 
 
-from .downgrade import DownGrade, dg
+from .downgrade import DownGrade, EvaluationCache, dg
 from .downgrade_pair import PairedDowngrade, pdg
 from .downgrades import DownGrades
\ No newline at end of file
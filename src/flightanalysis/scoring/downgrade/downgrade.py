@@ -1,7 +1,8 @@
 from __future__ import annotations
 from flightanalysis.elements.tags import DGTags
 
-from dataclasses import dataclass, replace
+from collections import Counter
+from dataclasses import dataclass, field, replace
 from typing import Tuple
 
 from loguru import logger
@@ -17,6 +18,7 @@ import numpy.typing as npt
 from flightdata import State
 from geometry.utils import apply_index_slice
 
+from flightanalysis.base.profiling import count
 from flightanalysis.base.ref_funcs import RefFunc, RefFuncs
 
 from ..reffuncs import measures as me, selectors as se, visors as vi
@@ -30,6 +32,39 @@ class SquashError(Exception):
     pass
 
 
+@dataclass
+class EvaluationCache:
+    """The selections and measurements made while applying a set of downgrades to one element.
+    selections are keyed on the selector strings, measurements on the selectors and measure string.
+    requested counts how many were asked for, so the difference shows the work that was shared.
+    The cache is bound to the element, flown and template data of the first downgrade it is
+    used with, using it with any other data raises a ValueError.
+    """
+
+    selections: dict = field(default_factory=dict)
+    measurements: dict = field(default_factory=dict)
+    requested: Counter = field(default_factory=Counter)
+    computed: Counter = field(default_factory=Counter)
+    source: tuple | None = None
+
+    def bind(self, el, fl: State, tp: State):
+        if self.source is None:
+            self.source = (el, fl, tp)
+        elif any(a is not b for a, b in zip(self.source, (el, fl, tp))):
+            raise ValueError("An EvaluationCache can only be used for one element")
+
+    def report(self) -> dict[str, dict[str, int]]:
+        computed = dict(
+            selections=len(self.selections),
+            measurements=len(self.measurements),
+            visors=self.computed["visors"],
+        )
+        return {
+            k: dict(requested=self.requested[k], computed=v, saved=self.requested[k] - v)
+            for k, v in computed.items()
+        }
+
+
 @dataclass
 class DownGrade(DG):
     """This is for Intra scoring, it sits within an El and defines how errors should be measured and the criteria to apply
@@ -106,33 +141,74 @@ class DownGrade(DG):
         except Exception as e:
             raise Exception(f"Creating sample: {e}") from e
 
+    @property
+    def selection_key(self) -> tuple[str, ...]:
+        return tuple(self.selectors.to_list())
+
+    @property
+    def measurement_key(self) -> tuple[tuple[str, ...], str]:
+        return (self.selection_key, str(self.measure))
+
+    def _select(self, fl: State, tp: State, cache: EvaluationCache | None = None):
+        """The selected ids and spliced data, shared between downgrades with the same selectors"""
+        if cache is not None:
+            cache.requested["selections"] += 1
+            if self.selection_key in cache.selections:
+                return cache.selections[self.selection_key]
+        meta = {}
+        oids, fl, tp = self.select(fl, tp, meta=meta)
+        if len(oids) > 0:
+            _oids = oids.copy()
+            _oids[0] = int(np.ceil(oids[0]))
+            _oids[-1] = int(np.ceil(oids[-1]) + (0 if _oids[0] == oids[0] else 1))
+        else:
+            _oids = oids
+        selection = (oids, _oids.astype(int), fl, tp, meta)
+        if cache is not None:
+            cache.selections[self.selection_key] = selection
+        return selection
+
+    def _measure(self, el, fl: State, tp: State, meta: dict, cache: EvaluationCache | None = None):
+        """The measurement and visibility, shared between downgrades with the same selectors and measure"""
+        if cache is not None:
+            cache.requested["measurements"] += 1
+            cache.requested["visors"] += len(self.measure.visor)
+            if self.measurement_key in cache.measurements:
+                return cache.measurements[self.measurement_key]
+        meta = dict(meta)
+        measurement = self.measure(Elements([el]), fl, tp, meta=meta)
+        visibility = {}
+        for v in self.measure.visor:
+            visibility[v.__name__] = v(fl, tp, measurement, meta=meta)
+
+        meta["visibility"] = {k: v.tolist() for k, v in visibility.items()}
+        visibility = np.prod([v for v in visibility.values()], axis=0)
+        res = (measurement, visibility, meta)
+        if cache is not None:
+            cache.measurements[self.measurement_key] = res
+            cache.computed["visors"] += len(self.measure.visor)
+        return res
+
     def __call__(
         self,
         el,
         fl: State,
         tp: State,
+        cache: EvaluationCache | None = None,
     ) -> Result:
+        """Score the element. If a cache is passed the selection and measurement are taken from
+        it where another downgrade with the same selectors (and measure) has already made them."""
+        count("downgrade")
+        if cache is not None:
+            cache.bind(el, fl, tp)
         try:
-            meta = {}
-            oids, fl, tp = self.select(fl, tp, meta=meta)
+            oids, _oids, fl, tp, meta = self._select(fl, tp, cache)
             if len(oids) == 0:
                 raise SquashError("No data selected by selectors")
 
-            _oids = oids.copy()
-            _oids[0] = int(np.ceil(oids[0]))
-            _oids[-1] = int(np.ceil(oids[-1]) + (0 if _oids[0] == oids[0] else 1))
-
-            measurement = self.measure(Elements([el]), fl, tp, meta=meta)
-            visibility = {}
-            for v in self.measure.visor:
-                visibility[v.__name__] = v(fl, tp, measurement, meta=meta)
-
-            meta["visibility"] = {k: v.tolist() for k, v in visibility.items()}
-            visibility = np.prod([v for v in visibility.values()], axis=0)
+            measurement, visibility, meta = self._measure(el, fl, tp, meta, cache)
 
-            sample = self.create_sample(measurement.value, visibility)[
-                _oids.astype(int)
-            ]
+            sample = self.create_sample(measurement.value, visibility)[_oids]
 
             return Result(
                 self.name,
@@ -141,9 +217,9 @@ class DownGrade(DG):
                 visibility,
                 sample,
                 oids,
-                *self.criteria(sample, dt=fl.dt[_oids.astype(int)]),
+                *self.criteria(sample, dt=fl.dt[_oids]),
                 self.criteria,
-                meta,
+                dict(meta),
             )
         except (SquashError, Exception) as e:
             if type(e) is SquashError:
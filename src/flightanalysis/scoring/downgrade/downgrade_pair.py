@@ -3,6 +3,7 @@ import numpy as np
 import numpy.typing as npt
 from dataclasses import dataclass, replace
 from .base import DG
+from flightanalysis.base.profiling import count
 from .downgrade import DownGrade
 from ..results import Result
 from flightanalysis.elements import Elements
@@ -42,7 +43,7 @@ class PairedDowngrade(DG):
         mkwargs: dict = None,
         sekwargs: dict = None,
     ) -> Tuple[Result]:
-
+        count("downgrade")
         m1 = self.first.measure(Elements([el]), fl, tp, **(mkwargs or {}))
         m2 = self.second.measure(Elements([el]), fl, tp, **(mkwargs or {}))
 
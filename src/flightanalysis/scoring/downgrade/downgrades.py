@@ -1,6 +1,6 @@
 from __future__ import annotations
 from .base import DG
-from .downgrade import DownGrade, dg, SquashError
+from .downgrade import DownGrade, EvaluationCache, dg, SquashError
 from .downgrade_pair import PairedDowngrade, pdg
 
 from flightdata.base import Collection
@@ -24,11 +24,23 @@ class DownGrades(Collection[DG]):
         el: str | Any,
         fl,
         tp,
+        fused: bool = True,
+        cache: EvaluationCache | None = None,
     ) -> Results:
+        """Apply all the downgrades to an element.
+        If fused the downgrades that use the same selectors share the selected data, and those
+        that also use the same measure share the measurement and visibility. Pass a cache to
+        read cache.report() afterwards. PairedDowngrades are always evaluated separately.
+        """
+        if fused and cache is None:
+            cache = EvaluationCache()
         res = Results(el if isinstance(el, str) else el.uid, [])
         for downgrade in self:
             try:
-                res.add(downgrade(el, fl, tp))
+                if isinstance(downgrade, DownGrade):
+                    res.add(downgrade(el, fl, tp, cache=cache if fused else None))
+                else:
+                    res.add(downgrade(el, fl, tp))
             except SquashError as e:
                 logger.debug(f"Skipping downgrade {downgrade.name}: {e}")
             except Exception as e:
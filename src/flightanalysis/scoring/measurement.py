@@ -29,7 +29,15 @@ class Measurement:
             self.unit,
         )
 
-    def to_dict(self):
+    def to_dict(self, arrays: bool = False):
+        """if arrays is True the numpy arrays are not converted to lists"""
+        if arrays:
+            return dict(
+                value=np.asarray(self.value),
+                direction=self.direction.data,
+                unit=self.unit,
+                keys=np.asarray(self.keys) if self.keys is not None else None,
+            )
         return dict(
             value=list(self.value),
             direction=self.direction.to_dicts(),
@@ -46,10 +54,12 @@ class Measurement:
     @staticmethod
     def from_dict(data: dict) -> Measurement:
         return Measurement(
-            np.array(data["value"]),
-            g.Point.from_dicts(data["direction"]),
+            np.asarray(data["value"]),
+            g.Point(data["direction"])
+            if isinstance(data["direction"], np.ndarray)
+            else g.Point.from_dicts(data["direction"]),
             data["unit"],
-            np.array(data["keys"])
+            np.asarray(data["keys"])
             if "keys" in data and data["keys"] is not None
             else None,
         )
@@ -0,0 +1,158 @@
+"""Rescore one downgrade across an archive of flights with a new criteria.
+
+SampleBatch.extract collects every stored Result with a given downgrade name into
+concatenated arrays, with offsets marking where each Result starts. A new Exponential
+is applied to the stored errors in one call. A new Criteria is applied to the
+concatenated samples in one call where its errors are elementwise (Single, Limit,
+Threshold), and one Result at a time otherwise. As with Result.replace_criteria the
+stored samples are reused, so any effect of the new lookup on the visibility weighting
+is ignored, and the time steps are not stored so Deviation and Total see unit steps.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from flightanalysis.scoring.criteria import (
+    Criteria,
+    Exponential,
+    Limit,
+    Single,
+    Threshold,
+)
+from flightanalysis.scoring.results import ManoeuvreResults, Result, apply_criteria, diff
+from flightanalysis.scoring.results.store import difficulties
+
+
+def _segment_ids(offsets: npt.NDArray) -> npt.NDArray:
+    """The segment index of each value in an array split by offsets"""
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def _offsets(lengths: Iterable[int]) -> npt.NDArray:
+    return np.concatenate([[0], np.cumsum(list(lengths), dtype=int)]).astype(int)
+
+
+def _concat(arrays: list[npt.NDArray]) -> npt.NDArray:
+    return np.concatenate(arrays) if len(arrays) else np.array([])
+
+
+def _find(mres: ManoeuvreResults, name: str) -> list[Result]:
+    return [
+        res
+        for results in [mres.inter, *mres.intra, mres.positioning]
+        for res in results
+        if res.name == name
+    ]
+
+
+@dataclass
+class SampleBatch:
+    """Every stored Result of one downgrade across a set of flights.
+    flights - the key of each flight
+    rflight - the flight index of each Result
+    offsets - (nresults + 1) start of each Result in samples
+    samples - the concatenated samples
+    eoffsets - (nresults + 1) start of each Result in errors and dgs
+    errors, dgs - the concatenated errors and downgrades
+    criteria - the criteria of each Result
+    downgrades - (nflights, 3) the total untruncated downgrade of each flight at each difficulty
+    """
+
+    name: str
+    flights: list[Hashable]
+    rflight: npt.NDArray
+    offsets: npt.NDArray
+    samples: npt.NDArray
+    eoffsets: npt.NDArray
+    errors: npt.NDArray
+    dgs: npt.NDArray
+    criteria: list[Criteria]
+    downgrades: npt.NDArray
+
+    @staticmethod
+    def extract(
+        archive: Mapping[Hashable, ManoeuvreResults] | Iterable[ManoeuvreResults],
+        name: str,
+    ) -> SampleBatch:
+        """Collect the Results named name from each flight in the archive.
+        If the archive is not a mapping the flights are keyed by their position."""
+        if not isinstance(archive, Mapping):
+            archive = dict(enumerate(archive))
+
+        flights, rflight, results, downgrades = [], [], [], []
+        for i, (k, mres) in enumerate(archive.items()):
+            flights.append(k)
+            summaries = [mres.score_summary(d) for d in difficulties]
+            downgrades.append(
+                [s["intra"] + s["inter"] + s["positioning"] for s in summaries]
+            )
+            for res in _find(mres, name):
+                rflight.append(i)
+                results.append(res)
+
+        return SampleBatch(
+            name,
+            flights,
+            np.array(rflight, dtype=int),
+            _offsets(len(r.sample) for r in results),
+            _concat([np.asarray(r.sample, dtype=float) for r in results]),
+            _offsets(len(r.dgs) for r in results),
+            _concat([np.asarray(r.errors, dtype=float) for r in results]),
+            _concat([np.asarray(r.dgs, dtype=float) for r in results]),
+            [r.criteria for r in results],
+            np.array(downgrades, dtype=float).reshape(-1, len(difficulties)),
+        )
+
+    def __len__(self):
+        return len(self.criteria)
+
+    def rescore(
+        self, criteria: Criteria | Exponential
+    ) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+        """Apply a new lookup or criteria to every Result.
+        returns the concatenated errors, the concatenated dgs and their offsets"""
+        if isinstance(criteria, Exponential):
+            return self.errors, criteria(np.abs(self.errors)), self.eoffsets
+        if type(criteria) is Single:
+            errors = np.abs(self.samples)
+            return errors, criteria.lookup(errors), self.offsets
+        if type(criteria) in (Limit, Threshold):
+            return self.samples, criteria.lookup(self.samples), self.offsets
+
+        errors, dgs = [], []
+        for i in range(len(self)):
+            sample = self.samples[self.offsets[i] : self.offsets[i + 1]]
+            e, d, _ = apply_criteria(criteria, sample)
+            errors.append(np.asarray(e, dtype=float))
+            dgs.append(np.asarray(d, dtype=float))
+        return _concat(errors), _concat(dgs), _offsets(len(d) for d in dgs)
+
+    def flight_totals(
+        self, dgs: npt.NDArray, offsets: npt.NDArray, difficulty: int = 3
+    ) -> npt.NDArray:
+        """The difficulty factored downgrade of each flight for a set of concatenated dgs"""
+        return np.bincount(
+            self.rflight[_segment_ids(offsets)],
+            diff(dgs, difficulty) if len(dgs) else dgs,
+            minlength=len(self.flights),
+        )
+
+    def deltas(
+        self, criteria: Criteria | Exponential, difficulty: int = 3
+    ) -> pd.Series:
+        """The change in the untruncated score of each flight if this downgrade used criteria"""
+        _, dgs, offsets = self.rescore(criteria)
+        old = self.flight_totals(self.dgs, self.eoffsets, difficulty)
+        new = self.flight_totals(dgs, offsets, difficulty)
+        base = self.downgrades[:, difficulties.index(difficulty)]
+        return pd.Series(
+            np.maximum(10 - base - new + old, 0) - np.maximum(10 - base, 0),
+            index=self.flights,
+            name=self.name,
+        )
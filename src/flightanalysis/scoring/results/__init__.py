@@ -1,4 +1,5 @@
-from .result import Result, diff, trunc
+from .result import Result, apply_criteria, diff, trunc
 from .results import Results
 from .elements_results import ElementsResults
-from .manoeuvre_results import ManoeuvreResults
\ No newline at end of file
+from .manoeuvre_results import ManoeuvreResults
+from .store import ResultsStore
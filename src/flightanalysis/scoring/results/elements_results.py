@@ -60,9 +60,9 @@ class ElementsResults(Collection[Results]):
                 sums[k] = sums[k] + v if k in sums else v                    
         return sums
         
-    def to_dict(self) -> dict[str, dict]:
+    def to_dict(self, arrays: bool = False) -> dict[str, dict]:
         return dict(
-            data={k: v.to_dict() for k, v in self.data.items()},
+            data={k: v.to_dict(arrays) for k, v in self.data.items()},
             summary=self.downgrade_list,
             total=float(self.total),
         )
@@ -78,13 +78,13 @@ class ElementsResults(Collection[Results]):
         intra_dgs.columns = ["element", "name", "value"]
         return intra_dgs[intra_dgs > cutoff]
 
-    def replace_criteria(self, *args: list[Criteria], limits: bool=True, **kwargs: dict[str, Criteria]):
+    def replace_criteria(self, *args: list[Criteria], **kwargs: dict[str, Criteria]):
         """recalculate the results by replacing selected criteria
             *args will replace all criteria with matching names
             **kwargs will replace criteria in downgrades with matching keys
             If there is a conflict, kwargs will take precedence
         """
-        return ElementsResults({k: v.replace_criteria(*args, limits=limits, **kwargs) for k, v in self.items()})
+        return ElementsResults({k: v.replace_criteria(*args, **kwargs) for k, v in self.items()})
 
     def tuning_data(self):
         return pd.concat(
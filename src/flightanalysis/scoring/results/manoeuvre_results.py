@@ -1,11 +1,14 @@
 from __future__ import annotations
+import numpy.typing as npt
 import pandas as pd
 from dataclasses import dataclass
+from functools import cached_property
 from .results import Results
 from .elements_results import ElementsResults
 from .dgplot import DGPlot
+from .store import ResultsStore, difficulties, score_columns, truncations
 from flightanalysis.scoring.criteria import Criteria
-from flightanalysis.base.utils import df_insert
+from flightanalysis.base import binary
 
 @dataclass
 class ManoeuvreResults:
@@ -13,42 +16,41 @@ class ManoeuvreResults:
     intra: ElementsResults
     positioning: Results
 
+    @cached_property
+    def store(self) -> ResultsStore:
+        """A columnar copy of the downgrades, the summaries and scores are queries on this.
+        Built on first use, so the results should not be modified after that."""
+        return ResultsStore.build(self)
+
     def dg_dict(self):
-        return dict(
-            **self.intra.dg_dict(),
-            **self.inter.dg_dict(),
-            **self.positioning.dg_dict(),
-        )
+        return self.store.dg_dict()
+
+    def invalidate(self):
+        """Drop the store (and the score matrix memoised on it), call this if the results are modified in place."""
+        self.__dict__.pop("store", None)
 
-    def replace_criteria(self, *args: list[Criteria], limits: bool = True, **kwargs: dict[str, Criteria]) -> ManoeuvreResults:
+    def replace_criteria(self, *args: list[Criteria], **kwargs: dict[str, Criteria]) -> ManoeuvreResults:
+        """A new ManoeuvreResults, which builds its own store and score matrix."""
         return ManoeuvreResults(
-            self.inter.replace_criteria(*args, limits=limits, **kwargs),
-            self.intra.replace_criteria(*args, limits=limits, **kwargs),
-            self.positioning.replace_criteria(*args, limits=limits, **kwargs),
+            self.inter.replace_criteria(*args, **kwargs),
+            self.intra.replace_criteria(*args, **kwargs),
+            self.positioning.replace_criteria(*args, **kwargs),
         )
 
     def summary(self):
-        return {k: v.total for k, v in self.__dict__.items() if v is not None}
+        return self.store.summary()
 
     def score_summary(self, difficulty=3, truncate=False):
-        intra = self.intra.score(difficulty, "results" if truncate else None)
-        inter = self.inter.score(difficulty, "result" if truncate else None)
-        positioning = self.positioning.score(difficulty, "result" if truncate else None)
-        return dict(
-            intra=float(intra),
-            inter=float(float(inter)),
-            positioning=float(float(positioning)),
-            total=float(max(10 - intra - inter - positioning, 0)),
-        )
+        return self.store.score_summary(difficulty, truncate)
 
     def score(self, difficulty=3, truncate: bool = False):
         return self.score_summary(difficulty, truncate)["total"]
 
-    def to_dict(self):
+    def to_dict(self, arrays: bool = False):
         return dict(
-            inter=self.inter.to_dict(),
-            intra=self.intra.to_dict(),
-            positioning=self.positioning.to_dict(),
+            inter=self.inter.to_dict(arrays),
+            intra=self.intra.to_dict(arrays),
+            positioning=self.positioning.to_dict(arrays),
             summary=self.summary(),
             score=self.score(),
         )
@@ -61,17 +63,38 @@ class ManoeuvreResults:
             Results.from_dict(data["positioning"]),
         )
 
+    def header(self) -> dict:
+        """The scores that are stored in the binary header"""
+        return dict(summary=self.summary(), score_summary=self.score_summary_array())
+
+    def score_summary_array(self) -> list:
+        """score_summary for every difficulty and truncation,
+        shape = (difficulty [1, 2, 3], truncate [False, True], [intra, inter, positioning, total])"""
+        return self.score_matrix.tolist()
+
+    @property
+    def score_matrix(self) -> npt.NDArray:
+        """The memoised score summary for every difficulty and truncation,
+        shape = (difficulty [1, 2, 3], truncate [False, True], [intra, inter, positioning, total])"""
+        return self.store.score_matrix
+
+    def to_bytes(self) -> bytes:
+        return binary.encode(self.to_dict(arrays=True), self.header())
+
+    @staticmethod
+    def from_bytes(data: bytes) -> ManoeuvreResults:
+        return ManoeuvreResults.from_dict(binary.decode(data))
+
     def fcj_results(self):
-        res = []
-        for diff in [1, 2, 3]:
-            for trunc in [False, True]:
-                res.append(
-                    dict(
-                        score=self.score_summary(diff, trunc),
-                        properties=dict(difficulty=diff, truncate=trunc),
-                    )
-                )
-        return res
+        scores = self.score_matrix
+        return [
+            dict(
+                score=dict(zip(score_columns, scores[i, j].tolist())),
+                properties=dict(difficulty=diff, truncate=trunc),
+            )
+            for i, diff in enumerate(difficulties)
+            for j, trunc in enumerate(truncations)
+        ]
 
     def el_dg_list(self, man, cutoff=0.05):
         intra_dgs = self.intra.intra_dg_list(cutoff)
@@ -90,22 +113,8 @@ class ManoeuvreResults:
             )
         return grps
 
-    def criteria_sum(self, key_by_criteria: bool = False) -> dict[str, float]:
-        intra = self.intra.criteria_sum(key_by_criteria)
-        inter = self.inter.criteria_sum(key_by_criteria)
-        box = self.positioning.criteria_sum(key_by_criteria)
-        return pd.concat([
-            pd.Series(intra).add_prefix("intra_"),
-            pd.Series(inter).add_prefix("inter_"),
-            pd.Series(box).add_prefix("positioning_"),
-        ])
+    def criteria_sum(self, key_by_criteria: bool = False) -> pd.Series:
+        return self.store.criteria_sum(key_by_criteria)
 
     def tuning_data(self):
-        return pd.concat(
-            [
-                self.intra.tuning_data(),
-                df_insert(self.inter.tuning_data(), type='inter'),
-                df_insert(self.positioning.tuning_data(), type='positioning'),
-            ],
-            ignore_index=True,
-        )
\ No newline at end of file
+        return self.store.tuning_data()
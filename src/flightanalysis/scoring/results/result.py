@@ -10,7 +10,7 @@ import pandas as pd
 from flightdata.base import to_list
 from flightdata.state.state import State
 
-from flightanalysis.scoring.criteria import Criteria
+from flightanalysis.scoring.criteria import Comparison, Criteria
 from flightanalysis.scoring.measurement import Measurement
 
 
@@ -25,6 +25,14 @@ def diff(val, factor=3):
         pass
 
 
+def apply_criteria(criteria: Criteria, sample: npt.NDArray):
+    """The errors, dgs and keys of a stored sample. The time steps are not stored, so
+    criteria that take them (Deviation, Total) see unit steps. Comparison takes none."""
+    if isinstance(criteria, Comparison):
+        return criteria(sample)
+    return criteria(sample, dt=np.ones(len(sample)))
+
+
 def trunc(val):
     return np.floor(val * 2) / 2
 
@@ -56,25 +64,27 @@ class Result:
         res = sum(diff(self.dgs, difficulty))
         return trunc(res) if truncate == "result" else res
 
-    def replace_criteria(self, new_criteria: Criteria, limits: bool = True):
-        mistakes, dgs, keys = new_criteria(self.sample, limits)
+    def replace_criteria(self, new_criteria: Criteria):
+        mistakes, dgs, keys = apply_criteria(new_criteria, self.sample)
         return replace(self, errors=mistakes, dgs=dgs, keys=keys, criteria=new_criteria)
 
-    def replace_lookup(self, new_lookup, limits: bool = True):
+    def replace_lookup(self, new_lookup):
         new_criteria = replace(self.criteria, lookup=new_lookup)
-        return self.replace_criteria(new_criteria, limits=limits)
+        return self.replace_criteria(new_criteria)
 
-    def to_dict(self):
+    def to_dict(self, arrays: bool = False):
+        """if arrays is True the numpy arrays are not converted to lists"""
+        conv = np.asarray if arrays else to_list
         return dict(
             name=self.name,
             display_name=self.display_name,
-            measurement=self.measurement.to_dict(),
-            visibility=to_list(self.visibility),
-            sample=to_list(self.sample),
-            sample_keys=to_list(self.sample_keys),
-            errors=to_list(self.errors),
-            dgs=to_list(self.dgs),
-            keys=to_list(self.keys),
+            measurement=self.measurement.to_dict(arrays),
+            visibility=conv(self.visibility),
+            sample=conv(self.sample),
+            sample_keys=conv(self.sample_keys),
+            errors=conv(self.errors),
+            dgs=conv(self.dgs),
+            keys=conv(self.keys),
             total=self.total,
             criteria=self.criteria.to_dict(),
             meta=self.meta,
@@ -89,12 +99,12 @@ class Result:
             data["name"],
             data.get("display_name", data["name"]),
             Measurement.from_dict(data["measurement"]),
-            np.array(data["visibility"]),
-            np.array(data["sample"]),
-            np.array(data["sample_keys"]),
-            np.array(data["errors"]),
-            np.array(data["dgs"]),
-            np.array(data["keys"]),
+            np.asarray(data["visibility"]),
+            np.asarray(data["sample"]),
+            np.asarray(data["sample_keys"]),
+            np.asarray(data["errors"]),
+            np.asarray(data["dgs"]),
+            np.asarray(data["keys"]),
             Criteria.from_dict(data["criteria"]),
             data.get("meta", None),
         )
@@ -29,9 +29,7 @@ class Results(Collection[Result]):
     def total(self):
         return sum([cr.total for cr in self])
 
-    def replace_criteria(
-        self, *args: list[Criteria], limits: bool = False, **kwargs: dict[str, Criteria]
-    ):
+    def replace_criteria(self, *args: list[Criteria], **kwargs: dict[str, Criteria]):
         """recalculate the results by replacing selected criteria
         *args will replace all criteria with matching names
         **kwargs will replace criteria in downgrades with matching keys
@@ -41,20 +39,19 @@ class Results(Collection[Result]):
         def safe_replace_criteria(
             res: Result,
             *args: list[Criteria],
-            limits: bool = False,
             **kwargs: dict[str, Criteria],
         ):
             for k, v in kwargs.items():
                 if k == res.name:
-                    return res.replace_criteria(v, limits=limits)
+                    return res.replace_criteria(v)
             for arg in args:
                 if hasattr(res.criteria, "name") and arg.name == res.criteria.name:
-                    return res.replace_criteria(arg, limits=limits)
+                    return res.replace_criteria(arg)
             return res
 
         return Results(
             self.name,
-            [safe_replace_criteria(v, *args, limits=limits, **kwargs) for v in self],
+            [safe_replace_criteria(v, *args, **kwargs) for v in self],
         )
 
     def downgrade_summary(self):
@@ -76,10 +73,10 @@ class Results(Collection[Result]):
 
         return df
 
-    def to_dict(self) -> dict[str, dict]:
+    def to_dict(self, arrays: bool = False) -> dict[str, dict]:
         return dict(
             name=self.name,
-            data={k: v.to_dict() for k, v in self.data.items()},
+            data={k: v.to_dict(arrays) for k, v in self.data.items()},
             total=self.total,
         )
 
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from .result import diff, trunc
+
+if TYPE_CHECKING:
+    from .manoeuvre_results import ManoeuvreResults
+
+
+groups = ["inter", "intra", "positioning"]
+difficulties = [1, 2, 3]
+truncations = [False, True]
+score_columns = ["intra", "inter", "positioning", "total"]
+
+
+@dataclass
+class ResultsStore:
+    """A columnar copy of the downgrades in a ManoeuvreResults, built in one walk of the tree.
+
+    Row columns, one row per downgrade:
+        result - the index of the Result the downgrade belongs to
+        error, dg, key - the error, downgrade and sample key
+    Result columns, one row per Result:
+        rgroup - index into groups (inter, intra, positioning)
+        relement - index into elements, the name of the Results collection
+        rname - the Result name
+        rcriteria - the criteria name
+        rlookup - (factor, exponent, limit) of the criteria lookup
+    """
+
+    result: npt.NDArray
+    error: npt.NDArray
+    dg: npt.NDArray
+    key: npt.NDArray
+    rgroup: npt.NDArray
+    relement: npt.NDArray
+    rname: npt.NDArray
+    rcriteria: npt.NDArray
+    rlookup: npt.NDArray
+    elements: list[str]
+
+    @staticmethod
+    def build(mres: ManoeuvreResults) -> ResultsStore:
+        collections = [
+            (0, mres.inter),
+            *[(1, results) for results in mres.intra],
+            (2, mres.positioning),
+        ]
+        results, rgroup, relement = [], [], []
+        for i, (group, collection) in enumerate(collections):
+            for res in collection:
+                results.append(res)
+                rgroup.append(group)
+                relement.append(i)
+
+        def lookup(res):
+            lu = getattr(res.criteria, "lookup", None)
+            if lu is None:
+                return (np.nan, np.nan, np.nan)
+            return (lu.factor, lu.exponent, np.nan if lu.limit is None else lu.limit)
+
+        def concat(arrays, dtype):
+            return (
+                np.concatenate([np.asarray(a, dtype=dtype) for a in arrays])
+                if len(arrays)
+                else np.array([], dtype=dtype)
+            )
+
+        return ResultsStore(
+            np.repeat(np.arange(len(results)), [len(r.dgs) for r in results]),
+            concat([r.errors for r in results], float),
+            concat([r.dgs for r in results], float),
+            concat([r.keys for r in results], int),
+            np.array(rgroup, dtype=int),
+            np.array(relement, dtype=int),
+            np.array([r.name for r in results], dtype=object),
+            np.array(
+                [getattr(r.criteria, "name", None) for r in results], dtype=object
+            ),
+            np.array([lookup(r) for r in results], dtype=float).reshape(-1, 3),
+            [c.name for _, c in collections],
+        )
+
+    def __len__(self):
+        return len(self.dg)
+
+    def result_totals(self, values: npt.NDArray | None = None) -> npt.NDArray:
+        """The sum of values (default dg) for each Result"""
+        return np.bincount(
+            self.result,
+            self.dg if values is None else values,
+            minlength=len(self.rname),
+        )
+
+    def summary(self) -> dict[str, float]:
+        totals = np.bincount(self.rgroup, self.result_totals(), minlength=3)
+        return dict(zip(groups, totals.tolist()))
+
+    @cached_property
+    def score_matrix(self) -> npt.NDArray:
+        """score_summary for every difficulty and truncation, computed once (read only),
+        shape = (difficulty [1, 2, 3], truncate [False, True], [intra, inter, positioning, total])"""
+        # difficulty factored downgrades, shape (difficulty, result)
+        factored = diff(self.dg[None, :], np.array(difficulties)[:, None])
+        rscores = np.zeros((len(self.rname), len(difficulties)))
+        np.add.at(rscores, self.result, factored.T)
+        rscores = rscores.T
+
+        intra = self.rgroup == 1
+        escores = np.zeros((len(self.elements), len(difficulties)))
+        np.add.at(escores, self.relement[intra], rscores[:, intra].T)
+        escores = escores.T
+
+        # intra results are truncated per element, inter and positioning per result
+        out = np.empty((len(difficulties), len(truncations), len(score_columns)))
+        for j, t in enumerate(truncations):
+            _e = trunc(escores) if t else escores
+            _r = trunc(rscores) if t else rscores
+            out[:, j, 0] = _e.sum(axis=1)
+            out[:, j, 1] = _r[:, self.rgroup == 0].sum(axis=1)
+            out[:, j, 2] = _r[:, self.rgroup == 2].sum(axis=1)
+        out[:, :, 3] = np.maximum(10 - out[:, :, :3].sum(axis=2), 0)
+        out.flags.writeable = False
+        return out
+
+    def score_summary(self, difficulty=3, truncate=False) -> dict[str, float]:
+        return dict(
+            zip(
+                score_columns,
+                self.score_matrix[
+                    difficulties.index(difficulty), truncations.index(truncate)
+                ].tolist(),
+            )
+        )
+
+    def dg_dict(self) -> dict[str, float]:
+        totals = self.result_totals()
+        return {
+            (f"{self.elements[e]}_{n}" if g == 1 else n): float(t)
+            for g, e, n, t in sorted(
+                zip(self.rgroup, self.relement, self.rname, totals),
+                key=lambda v: [1, 0, 2][v[0]],
+            )
+        }
+
+    def criteria_sum(self, key_by_criteria: bool = False) -> pd.Series:
+        """The total downgrade for each Result name (or criteria name), by group"""
+        df = pd.DataFrame(
+            dict(
+                group=np.array(groups)[self.rgroup],
+                key=self.rcriteria if key_by_criteria else self.rname,
+                total=self.result_totals(),
+            )
+        )
+        sums = df.groupby(["group", "key"], sort=False).total.sum()
+        present = sums.index.get_level_values(0)
+        return pd.concat(
+            [pd.Series(dtype=float)]
+            + [
+                sums.loc[g].add_prefix(f"{g}_")
+                for g in ["intra", "inter", "positioning"]
+                if g in present
+            ]
+        )
+
+    def tuning_data(self) -> pd.DataFrame:
+        """One row per downgrade with the criteria and lookup that produced it"""
+        rgroup, relement = self.rgroup[self.result], self.relement[self.result]
+        lookup = self.rlookup[self.result]
+        elements = np.array(self.elements, dtype=object)
+        return pd.DataFrame(
+            dict(
+                type=np.array(groups)[rgroup],
+                element=np.where(rgroup == 1, elements[relement], None),
+                results=elements[relement],
+                result=self.rname[self.result],
+                criteria=self.rcriteria[self.result],
+                factor=lookup[:, 0],
+                exponent=lookup[:, 1],
+                limit=lookup[:, 2],
+                error=self.error,
+                dg=self.dg,
+            )
+        )
@@ -1,5 +1,27 @@
+import geometry as g
+import numpy as np
+from flightdata import Flight, Origin, State
 from pytest import fixture
-from flightdata import Flight, Origin
+from schemas import ManInfo
+from schemas.maninfo import BoxLocation, Position
+from schemas.positioning import Direction, Heading, Height, Orientation
+
+from flightanalysis import Line, Loop
+from flightanalysis.base.ref_funcs import RefFuncs
+from flightanalysis.definition import (
+    ElDef,
+    ElDefs,
+    ManDef,
+    ManOption,
+    ManParm,
+    ManParms,
+    SchedDef,
+)
+from flightanalysis.scoring.box import TriangularBox
+from flightanalysis.scoring.criteria import Comparison, Continuous, Exponential, Single
+from flightanalysis.scoring.downgrade import DownGrade, DownGrades
+from flightanalysis.scoring.measurement import Measure
+from flightanalysis.scoring.reffuncs import measures, selectors
 
 
 @fixture(scope="session")
@@ -12,3 +34,118 @@ def box():
     return Origin.from_f3a_zone('tests/data/p23_box.f3a')
 
 
+def speed_error(els, fl: State, tp: State, meta=None):
+    return abs(fl.vel) - abs(tp.vel), fl.vel.unit()
+
+
+def track_error(els, fl: State, tp: State, meta=None):
+    return np.arcsin(fl.wvel.unit().z) - np.arcsin(tp.wvel.unit().z), g.PZ(1, len(fl))
+
+
+def visible(fl, tp, measurement, meta=None):
+    return np.full(len(fl), 0.8)
+
+
+for _func in [speed_error, track_error]:
+    measures.add("test measure")(Measure(_func.__name__, _func, [visible], "m"))
+
+
+def synthetic_mandef(
+    name: str,
+    eds: list[tuple],
+    mps: list[ManParm] = None,
+    position: Position = Position.END,
+    direction: Direction = Direction.DOWNWIND,
+) -> ManDef:
+    """A ManDef with a speed, track and end track downgrade on every element.
+    ManParm props are collected from the elements that use them."""
+    dgs = DownGrades(
+        [
+            DownGrade("speed", "speed", None, measures.speed_error(), RefFuncs([]),
+                      Continuous("speed", Exponential(0.1, 1))),
+            DownGrade("track", "track", None, measures.track_error(), RefFuncs([]),
+                      Continuous("track", Exponential(3, 1))),
+            DownGrade("end_track", "end_track", None, measures.track_error(),
+                      RefFuncs([selectors.last()]), Single("end", Exponential(3, 1))),
+        ]
+    )
+    eldefs = ElDefs(
+        [ElDef("entry_line", Line, dict(speed=30, length=30, roll=0), dgs)]
+        + [ElDef(n, K, props, dgs) for n, K, props in eds]
+        + [ElDef("exit_line", Line, dict(speed=30, length=30, roll=0), dgs)]
+    )
+    for ed in eldefs:
+        for k, v in ed.props.items():
+            if isinstance(v, ManParm):
+                v.append(ed.get_collector(k))
+    return ManDef(
+        ManInfo(
+            name=name,
+            short_name=name,
+            k=2,
+            position=position,
+            start=BoxLocation(
+                height=Height.BTM, direction=direction, orientation=Orientation.UPRIGHT
+            ),
+        ),
+        ManParms(mps or []),
+        eldefs,
+        TriangularBox(np.radians(60), np.radians(60), 170, 150, 0, {}),
+    )
+
+
+def roll_mandef(roll: float) -> ManDef:
+    """A pull, a line with a roll and a push, the loops share a radius ManParm"""
+    radius = ManParm("loop_radius", Comparison("radius", Exponential(1, 1)), 50, "m")
+    return synthetic_mandef(
+        "roll",
+        [
+            ("pull", Loop, dict(speed=30, angle=np.pi / 2, radius=radius, roll=0, ke=0)),
+            ("line", Line, dict(speed=30, length=100, roll=roll)),
+            ("push", Loop, dict(speed=30, angle=-np.pi / 2, radius=radius, roll=0, ke=0)),
+        ],
+        [radius],
+    )
+
+
+@fixture(scope="session")
+def synthetic_schedule() -> SchedDef:
+    return SchedDef(
+        [
+            roll_mandef(2 * np.pi),
+            synthetic_mandef(
+                "loop",
+                [("loop", Loop, dict(speed=30, angle=2 * np.pi, radius=55, roll=0, ke=0))],
+            ),
+        ]
+    )
+
+
+@fixture(scope="session")
+def synthetic_flown(synthetic_schedule: SchedDef) -> State:
+    """The synthetic schedule template at an irregular sample rate with some noise on the
+    position and body rates, the manoeuvre and element labels are kept."""
+    _, template = synthetic_schedule.create_template(170, Heading.LTOR, freq=50, npoints=3)
+    rng = np.random.default_rng(0)
+    ids = np.sort(rng.choice(len(template), int(len(template) * 0.5), replace=False))
+    ids = np.unique(np.concatenate([[0, len(template) - 1], ids]))
+    flown = State(template.data.iloc[ids], template.labels).recalculate_dt()
+    return flown.copy(
+        pos=flown.pos + g.Point(rng.normal(scale=0.5, size=(len(flown), 3))),
+        rvel=flown.rvel + g.Point(rng.normal(scale=0.05, size=(len(flown), 3))),
+    )
+
+
+@fixture(scope="session")
+def synthetic_option(synthetic_schedule: SchedDef) -> ManOption:
+    """Two options for the roll manoeuvre with the same elements, a half roll and the full
+    roll that was flown."""
+    return ManOption([roll_mandef(np.pi), synthetic_schedule[0]])
+
+
+def register_synthetic_definitions(definitions: dict):
+    """register_definitions for worker processes, importing this module in the worker
+    registers the synthetic measures."""
+    from flightanalysis.analysis.tasks import register_definitions
+
+    register_definitions(definitions)
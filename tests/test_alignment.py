@@ -0,0 +1,82 @@
+import geometry as g
+import numpy as np
+from flightdata import Alignment, State
+from pytest import approx
+
+from flightanalysis.analysis.alignment import (
+    banded_dtw,
+    dtw_lower_bound,
+    expand_window,
+    multires_align,
+)
+
+
+def full_dtw(tp, fl):
+    cost = np.full((len(tp) + 1, len(fl) + 1), np.inf)
+    cost[0, 0] = 0
+    for i in range(len(tp)):
+        for j in range(len(fl)):
+            cost[i + 1, j + 1] = np.linalg.norm(tp[i] - fl[j]) + min(
+                cost[i, j], cost[i, j + 1], cost[i + 1, j]
+            )
+    return cost[-1, -1]
+
+
+def test_banded_dtw_full_window():
+    rng = np.random.default_rng(0)
+    tp, fl = rng.normal(size=(20, 2)), rng.normal(size=(35, 2))
+    dist, path = banded_dtw(tp, fl, np.zeros(20, dtype=int), np.full(20, 34))
+    assert dist == approx(full_dtw(tp, fl))
+    assert tuple(path[0]) == (0, 0)
+    assert tuple(path[-1]) == (19, 34)
+    assert np.all(np.diff(path, axis=0) >= 0)
+
+
+def test_expand_window_covers_path():
+    path = np.array([[0, 0], [1, 1], [1, 2], [2, 3], [3, 3], [4, 4]])
+    lo, hi = expand_window(path, (10, 10), 1)
+    assert lo[0] == 0 and hi[-1] == 9
+    for i, j in path:
+        assert np.all(lo[2 * i : 2 * i + 2] <= 2 * j)
+        assert np.all(hi[2 * i : 2 * i + 2] >= 2 * j + 1)
+
+
+def test_dtw_lower_bound(synthetic_option, synthetic_flown):
+    flown = synthetic_flown.manoeuvre["roll"].remove_labels()
+    itrans = g.Transformation(flown[0].pos, g.Euler(np.pi, 0, 0))
+    for mdef in synthetic_option:
+        template = State.stack(mdef.create().create_template(itrans, None, 25, "min"), "element")
+        for chunk in [1024, 16]:
+            bound = dtw_lower_bound(flown, template, chunk=chunk)
+            assert 0 < bound <= Alignment.align(flown, template, 10, True).dist
+
+
+def test_banded_dtw_window():
+    rng = np.random.default_rng(1)
+    tp, fl = rng.normal(size=(30, 2)), rng.normal(size=(45, 2))
+    path = np.array([(i, int(i * 44 / 29)) for i in range(30)])
+    lo, hi = expand_window(path // 2, (30, 45), 2)
+    cost = np.full((31, 46), np.inf)
+    cost[0, 0] = 0
+    for i in range(30):
+        for j in range(lo[i], hi[i] + 1):
+            cost[i + 1, j + 1] = np.linalg.norm(tp[i] - fl[j]) + min(
+                cost[i, j], cost[i, j + 1], cost[i + 1, j]
+            )
+    dist, path = banded_dtw(tp, fl, lo, hi)
+    assert dist == approx(cost[-1, -1])
+    assert np.all((path[:, 1] >= lo[path[:, 0]]) & (path[:, 1] <= hi[path[:, 0]]))
+
+
+def test_multires_align(synthetic_schedule, synthetic_flown):
+    flown = synthetic_flown.manoeuvre["roll"]
+    itrans = g.Transformation(flown[0].pos, g.Euler(np.pi, 0, 0))
+    template = State.stack(
+        synthetic_schedule[0].create().create_template(itrans, None, 25, "min"), "element"
+    )
+    res = multires_align(flown.remove_labels(), template)
+    reference = Alignment.align(flown.remove_labels(), template, 10, True)
+    assert res.dist == approx(reference.dist, rel=0.05)
+    np.testing.assert_allclose(
+        res.aligned.labels.element.boundaries, flown.labels.element.boundaries, atol=0.2
+    )
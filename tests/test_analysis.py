@@ -0,0 +1,122 @@
+import tracemalloc
+from dataclasses import replace
+
+import numpy as np
+from pytest import approx, fixture
+from schemas.positioning import Heading
+
+from flightanalysis import Analysis, ManOption
+
+
+@fixture(scope="module")
+def roll(synthetic_schedule, synthetic_flown):
+    return Analysis(
+        0, Heading.LTOR, synthetic_flown.manoeuvre["roll"], synthetic_schedule[0]
+    ).run(optimise=False, stop_after="prepare_scoring")
+
+
+def test_score_boundary_candidates(roll: Analysis):
+    steps = range(-6, 7, 3)
+    for boundary in ["entry_line", "line"]:
+        estimates = roll.score_boundary_candidates(boundary, steps)
+        rescored = []
+        for step in steps:
+            _new = roll.step_boundary(boundary, step)
+            rescored.append(_new.score_boundary(boundary, False).total)
+        np.testing.assert_allclose(estimates.values, rescored, rtol=1e-3)
+        assert estimates.idxmin() == steps[np.argmin(rescored)]
+
+
+def test_score_boundary_candidates_short_element(roll: Analysis):
+    n = len(roll.flown.element["exit_line"])
+    estimates = roll.score_boundary_candidates("push", [0, n - 3, n - 2, n + 5])
+    assert np.isfinite(estimates.iloc[:2]).all()
+    assert np.isnan(estimates.iloc[2:]).all()
+
+
+def test_run_profile(roll: Analysis):
+    basic = roll.basic()
+    timed = basic.run(optimise=False, stop_after="prepare_scoring", profile=True)
+    assert [p.stage for p in timed.profile] == [
+        "create_itrans", "select_mdef", "prepare_scoring"
+    ]
+    assert all(p.memory is None for p in timed.profile)
+
+    traced = basic.run(optimise=False, stop_after="prepare_scoring", profile="memory")
+    assert all(p.memory >= 0 for p in traced.profile)
+    assert not tracemalloc.is_tracing()
+
+    assert traced.run(optimise=False, stop_after="create_itrans").profile is None
+
+
+@fixture(scope="module")
+def unlabelled(synthetic_option, synthetic_flown):
+    return Analysis(
+        0, Heading.LTOR, synthetic_flown.manoeuvre["roll"].remove_labels(), synthetic_option
+    ).create_itrans()
+
+
+def test_preliminary_alignment_early_exit(unlabelled: Analysis):
+    exhaustive = unlabelled.preliminary_alignment()
+    assert exhaustive.mdef is unlabelled.mdef[1]
+    for kwargs in [dict(early_exit=True), dict(n_jobs=2), dict(n_jobs=2, early_exit=True)]:
+        an = unlabelled.preliminary_alignment(**kwargs)
+        assert an.mdef is exhaustive.mdef
+        assert an.flown.labels.element == exhaustive.flown.labels.element
+
+
+def test_select_mdef(synthetic_schedule, synthetic_option, synthetic_flown, monkeypatch):
+    from flightanalysis.analysis import tasks
+
+    from .conftest import register_synthetic_definitions
+
+    an = Analysis(
+        0, Heading.LTOR, synthetic_flown.manoeuvre["roll"], synthetic_option
+    ).create_itrans()
+    scores = an._score_options(list(synthetic_option))
+    assert scores[1] > scores[0]
+    assert an.select_mdef().option == 1
+    assert an.select_mdef(n_jobs=2).option == 1
+
+    # the workers import conftest to unpickle the initializer, which registers the measures
+    monkeypatch.setattr(tasks, "register_definitions", register_synthetic_definitions)
+    np.testing.assert_allclose(
+        an._score_options(list(synthetic_option), 2, "processes"), scores
+    )
+    assert an.select_mdef(n_jobs=2, prefer="processes").option == 1
+
+    # an option that fails to run is not selected
+    broken = ManOption([replace(synthetic_schedule[0], box=None), synthetic_schedule[0]])
+    an = replace(an, mdef=broken)
+    for kwargs in [dict(), dict(n_jobs=2)]:
+        assert np.isnan(an._score_options(list(broken), **kwargs)[0])
+        assert an.select_mdef(**kwargs).option == 1
+
+
+def test_optimise_alignment_incremental(roll: Analysis):
+    # start from shifted boundaries so the optimisation has to move them
+    shifted = roll.update_boundaries(
+        roll.flown.step_label("element", "line", 6, roll.flown.t, 3)
+    )
+    for include_inter in [True, False]:
+        full = shifted.optimise_alignment(include_inter, incremental=False)
+        incremental = shifted.optimise_alignment(include_inter, incremental=True)
+        np.testing.assert_array_equal(
+            incremental.flown.labels.element.boundaries, full.flown.labels.element.boundaries
+        )
+        assert incremental.intra().total == approx(full.intra().total)
+        assert len(full.inter()) > 0
+        assert incremental.inter().total == approx(full.inter().total)
+
+
+def test_run_multires(synthetic_schedule, synthetic_flown):
+    flown = synthetic_flown.manoeuvre["roll"]
+    an = Analysis(0, Heading.LTOR, flown.remove_labels(), synthetic_schedule[0]).run(
+        optimise=False, multires=True, throw_errors=True, stop_after="multires_alignment"
+    )
+    assert an.manoeuvre is not None and an.templates is not None
+    np.testing.assert_allclose(
+        an.flown.labels.element.boundaries, flown.labels.element.boundaries, atol=0.2
+    )
+    scored = an.run(optimise=False, throw_errors=True)
+    assert scored.scores is not None
@@ -0,0 +1,120 @@
+import numpy as np
+import geometry as g
+from flightdata import State
+from numpy.testing import assert_array_equal
+from schemas.positioning import Heading
+
+from flightanalysis.base import binary
+from flightanalysis.scoring.criteria import Single, Exponential
+from flightanalysis.scoring.measurement import Measurement
+from flightanalysis.scoring.results import (
+    ElementsResults,
+    ManoeuvreResults,
+    Result,
+    Results,
+)
+
+
+def test_encode_decode():
+    tree = dict(a=np.arange(5), b=[np.ones((3, 2)), "x"], c=dict(d=1.5, e=None))
+    data = binary.encode(tree, dict(total=3))
+    assert binary.read_summary(data) == dict(total=3)
+    res = binary.decode(data)
+    assert_array_equal(res["a"], tree["a"])
+    assert_array_equal(res["b"][0], tree["b"][0])
+    assert res["b"][1] == "x"
+    assert res["c"] == tree["c"]
+
+
+def test_state_round_trip():
+    st = State.from_transform(g.Transformation(), vel=g.PX(30)).fill(
+        g.Time.from_t(np.linspace(0, 1, 11))
+    )
+    st = st.label(element=["a"] * 5 + ["b"] * 6)
+    res = binary.state_from_dict(
+        binary.decode(binary.encode(binary.state_to_arrays(st)))
+    )
+    assert_array_equal(res.data.to_numpy(), st.data.to_numpy())
+    assert res.labels.to_dict() == st.labels.to_dict()
+
+
+def test_manoeuvre_results_round_trip():
+    criteria = Single("single", Exponential(1, 1))
+    sample = np.array([0.1, 0.2, 0.3])
+    result = Result(
+        "dg",
+        "dg",
+        Measurement(sample, g.PX(1, 3), "m"),
+        np.ones(3),
+        sample,
+        np.arange(3),
+        *criteria(sample),
+        criteria,
+    )
+    mres = ManoeuvreResults(
+        Results("inter", [result]),
+        ElementsResults([Results("e1", [result])]),
+        Results("positioning", []),
+    )
+    data = mres.to_bytes()
+    assert binary.read_summary(data)["summary"] == mres.summary()
+    res = ManoeuvreResults.from_bytes(data)
+    assert res.score() == mres.score()
+    assert_array_equal(res.intra["e1"]["dg"].dgs, result.dgs)
+
+
+def test_analysis_direction_round_trip(synthetic_schedule, synthetic_flown):
+    from flightanalysis import Analysis
+
+    for direction in [Heading.LTOR, Heading.RTOL, None]:
+        ma = Analysis(
+            0, direction, synthetic_flown.manoeuvre["roll"], synthetic_schedule[0]
+        )
+        assert Analysis.from_bytes(ma.to_bytes()).schedule_direction == direction
+
+
+def test_lazy_schedule(tmp_path):
+    from flightanalysis import LazyAnalysis, ScheduleAnalysis
+
+    criteria = Single("single", Exponential(1, 1))
+    sample = np.array([0.1, 0.2, 0.3])
+    result = Result(
+        "dg",
+        "dg",
+        Measurement(sample, g.PX(1, 3), "m"),
+        np.ones(3),
+        sample,
+        np.arange(3),
+        *criteria(sample),
+        criteria,
+    )
+    mres = ManoeuvreResults(
+        Results("inter", [result]),
+        ElementsResults([Results("e1", [result])]),
+        Results("positioning", []),
+    )
+    st = State.from_transform(g.Transformation(), vel=g.PX(30)).fill(
+        g.Time.from_t(np.linspace(0, 1, 11))
+    )
+    header = dict(
+        id=0, name="man", k=2, option=None, elements=None, scores=mres.header()
+    )
+    data = dict(flown=binary.state_to_arrays(st), scores=mres.to_dict(arrays=True))
+    file = tmp_path / "sa.bin"
+    file.write_bytes(binary.encode(dict(analyses=[data]), [header]))
+
+    with ScheduleAnalysis.open(file) as sa:
+        assert isinstance(sa["man"], LazyAnalysis)
+        assert "results" not in sa["man"].scores.__dict__
+        total, scores = sa.scores()
+        assert scores["man"] == mres.score()
+        assert total == 2 * mres.score()
+        assert sa.summarydf().iloc[0].to_dict() == mres.summary()
+        assert sa.score_summary_df(1, True).iloc[0].to_dict() == mres.score_summary(
+            1, True
+        )
+
+        assert_array_equal(sa["man"].flown.data.to_numpy(), st.data.to_numpy())
+        assert_array_equal(sa["man"].scores.intra["e1"]["dg"].dgs, result.dgs)
+        mapping = sa["man"].container.buffer.obj
+    assert mapping.closed
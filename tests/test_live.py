@@ -0,0 +1,76 @@
+import geometry as g
+import numpy as np
+from flightdata import State
+from pytest import fixture
+from schemas.positioning import Heading
+
+from flightanalysis import Elements, Line, Loop, Manoeuvre
+from flightanalysis.analysis.live import LiveAnalysis, OnlineAlignment, replay
+
+
+@fixture(scope="module")
+def synthetic():
+    man = Manoeuvre(
+        Elements(
+            [
+                Line("entry_line", 30.0, 60.0, 0.0),
+                Loop("loop", 30.0, np.pi, 50.0, 0.0, 0.0),
+                Line("line", 30.0, 40.0, 2 * np.pi),
+                Loop("loop2", 30.0, np.pi, 50.0, 0.0, 0.0),
+                Line("exit_line", 30.0, 60.0, 0.0),
+            ]
+        ),
+        "synthetic",
+    )
+    istate = State.from_transform(g.Transformation(), vel=g.PX(30))
+    templates = man.create_template(istate, None, 25, "min")
+    fine = State.stack(man.create_template(istate, None, 50, "min"), "element")
+    rng = np.random.default_rng(1)
+    ids = np.sort(rng.choice(len(fine), int(len(fine) * 0.8), replace=False))
+    flown = State(fine.data.iloc[ids]).recalculate_dt()
+    return templates, flown, fine.labels.element.boundaries
+
+
+def test_replay_covers_state(synthetic):
+    _, flown, _ = synthetic
+    chunks = list(replay(flown, 0.5))
+    assert sum(len(c) for c in chunks) == len(flown)
+    assert all(c.duration <= 0.5 for c in chunks)
+
+
+def test_online_alignment(synthetic):
+    templates, flown, reference = synthetic
+    oa = OnlineAlignment(templates)
+    confirmed = []
+    for chunk in replay(flown, 0.5):
+        oa.push(chunk)
+        for k in oa.update(1.0):
+            confirmed.append((k, flown.t[len(oa) - 1]))
+    confirmed += [(k, flown.t[-1]) for k in oa.update(1.0, force=True)]
+
+    assert [c[0] for c in confirmed] == list(range(len(templates)))
+    boundaries = flown.t[oa.boundaries + [oa.end]]
+    np.testing.assert_allclose(boundaries, reference, atol=0.2)
+    # each element is confirmed within the delay plus one chunk of its end
+    for (k, t), b in zip(confirmed[:-1], boundaries):
+        assert t - b < 1.0 + 0.5 + 0.2
+
+
+def test_live_analysis(synthetic_schedule, synthetic_flown):
+    la = LiveAnalysis(synthetic_schedule, Heading.LTOR, delay=1.0)
+    updates = list(la.run(replay(synthetic_flown.remove_labels(), 0.5)))
+
+    for i, mdef in enumerate(synthetic_schedule):
+        mupdates = [u for u in updates if u.manoeuvre == i]
+        elnames = list(mdef.eds.data.keys())
+        assert [u.elements for u in mupdates] == [elnames[: k + 1] for k in range(len(elnames))]
+        assert [u.final for u in mupdates] == [False] * (len(elnames) - 1) + [True]
+        assert all(u.latency < 1.0 + 0.5 + 0.2 for u in mupdates)
+
+        an = la.analyses[i]
+        assert mupdates[-1].results is an.scores
+        assert list(an.scores.intra.data.keys()) == elnames
+        reference = synthetic_flown.manoeuvre[mdef.info.short_name]
+        np.testing.assert_allclose(
+            an.flown.labels.element.boundaries, reference.labels.element.boundaries, atol=0.2
+        )
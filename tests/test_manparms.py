@@ -1,6 +1,7 @@
 from pytest import fixture
 
 from flightanalysis import ManParm, ManParms, ComboSetting, ComboSettings, Combination, ComboSet
+from flightanalysis.definition.collectors import Collector
 
 
 @fixture
@@ -100,3 +101,73 @@ def test_clean_combosettings_removes_redundant_leaves_incomplete(mps: ManParms):
     )
     assert len(cleaned) == 0
 
+
+
+def test_elnames():
+    mp = ManParm("mp1", Combination("mp1", desired=[[0], [1]]), defaul=0)
+    mp.append(Collector("e1", "roll"))
+    mp.append(Collector("e3", "roll") + Collector("e2", "roll"))
+    assert mp.elnames == ["e1", "e3", "e2"]
+
+
+def synthetic_flight():
+    import geometry as g
+    import numpy as np
+    from flightdata import State
+
+    from flightanalysis import Elements, Line, Loop, Manoeuvre
+
+    man = Manoeuvre(
+        Elements(
+            [
+                Line("entry_line", 30.0, 40.0, 0.0),
+                Loop("loop1", 30.0, np.pi, 50.0, 0.0, 0.0),
+                Line("line", 30.0, 80.0, 2 * np.pi),
+                Loop("loop2", 30.0, np.pi, 56.0, 0.0, 0.0),
+                Line("exit_line", 30.0, 40.0, 0.0),
+            ]
+        ),
+        "synthetic",
+    )
+    istate = State.from_transform(g.Transformation(g.PY(150), g.Euler(np.pi, 0, 0)), vel=g.PX(30))
+    return man, State.stack(man.create_template(istate), "element")
+
+
+def test_collection_plan_matches_get_downgrades():
+    import numpy as np
+
+    from flightanalysis.base.ref_funcs import RefFunc
+    from flightanalysis.scoring.criteria import Comparison, Exponential
+
+    man, fl = synthetic_flight()
+    vis = RefFunc("depth", lambda st, box: float(np.clip(150 / st.pos.y.mean(), 0, 1)), {})
+    mps = ManParms(
+        [
+            ManParm("loop_radius", Comparison("radius", Exponential(1, 1)), 50, "m",
+                    visibility=vis),
+            ManParm("line_length", Comparison("length", Exponential(2, 0.8)), 40, "m"),
+            ManParm("speed", Comparison("speed", Exponential(1, 1)), 30, "m/s"),
+        ]
+    )
+    mps.loop_radius.append(Collector("loop1", "radius"))
+    mps.loop_radius.append(Collector("loop2", "radius"))
+    mps.line_length.append(Collector("entry_line", "length"))
+    mps.line_length.append(Collector("loop1", "radius") * 2)
+    mps.line_length.append(Collector("exit_line", "length"))
+    for el in man.elements:
+        mps.speed.append(Collector(el.uid, "speed"))
+
+    res = mps.collect(man, fl, None)
+    assert list(res.keys()) == ["loop_radius", "line_length", "speed"]
+    for mp in mps:
+        expected = mp.get_downgrades(man.elements, fl, None)
+        np.testing.assert_array_equal(res[mp.name].measurement.value, expected.measurement.value)
+        np.testing.assert_array_equal(res[mp.name].visibility, expected.visibility)
+        np.testing.assert_allclose(res[mp.name].dgs, expected.dgs, rtol=1e-12)
+    assert res.loop_radius.total > 0
+
+    assert mps.collection_plan() is mps.collection_plan()
+    mps.add(ManParm("line_roll", Comparison("roll", Exponential(1, 1)), 0, "rad"))
+    mps.line_roll.append(Collector("line", "roll"))
+    assert len(mps.collection_plan().mps) == 4
+    assert list(mps.collect(man, fl, None, ["loop2", "line"]).keys()) == ["loop_radius", "speed", "line_roll"]
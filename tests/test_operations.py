@@ -68,3 +68,39 @@ def test_bracksplit():
         "sum([2,d,min(g,h)])",
         "f[d]",
     ]
+
+
+def test_compile(coll):
+    index = {k: i for i, k in enumerate(coll.keys())}
+    for expr in ["(a+b)", "sum([c,max(a,b)])", "max(c,sum([a,b,c]))", "(d[1]*2)", "abs(e[0])", "sign((a-c))"]:
+        opp = o.Opp.parse(expr, coll)
+        assert opp.compile(index)(coll.value_vector()) == opp(coll)
+
+
+def test_compile_vector(coll):
+    index = {k: i for i, k in enumerate(coll.keys())}
+    values = [
+        np.array([1.0, 2.0, -3.0]),
+        np.array([2.0, 1.0, 1.0]),
+        np.array([1.0, 1.0, 1.0]),
+        coll.d.criteria.desired[[0, 1, 1]],
+        coll.e.criteria.desired[[0, 0, 1]],
+    ]
+    np.testing.assert_array_equal(
+        o.Opp.parse("sum([c,max(a,b)])", coll).compile(index)(values), [3, 3, 2]
+    )
+    np.testing.assert_array_equal(o.Opp.parse("(d[1]*e[0])", coll).compile(index)(values), [2, 5, 10])
+    np.testing.assert_array_equal(o.Opp.parse("sign(a)", coll).compile(index)(values), [1, 1, -1])
+
+
+def test_eldef_rebinds_by_name(coll):
+    from flightanalysis.definition import ElDef, ElDefs
+    from flightanalysis.elements import Line
+    from flightanalysis.scoring.downgrade import DownGrades
+
+    ed = ElDef("line", Line, dict(speed=30, length=o.Opp.parse("(a*b)", coll), roll=coll.d[1]), DownGrades([]))
+    new = coll.set_values(a=3, d=1)
+    reparsed = ElDefs.from_dict(ElDefs([ed]).to_dict(), new)[0]
+    assert ed(new) == reparsed(new)
+    assert ed(new).length == 3 and ed(new).roll == 5
+    assert ed(coll).length == 1
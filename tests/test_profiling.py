@@ -0,0 +1,21 @@
+from pytest import raises
+
+from flightanalysis.base.profiling import StageProfile, StageProfiler, count
+
+
+def test_stage_profiler_counts():
+    with StageProfiler("test") as sp:
+        count("downgrade")
+        count("downgrade")
+        count("template")
+    assert sp.profile.counts == dict(downgrade=2, template=1)
+    assert sp.profile.ok
+    assert sp.profile.wall >= 0
+
+
+def test_stage_profiler_error():
+    with raises(ValueError):
+        with StageProfiler("test") as sp:
+            raise ValueError("test")
+    assert not sp.profile.ok
+    assert StageProfile.from_dict(sp.profile.to_dict()) == sp.profile
@@ -21,4 +21,52 @@ def builders():
 def test_decorator(builders):
     f =  builders.func1(b=2)
     assert f(1) == 3
-    assert builders.func2(b=2)(2) == 0
\ No newline at end of file
+    assert builders.func2(b=2)(2) == 0
+
+def test_accepts_meta():
+    from flightanalysis.base.ref_funcs import RefFunc
+
+    def with_meta(a, meta=None):
+        return meta
+
+    def without_meta(a):
+        return a
+
+    assert RefFunc("with_meta", with_meta, {}).accepts_meta
+    assert not RefFunc("without_meta", without_meta, {}).accepts_meta
+    assert RefFunc("without_meta", without_meta, {})(1, meta={}) == 1
+
+
+def test_result_cache():
+    import numpy as np
+    import geometry as g
+    from flightdata import State
+    from flightanalysis.base.ref_funcs import RefFunc, ResultCache
+    from flightanalysis.scoring.measurement import Measure
+
+    calls = []
+
+    def measure(els, fl, tp, factor=1, meta=None):
+        calls.append(1)
+        meta["measured"] = True
+        return fl.vel.x * factor, fl.vel
+
+    st = State.from_transform(g.Transformation(), vel=g.PX(30)).fill(
+        g.Time.from_t(np.linspace(0, 1, 5))
+    )
+    rf = RefFunc("measure", Measure("measure", measure, [], "m"), dict(factor=2))
+
+    RefFunc.RESULT_CACHE = ResultCache()
+    try:
+        m1 = rf([], st, st, meta={})
+        meta = {}
+        m2 = rf([], st, st, meta=meta)
+        assert m1 is m2
+        assert meta == dict(measured=True)
+        assert len(calls) == 1
+
+        rf([], st.copy(), st, meta={})
+        assert len(calls) == 2
+        assert RefFunc.RESULT_CACHE.info()["hits"] == 1
+    finally:
+        RefFunc.RESULT_CACHE = None
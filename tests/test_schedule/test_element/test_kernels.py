@@ -0,0 +1,100 @@
+import geometry as g
+import numpy as np
+from flightdata import State
+from pytest import fixture, mark
+
+from flightanalysis.elements import Snap
+from flightanalysis.elements.kernels import KERNEL_TOLERANCE, Track
+
+
+@fixture
+def istate():
+    return State.from_transform(
+        g.Transformation(g.Point(10, 20, 30), g.Euler(np.pi, 0.2, 1.0)), vel=g.PX(30)
+    )
+
+
+def assert_matches(track: Track, st: State):
+    assert track.to_state().data.columns.tolist() == st.data.columns.tolist()
+    np.testing.assert_allclose(
+        track.to_state().data.values, st.data.values, rtol=0, atol=KERNEL_TOLERANCE
+    )
+
+
+@mark.parametrize("rvel", [g.P0(), g.PY(0.5), g.Point(0, 0.3, 0.4)])
+def test_fill(istate: State, rvel: g.Point):
+    time = g.Time.from_t(np.linspace(0, 3, 40))
+    assert_matches(
+        Track.from_state(istate).copy(vel=g.PX(30), rvel=rvel).fill(time),
+        istate.copy(vel=g.PX(30), rvel=rvel).fill(time),
+    )
+
+
+@mark.parametrize("reference", ["body", "world"])
+def test_superimpose(istate: State, reference: str):
+    time = g.Time.from_t(np.linspace(0, 2, 30))
+    st = istate.copy(vel=g.PX(30), rvel=g.PY(0.5)).fill(time)
+    angles = g.PZ(1).tile(len(st)) * time.t**2
+    assert_matches(
+        Track.from_state(st).superimpose_angles(angles, reference),
+        st.superimpose_angles(angles, reference),
+    )
+    assert_matches(
+        Track.from_state(st).superimpose_rotation(g.PX(), np.pi, reference),
+        st.superimpose_rotation(g.PX(), np.pi, reference),
+    )
+
+
+def test_stack(istate: State):
+    a = istate.copy(vel=g.PX(30), rvel=g.P0()).fill(g.Time.from_t(np.linspace(0, 1, 10)))
+    b = a[-1].copy(rvel=g.PY(1)).fill(g.Time.from_t(np.linspace(0, 2, 15)))
+    assert_matches(
+        Track.stack([Track.from_state(a), Track.from_state(b)]), State.stack([a, b])
+    )
+
+
+def snap_reference(el: Snap, istate: State, freq: int = 25) -> State:
+    """Snap.create_template built with State operations"""
+    world_rot_axis = istate.att.transform_point(g.PX())
+    rate = el.rate
+    tpb = g.Time.uniform(2 * abs(el.break_roll) / rate, None, 2, freq)
+    trec = g.Time.uniform(2 * abs(el.recovery_roll) / rate, None, 2, freq)
+    tau = g.Time.uniform(
+        el.length / el.speed * abs((abs(el.roll) - el.break_roll - el.recovery_roll) / el.roll),
+        None, 2, freq,
+    )
+    pb = (
+        istate.copy(vel=g.PX(el.speed), rvel=g.P0())
+        .fill(tpb)
+        .superimpose_rotation(g.PY(), el.pitch)
+        .superimpose_angles(
+            np.sign(el.roll) * world_rot_axis * rate * tpb.t**2 / (2 * tpb.t[-1]),
+            reference="world",
+        )
+    )
+    au = pb[-1].copy(rvel=g.P0()).fill(tau).superimpose_rotation(
+        world_rot_axis,
+        np.sign(el.roll) * (abs(el.roll) - el.break_roll - el.recovery_roll),
+        "world",
+    )
+    rec = (
+        au[-1]
+        .copy(rvel=g.P0())
+        .fill(trec)
+        .superimpose_rotation(g.PY(), -el.pitch)
+        .superimpose_angles(
+            np.sign(el.roll) * world_rot_axis * rate * (trec.t - 0.5 * trec.t**2 / trec.t[-1]),
+            reference="world",
+        )
+    )
+    return State.stack([pb, au, rec]).label(element=el.uid)
+
+
+def test_snap_template(istate: State):
+    el = Snap("snap", 30, 60, 3 * np.pi, np.radians(20), np.radians(45), np.radians(45))
+    tp = el.create_template(istate)
+    expected = snap_reference(el, istate)
+    assert list(tp.labels.element.keys()) == ["snap"]
+    np.testing.assert_allclose(
+        tp.data.values, expected.data.values, rtol=0, atol=KERNEL_TOLERANCE
+    )
@@ -0,0 +1,77 @@
+import numpy as np
+from flightdata import State
+from geometry import PX, Euler, Point, Time, Transformation
+from numpy.testing import assert_allclose
+from pytest import fixture
+
+from flightanalysis import Element, Line, Loop
+from flightanalysis.elements import TemplateCache
+
+
+@fixture
+def loop():
+    return Loop("loop", 30, np.pi, 50.0, 0, 0)
+
+
+@fixture
+def istate():
+    return State.from_transform(Transformation(Point(10, 20, 30), Euler(np.pi, 0, 0)), vel=PX(30))
+
+
+@fixture
+def cache():
+    Element.TEMPLATE_CACHE = TemplateCache(2)
+    yield Element.TEMPLATE_CACHE
+    Element.TEMPLATE_CACHE = None
+
+
+def assert_same_template(a: State, b: State):
+    assert len(a) == len(b)
+    for col in ["t", "x", "y", "z", "rw", "rx", "ry", "rz", "u", "v", "w", "p", "q", "r"]:
+        assert_allclose(a.data[col], b.data[col], atol=1e-9)
+
+
+def test_hit_miss(loop: Loop, istate: State, cache: TemplateCache):
+    loop.template(istate)
+    assert cache.info() | dict(hit_rate=0) == dict(hits=0, misses=1, size=1, maxsize=2, hit_rate=0)
+    loop.template(istate)
+    # a different position is a hit, a different element, attitude or time base is a miss
+    loop.template(istate.copy(pos=Point(-100, 150, 50)))
+    assert (cache.hits, cache.misses) == (2, 1)
+    Loop("loop2", 30, np.pi, 50.0, 0, 0).template(istate)
+    assert (cache.hits, cache.misses) == (3, 1)
+    Loop("loop", 30, np.pi, 40.0, 0, 0).template(istate)
+    loop.template(State.from_transform(Transformation(Euler(0, 0, 0)), vel=PX(30)))
+    loop.template(istate, freq=50)
+    assert (cache.hits, cache.misses) == (3, 4)
+    cache.clear()
+    assert cache.info()["size"] == 0 and np.isnan(cache.info()["hit_rate"])
+
+
+def test_lru_eviction(istate: State, cache: TemplateCache):
+    a, b, c = [Line("line", 30, length, 0) for length in [50, 60, 70]]
+    a.template(istate)
+    b.template(istate)
+    a.template(istate)  # a is now the most recently used
+    c.template(istate)  # evicts b
+    assert len(cache) == 2
+    a.template(istate)
+    assert (cache.hits, cache.misses) == (2, 3)
+    b.template(istate)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_matches_create_template(loop: Loop, istate: State, cache: TemplateCache):
+    fl = loop.create_template(istate)
+    fl = State(fl.data.iloc[::2]).recalculate_dt()
+    loop.template(istate)
+    loop.template(istate, fl)
+    ist = istate.copy(pos=Point(-100, 150, 50))
+    assert_same_template(loop.template(ist), loop.create_template(ist))
+    assert_same_template(loop.template(ist, fl), loop.create_template(ist, fl))
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    ist = State.from_transform(Transformation(Point(5, 5, 5), Euler(np.pi, 0, np.pi)), vel=PX(30))
+    fl = fl.copy(time=Time.from_t(fl.t + 20))
+    assert_same_template(loop.template(ist), loop.create_template(ist))
+    assert_same_template(loop.template(ist, fl), loop.create_template(ist, fl))
@@ -0,0 +1,50 @@
+import geometry as g
+import numpy as np
+from pytest import fixture
+from schemas.maninfo import Position
+from schemas.positioning import Direction
+
+from flightanalysis import Line, Loop
+from flightanalysis.definition import ManDef, ManParm, maxopp
+from flightanalysis.scoring.criteria import Combination, Comparison
+
+from ..conftest import synthetic_mandef
+
+
+@fixture(scope="module")
+def mdef():
+    loop_radius = ManParm("loop_radius", Comparison("radius"), 50.0, "m")
+    line_length = ManParm("line_length", Comparison("length"), 100.0, "m")
+    rolls = ManParm("rolls", Combination.rolllist([np.pi]), 0, "rad")
+    return synthetic_mandef(
+        "m",
+        [
+            ("loop", Loop, dict(speed=30, angle=np.pi, radius=loop_radius, roll=0, ke=0)),
+            ("line", Line, dict(speed=30, length=line_length * 0.5, roll=rolls[0])),
+            ("loop2", Loop, dict(speed=30, angle=np.pi, radius=maxopp("r2", loop_radius, 60), roll=0, ke=0)),
+        ],
+        [loop_radius, line_length, rolls],
+        Position.CENTRE,
+        Direction.UPWIND,
+    )
+
+
+def test_create_batch(mdef: ManDef):
+    settings = mdef.mps.settings(
+        4, loop_radius=[40, 50, 65, 80], line_length=[80, 100, 120, 140], rolls=[0, 1, 0, 1]
+    )
+    params = mdef.element_parameters(settings)
+    np.testing.assert_array_equal(params["loop2"]["radius"], [60, 60, 65, 80])
+    np.testing.assert_array_equal(params["line"]["roll"], [np.pi, -np.pi, np.pi, -np.pi])
+
+    mans = mdef.create_batch(settings)
+    for row, man in zip(settings, mans):
+        expected = mdef.set_mps(
+            loop_radius=row[0], line_length=row[1], rolls=int(row[2])
+        ).create()
+        assert man.to_dict() == expected.to_dict()
+
+    itrans = g.Transformation(g.PY(150), g.Euler(np.pi, 0, 0))
+    tps = mdef.create_templates(settings[:2], itrans)
+    expected = mans[1].create_template(itrans, None, 25)
+    np.testing.assert_allclose(tps[1].pos.data[-1], expected["exit_line"].pos.data[-1])
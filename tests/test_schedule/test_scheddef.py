@@ -0,0 +1,70 @@
+import geometry as g
+import numpy as np
+from flightdata import State
+from pytest import fixture
+from schemas.maninfo import Position
+from schemas.positioning import Direction, Heading
+
+from flightanalysis import Line, Loop
+from flightanalysis.definition import ManDef, SchedDef
+
+from ..conftest import synthetic_mandef
+
+
+def mdef(name: str, position: Position, direction: Direction, length: float) -> ManDef:
+    return synthetic_mandef(
+        name,
+        [
+            ("loop", Loop, dict(speed=30, angle=np.pi, radius=50, roll=0, ke=0)),
+            ("line", Line, dict(speed=30, length=length, roll=np.pi)),
+            ("loop2", Loop, dict(speed=30, angle=np.pi, radius=50, roll=0, ke=0)),
+        ],
+        position=position,
+        direction=direction,
+    )
+
+
+@fixture(scope="module")
+def sdef():
+    return SchedDef(
+        [
+            mdef("m1", Position.CENTRE, Direction.UPWIND, 60),
+            mdef("m2", Position.END, Direction.DOWNWIND, 40),
+        ]
+    )
+
+
+def sequential_template(sdef: SchedDef, depth: float, wind: Heading):
+    """The template built one manoeuvre at a time with fit_box"""
+    templates = []
+    ipos = sdef[0].guess_ipos(depth, wind)
+    for md in sdef:
+        itrans = g.Transformation(
+            ipos if len(templates) == 0 else templates[-1][-1].pos,
+            g.Euler(
+                md.info.start.orientation.value,
+                0,
+                md.info.start.direction.wind_swap_heading(wind).value,
+            )
+            if len(templates) == 0
+            else templates[-1][-1].att,
+        )
+        man = md.fit_box(itrans).create()
+        templates.append(State.stack(man.create_template(itrans), "element"))
+    return State.stack(templates, "manoeuvre", [md.info.short_name for md in sdef])
+
+
+def test_create_templates(sdef: SchedDef):
+    depths, winds = [150, 170], [Heading.LTOR, Heading.RTOL]
+    res = sdef.create_templates(depths, winds)
+    assert list(res.keys()) == [(d, w) for w in winds for d in depths]
+    for (depth, wind), (sched, tp) in res.items():
+        expected = sequential_template(sdef, depth, wind)
+        assert list(tp.labels.manoeuvre.keys()) == ["m1", "m2"]
+        assert len(tp) == len(expected)
+        np.testing.assert_allclose(tp.pos.data, expected.pos.data, atol=1e-6)
+        np.testing.assert_allclose(tp.att.data, expected.att.data, atol=1e-6)
+        np.testing.assert_allclose(tp.t, expected.t, atol=1e-9)
+        assert sched[0].elements.entry_line.length == sdef[0].fit_box(
+            g.Transformation(tp[0].pos, tp[0].att)
+        ).eds.entry_line.props["length"]
@@ -1,4 +1,13 @@
-from flightanalysis.scoring.box import RectangularBox, TriangularBox, Box
+from dataclasses import replace
+
+from flightanalysis.base.ref_funcs import RefFunc
+from flightanalysis.scoring.box import RectangularBox, TriangularBox, Box, BoxDG
+from flightanalysis.scoring.box.box import box_sides
+from flightanalysis.scoring.criteria import Bounded, Exponential
+from flightanalysis.scoring.measurement import Measurement
+from flightanalysis.scoring.visibility import apply_visibility
+from flightdata import State
+from schemas import ManInfo
 import geometry as g
 import numpy as np
 
@@ -26,3 +35,82 @@ def test_box_tofrom_dict():
     tbox2 = Box.from_dict(sbox)
     assert tbox.depth == tbox2.depth
 
+
+
+def test_distances():
+    p = g.Point(np.random.default_rng(0).uniform(-300, 300, (50, 3)))
+    for box in [rbox, tbox]:
+        d = box.distances(p)
+        assert d.shape == (6, 50)
+        for side, row in zip(box_sides, d):
+            np.testing.assert_allclose(row, getattr(box, side)(p)[1])
+
+
+def box_measure(side: str, use_meta: bool):
+    def measure(els, fl, tp, box, meta=None):
+        dist = meta["box_distances"][side] if use_meta else getattr(box, side)(fl.pos)[1]
+        return Measurement(dist, g.PZ(1, len(fl)), "m"), np.linspace(0.2, 1, len(fl))
+    return RefFunc(side, measure, {})
+
+
+def test_score():
+    fl = State.from_constructs(
+        g.Time.from_t(np.linspace(0, 10, 200)),
+        g.Point(
+            np.linspace(-150, 150, 200),
+            np.full(200, 160),
+            np.linspace(20, 350, 200),
+        ),
+    )
+    criteria = Bounded("box", Exponential.simple(1, 10, 1), min_bound=0)
+    box = replace(
+        tbox,
+        bound_dgs={
+            s: BoxDG(criteria, box_measure(s, i % 2 == 0)) for i, s in enumerate(box_sides)
+        },
+    )
+    res = box.score(ManInfo(name="m", short_name="m"), None, fl, fl)
+    assert list(res.keys()) == [f"{s}_box" for s in box_sides]
+    for s in box_sides:
+        m, vis = box_measure(s, False)(None, fl, fl, box)
+        sample = apply_visibility(criteria.prepare(m.value), vis, criteria.lookup.error_limit)
+        np.testing.assert_array_equal(res[f"{s}_box"].sample, sample)
+        np.testing.assert_array_equal(res[f"{s}_box"].dgs, criteria(sample)[1])
+    assert res["top_box"].total > 0
+
+
+def test_score_without_meta(monkeypatch):
+    fl = State.from_constructs(
+        g.Time.from_t(np.linspace(0, 10, 50)),
+        g.Point(np.zeros(50), np.full(50, 160), np.full(50, 100)),
+    )
+
+    def measure(els, fl, tp, box):
+        return Measurement(box.top(fl.pos)[1], g.PZ(1, len(fl)), "m"), np.ones(len(fl))
+
+    def distances(self, p):
+        raise AssertionError("the distances are only needed by measures that accept meta")
+
+    monkeypatch.setattr(type(tbox), "distances", distances)
+    criteria = Bounded("box", Exponential.simple(1, 10, 1), min_bound=0)
+    box = replace(tbox, bound_dgs=dict(top=BoxDG(criteria, RefFunc("top", measure, {}))))
+    res = box.score(ManInfo(name="m", short_name="m"), None, fl, fl)
+    assert list(res.keys()) == ["top_box"]
+
+
+def test_face_aliases():
+    p = g.PY(300)
+    for side in box_sides:
+        np.testing.assert_array_equal(getattr(tbox, side[:2])(p)[1], tbox.face(side)(p)[1])
+        np.testing.assert_array_equal(
+            getattr(tbox, f"{side[:2]}_pos")(p).data, getattr(tbox, f"{side}_pos")(p).data
+        )
+    assert tbox.ri_angle(p)[1][0] == tbox.right_angle(p)[1][0]
+
+
+def test_corners():
+    corners = rbox.corners()
+    np.testing.assert_array_equal(corners.x, [-500, 500] * 4)
+    np.testing.assert_array_equal(corners.y, [1000] * 4 + [2000] * 4)
+    np.testing.assert_array_equal(corners.z, [0, 0, 1000, 1000] * 2)
+    np.testing.assert_array_equal(rbox.middle().data, [[0, 1500, 500]])
@@ -80,3 +80,46 @@ def ndbound():
     return Bounded(Exponential(20,1), -np.radians(15), np.radians(15))
 
 
+
+
+def _bounded_loop(crit: Bounded, vs):
+    """The per group implementation Bounded.__call__ replaced, for comparison"""
+    groups = np.concatenate([[0], np.diff(vs != 0).cumsum()])
+    dgids = np.append(
+        np.arange(len(groups))[1:][np.diff(groups).astype(bool)], len(groups) - 1
+    )
+    errors = np.array(
+        [
+            np.mean(vs[groups == grp]) * len(vs[groups == grp]) / len(vs)
+            for grp in set(groups)
+        ]
+    )
+    dgs = crit.lookup(np.abs(errors))
+    return errors[dgs > 0], dgs[dgs > 0], dgids[dgs > 0]
+
+
+def _exceedances(n: int, ngroups: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    data = np.zeros(n)
+    for start in np.sort(rng.choice(n - n // ngroups, ngroups // 2, replace=False)):
+        data[start : start + rng.integers(1, n // ngroups)] = rng.uniform(0.1, 2)
+    return data
+
+
+@mark.parametrize("data", [
+    np.concatenate([np.ones(3), np.zeros(3), np.ones(3), np.zeros(3)]),
+    np.concatenate([np.zeros(3), np.ones(3), np.zeros(3), np.full(2, 2)]),
+    np.ones(5),
+    np.zeros(5),
+    np.array([1.0]),
+])
+def test_bounded_call_matches_loop(maxbound: Bounded, data):
+    for new, old in zip(maxbound(data), _bounded_loop(maxbound, data)):
+        np.testing.assert_allclose(new, old)
+
+
+@mark.parametrize("seed", [0, 1, 2])
+def test_bounded_call_matches_loop_exceedances(maxbound: Bounded, seed: int):
+    data = _exceedances(10_000, 200, seed)
+    for new, old in zip(maxbound(data), _bounded_loop(maxbound, data)):
+        np.testing.assert_allclose(new, old)
@@ -80,3 +80,24 @@ def test_continuousvalue_mistakes():
         ContinuousValue.mistakes(*mistakes_inputs(data)), 
         [-2, 2,-2, 2,-2, 2]
     )
+
+
+def test_local_error(continuous):
+    data = np.array([0, 1, 2, 1, 0, -1, -2])
+    out = np.empty(len(data))
+    res = continuous.local_error(data, "forward", out=out)
+    assert res is out
+    np.testing.assert_array_equal(res, [0, 1, 2, 0, 0, 1, 2])
+    np.testing.assert_array_equal(
+        continuous.local_error(data, "backward"), [2, 2, 1, 0, 2, 2, 1]
+    )
+
+
+def test_calculate_increments(continuous):
+    data = np.array([0, 1, 2, 1, 0, -1, -2])
+    np.testing.assert_array_equal(
+        continuous.calculate_increments(data, "forward"), [0, 1, 2, 2, 2, 3, 4]
+    )
+    np.testing.assert_array_equal(
+        continuous.calculate_increments(data, "backward"), [3, 3, 2, 1, 1, 1, 0]
+    )
@@ -0,0 +1,95 @@
+from collections import Counter
+
+import geometry as g
+import numpy as np
+from flightdata import State
+from numpy.testing import assert_array_equal
+from pytest import raises
+
+from flightanalysis.base.ref_funcs import RefFunc, RefFuncs
+from flightanalysis.elements import Line
+from flightanalysis.scoring.criteria import Continuous, Exponential, Single
+from flightanalysis.scoring.downgrade import DownGrade, DownGrades, EvaluationCache
+from flightanalysis.scoring.measurement import Measure
+from flightanalysis.scoring.reffuncs import selectors
+
+calls = Counter()
+
+
+def speed(els, fl: State, tp: State, meta=None):
+    calls["speed"] += 1
+    return fl.vel.x - tp.vel.x + np.linspace(0, 1, len(fl)), fl.vel.unit()
+
+
+def height(els, fl: State, tp: State, meta=None):
+    calls["height"] += 1
+    return fl.pos.z - tp.pos.z, g.PZ(1, len(fl))
+
+
+def seen(fl, tp, measurement, meta=None):
+    calls["seen"] += 1
+    return np.full(len(fl), 0.8)
+
+
+def measure(func):
+    return RefFunc(func.__name__, Measure(func.__name__, func, [seen], "m"), {})
+
+
+def downgrades():
+    single = Single("single", Exponential(1, 1))
+    continuous = Continuous("continuous", Exponential(2, 1))
+    return DownGrades(
+        [
+            DownGrade("speed", "speed", None, measure(speed), RefFuncs([]), single),
+            DownGrade("speed_c", "speed_c", None, measure(speed), RefFuncs([]), continuous),
+            DownGrade("height", "height", None, measure(height), RefFuncs([]), single),
+            DownGrade(
+                "end_height",
+                "end_height",
+                None,
+                measure(height),
+                RefFuncs([selectors.last()]),
+                single,
+            ),
+        ]
+    )
+
+
+def test_fused_apply():
+    el = Line("line", 30.0, 60.0, 0.0)
+    tp = el.create_template(State.from_transform(g.Transformation(), vel=g.PX(30)))
+    fl = tp.copy(vel=tp.vel * 1.05, pos=tp.pos + g.PZ(0.5))
+    dgs = downgrades()
+
+    calls.clear()
+    separate = dgs.apply(el, fl, tp, fused=False)
+    assert calls == Counter(speed=2, height=2, seen=4)
+
+    calls.clear()
+    cache = EvaluationCache()
+    fused = dgs.apply(el, fl, tp, cache=cache)
+    assert calls == Counter(speed=1, height=2, seen=3)
+    assert cache.report()["measurements"] == dict(requested=4, computed=3, saved=1)
+    assert cache.report()["selections"] == dict(requested=4, computed=2, saved=2)
+
+    assert list(fused.data.keys()) == list(separate.data.keys())
+    for a, b in zip(fused, separate):
+        assert_array_equal(a.sample, b.sample)
+        assert_array_equal(a.dgs, b.dgs)
+        assert_array_equal(a.keys, b.keys)
+        assert a.meta == b.meta
+
+
+def test_cache_bound_to_element():
+    el = Line("line", 30.0, 60.0, 0.0)
+    tp = el.create_template(State.from_transform(g.Transformation(), vel=g.PX(30)))
+    fl = tp.copy(vel=tp.vel * 1.05)
+    dgs = downgrades()
+
+    cache = EvaluationCache()
+    dgs.apply(el, fl, tp, cache=cache)
+    dgs.apply(el, fl, tp, cache=cache)
+    assert cache.report()["measurements"]["computed"] == 3
+
+    with raises(Exception, match="only be used for one element"):
+        dgs.apply(el, tp.copy(vel=tp.vel * 1.1), tp, cache=cache)
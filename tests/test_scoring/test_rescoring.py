@@ -0,0 +1,99 @@
+from dataclasses import replace
+
+import geometry as g
+import numpy as np
+from pytest import approx
+
+from flightanalysis.scoring.criteria import (
+    Comparison,
+    Continuous,
+    Deviation,
+    Exponential,
+    Single,
+    Total,
+)
+from flightanalysis.scoring.measurement import Measurement
+from flightanalysis.scoring.rescoring import SampleBatch
+from flightanalysis.scoring.results import (
+    ElementsResults,
+    ManoeuvreResults,
+    Result,
+    Results,
+)
+
+
+def result(name, sample, criteria):
+    return Result(
+        name,
+        name,
+        Measurement(sample, g.PX(1, len(sample)), "m"),
+        np.ones(len(sample)),
+        sample,
+        np.arange(len(sample)),
+        *criteria(sample),
+        criteria,
+    )
+
+
+def mresults(sample):
+    criteria = Single("single", Exponential(1, 1))
+    return ManoeuvreResults(
+        Results("inter", [result("other", np.array([0.5]), criteria)]),
+        ElementsResults(
+            [
+                Results("e1", [result("dg", sample, criteria)]),
+                Results("e2", [result("dg", sample[::-1], criteria)]),
+            ]
+        ),
+        Results("positioning", []),
+    )
+
+
+def test_deltas():
+    archive = dict(a=mresults(np.array([0.1, 0.2])), b=mresults(np.array([0.3, -0.4, 0.1])))
+    batch = SampleBatch.extract(archive, "dg")
+    assert len(batch) == 4
+    assert batch.offsets.tolist() == [0, 2, 4, 7, 10]
+
+    lookup = Exponential(2, 1.5)
+    deltas = batch.deltas(lookup)
+
+    for k, mres in archive.items():
+        new = replace(
+            mres,
+            intra=ElementsResults(
+                [
+                    Results(
+                        rs.name,
+                        [
+                            replace(r, dgs=lookup(np.abs(r.errors)))
+                            if r.name == "dg"
+                            else r
+                            for r in rs
+                        ],
+                    )
+                    for rs in mres.intra
+                ]
+            ),
+        )
+        assert deltas[k] == approx(new.score() - mres.score())
+
+    assert batch.deltas(Single("single", lookup)).to_numpy() == approx(deltas.to_numpy())
+
+
+def test_rescore_whole_sample():
+    archive = [mresults(np.array([0.1, 0.2, 0.4])), mresults(np.array([0.3, 0.1]))]
+    batch = SampleBatch.extract(archive, "dg")
+    results = [r for mres in archive for rs in mres.intra for r in rs if r.name == "dg"]
+
+    for criteria in [
+        Deviation("deviation", Exponential(1, 1)),
+        Total("total", Exponential(1, 1)),
+        Continuous("continuous", Exponential(1, 1)),
+        Comparison("comparison", Exponential(1, 1)),
+    ]:
+        errors, dgs, offsets = batch.rescore(criteria)
+        expected = [r.replace_criteria(criteria) for r in results]
+        assert offsets.tolist() == [0, *np.cumsum([len(r.dgs) for r in expected])]
+        assert errors == approx(np.concatenate([r.errors for r in expected]))
+        assert dgs == approx(np.concatenate([r.dgs for r in expected]))
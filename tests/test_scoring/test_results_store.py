@@ -0,0 +1,99 @@
+import geometry as g
+import numpy as np
+from pytest import approx, fixture
+
+from flightanalysis.scoring.criteria import Exponential, Single
+from flightanalysis.scoring.measurement import Measurement
+from flightanalysis.scoring.results import (
+    ElementsResults,
+    ManoeuvreResults,
+    Result,
+    Results,
+)
+
+
+def result(name, sample, criteria):
+    return Result(
+        name,
+        name,
+        Measurement(sample, g.PX(1, len(sample)), "m"),
+        np.ones(len(sample)),
+        sample,
+        np.arange(len(sample)),
+        *criteria(sample),
+        criteria,
+    )
+
+
+@fixture
+def mres():
+    c1 = Single("c1", Exponential(1, 1))
+    c2 = Single("c2", Exponential(2, 1.5))
+    return ManoeuvreResults(
+        Results("inter", [result("speed", np.array([0.3, 0.4]), c2)]),
+        ElementsResults(
+            [
+                Results("e1", [result("roll", np.array([0.3, 0.1, 0.2]), c1), result("track", np.array([0.7]), c2)]),
+                Results("e2", [result("roll", np.array([0.6, 0.35]), c1)]),
+                Results("e3", []),
+            ]
+        ),
+        Results("positioning", [result("box", np.array([0.2, 0.9]), c1)]),
+    )
+
+
+def test_score_summary(mres: ManoeuvreResults):
+    for d in [1, 2, 3]:
+        for t in [False, True]:
+            intra = mres.intra.score(d, "results" if t else None)
+            inter = mres.inter.score(d, "result" if t else None)
+            positioning = mres.positioning.score(d, "result" if t else None)
+            assert mres.score_summary(d, t) == approx(
+                dict(
+                    intra=intra,
+                    inter=inter,
+                    positioning=positioning,
+                    total=max(10 - intra - inter - positioning, 0),
+                )
+            )
+
+
+def test_summary(mres: ManoeuvreResults):
+    assert mres.summary() == approx(
+        dict(inter=mres.inter.total, intra=mres.intra.total, positioning=mres.positioning.total)
+    )
+
+
+def test_dg_dict(mres: ManoeuvreResults):
+    assert mres.dg_dict() == approx(
+        dict(
+            **mres.intra.dg_dict(),
+            **mres.inter.dg_dict(),
+            **mres.positioning.dg_dict(),
+        )
+    )
+
+
+def test_criteria_sum(mres: ManoeuvreResults):
+    res = mres.criteria_sum()
+    assert res["intra_roll"] == approx(mres.intra["e1"]["roll"].total + mres.intra["e2"]["roll"].total)
+    assert res["positioning_box"] == approx(mres.positioning["box"].total)
+    assert mres.criteria_sum(True)["intra_c2"] == approx(mres.intra["e1"]["track"].total)
+
+
+def test_tuning_data(mres: ManoeuvreResults):
+    df = mres.tuning_data()
+    assert len(df) == 10
+    assert df.dg.sum() == approx(sum(mres.summary().values()))
+
+
+def test_score_matrix_memoised(mres: ManoeuvreResults):
+    matrix = mres.score_matrix
+    assert mres.score_matrix is matrix
+    assert not matrix.flags.writeable
+    assert mres.fcj_results()[5]["score"]["total"] == matrix[2, 1, 3]
+
+    replaced = mres.replace_criteria(roll=Single("c1", Exponential(3, 1)))
+    assert replaced.score_matrix is not matrix
+    assert replaced.score() < mres.score()
+    assert mres.score_matrix is matrix
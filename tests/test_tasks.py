@@ -0,0 +1,96 @@
+import numpy as np
+from pytest import fixture, raises
+from schemas.positioning import Heading
+
+from flightanalysis import Analysis, ManDef, ManOption
+from flightanalysis.analysis.tasks import (
+    AnalysisTask,
+    get_definition,
+    register_definitions,
+    run_task,
+    score_array,
+)
+
+
+@fixture(scope="module")
+def analyses(synthetic_schedule, synthetic_option, synthetic_flown):
+    """The roll with the option definition and the loop, labelled"""
+    return [
+        Analysis(0, Heading.LTOR, synthetic_flown.manoeuvre["roll"], synthetic_option),
+        Analysis(1, Heading.LTOR, synthetic_flown.manoeuvre["loop"], synthetic_schedule[1]),
+    ]
+
+
+@fixture(scope="module")
+def registered(analyses):
+    register_definitions({an.mdef.uid: an.mdef.to_dict() for an in analyses})
+    return analyses
+
+
+def parsed(mdef: ManDef | ManOption) -> ManDef | ManOption:
+    """The definition as a worker sees it"""
+    return ManDef.from_dict(mdef.to_dict())
+
+
+def test_task_round_trip(analyses):
+    for an in analyses:
+        task = AnalysisTask.from_analysis(an)
+        assert task.mdef == an.mdef.uid
+        assert task.schedule_direction == "LTOR"
+        fl = task.flown()
+        np.testing.assert_array_equal(fl.data.to_numpy(), an.flown.data.to_numpy())
+        assert list(fl.data.columns) == list(an.flown.data.columns)
+        assert fl.labels.to_dict() == an.flown.labels.to_dict()
+
+
+def test_get_definition(registered):
+    roll, loop = registered
+    assert isinstance(get_definition("roll"), ManOption)
+    assert get_definition("roll").to_dict() == parsed(roll.mdef).to_dict()
+    assert isinstance(get_definition("loop"), ManDef)
+    assert get_definition("loop").to_dict() == parsed(loop.mdef).to_dict()
+    assert get_definition("loop") is get_definition("loop")
+    with raises(KeyError):
+        get_definition("snap")
+
+
+def test_run_task(registered):
+    for an in registered:
+        direct = an.run(optimise=False)
+        task = AnalysisTask.from_analysis(an)
+
+        scores = run_task(task, "scores")
+        np.testing.assert_allclose(scores.scores, score_array(direct.scores))
+        assert scores.option == direct.option
+        assert scores.score() == direct.scores.score()
+        assert scores.elements is None and scores.analysis is None
+
+        labels = run_task(task, "labels")
+        assert labels.elements == list(direct.flown.labels.element.keys())
+        np.testing.assert_array_equal(labels.boundaries, direct.flown.labels.element.boundaries)
+        assert labels.analysis is None
+
+        full = Analysis.from_bytes(run_task(task, "full").analysis)
+        assert full.option == direct.option
+        assert full.mdef.to_dict() == parsed(direct.mdef).to_dict()
+        np.testing.assert_allclose(full.scores.score_matrix, direct.scores.score_matrix)
+    assert registered[0].run(optimise=False).option == 1
+
+
+def test_run_task_processes(registered):
+    """Two loky workers, registering the definitions in the initializer and pickling the
+    tasks and results"""
+    from joblib import Parallel, delayed
+
+    from .conftest import register_synthetic_definitions
+
+    tasks = [AnalysisTask.from_analysis(an) for an in registered]
+    results = Parallel(
+        n_jobs=2,
+        initializer=register_synthetic_definitions,
+        initargs=({an.mdef.uid: an.mdef.to_dict() for an in registered},),
+    )(delayed(run_task)(task, "scores") for task in tasks)
+
+    for an, res in zip(registered, results):
+        np.testing.assert_allclose(res.scores, run_task(AnalysisTask.from_analysis(an)).scores)
+    assert results[0].option == 1